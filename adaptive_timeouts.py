@@ -0,0 +1,125 @@
+"""
+Adaptive, percentile-based timeouts per wait site.
+
+Each wait site ('app_ready', 'chat_ready', 'search_box', 'search_result',
+'compose_box') keeps a window of recent successful wait latencies. Once
+enough samples exist its timeout becomes a high percentile of them times a
+margin, clamped to the site's [floor, ceiling]. Until then the configured
+static value is used.
+
+Timeouts are censored samples, so they are not learned from directly.
+Instead every timeout boosts the site's next timeouts towards its ceiling,
+and the boost decays as waits succeed again. A sudden slowdown therefore
+costs one short timeout, not a run of false failures.
+
+Samples are saved between runs, so a new campaign starts with the previous
+one's latencies.
+"""
+
+import json
+import logging
+import os
+from collections import deque
+
+from campaign_metrics import percentile
+
+
+class AdaptiveTimeout:
+    """Timeout of one wait site derived from its observed latencies"""
+
+    def __init__(self, site, initial, floor, ceiling, pct=99.0, margin=1.5, min_samples=20, window=200):
+        self.site = site
+        self.initial = float(initial)
+        self.floor = float(floor)
+        self.ceiling = float(max(ceiling, floor))
+        self.pct = pct
+        self.margin = margin
+        self.min_samples = min_samples
+        self.samples = deque(maxlen=window)
+        self.boost = 1.0
+        self.timeouts = 0
+        self.logged = None
+
+    def value(self):
+        """Timeout to use for the next wait (seconds)"""
+        if len(self.samples) < self.min_samples:
+            base = self.initial
+        else:
+            base = percentile(sorted(self.samples), self.pct) * self.margin
+        return min(self.ceiling, max(self.floor, base * self.boost))
+
+    def observe(self, seconds):
+        """A wait succeeded after `seconds`"""
+        self.samples.append(seconds)
+        # Relax a previous boost by half a step per success
+        self.boost = self.boost ** 0.5 if self.boost > 1.05 else 1.0
+
+    def timed_out(self):
+        """A wait gave up after the full timeout"""
+        self.timeouts += 1
+        self.boost = min(self.boost * 2.0, 16.0)
+
+    def describe(self):
+        if len(self.samples) < self.min_samples:
+            source = f"initial, {len(self.samples)}/{self.min_samples} samples"
+        else:
+            p = percentile(sorted(self.samples), self.pct)
+            source = f"p{self.pct:g} {p:.2f}s x{self.margin:g} over {len(self.samples)} samples"
+        boost = f", boost x{self.boost:.1f}" if self.boost > 1.0 else ''
+        return f"{self.site}={self.value():.1f}s ({source}{boost}, bounds {self.floor:g}-{self.ceiling:g}s)"
+
+
+class TimeoutController:
+    """Adaptive timeouts for every wait site; disabled controllers always return the initial values"""
+
+    def __init__(self, bounds, enabled=True, pct=99.0, margin=1.5, min_samples=20, window=200):
+        # bounds: {site: (initial, floor, ceiling)}
+        self.enabled = enabled
+        self.sites = {
+            site: AdaptiveTimeout(site, initial, floor, ceiling, pct, margin, min_samples, window)
+            for site, (initial, floor, ceiling) in bounds.items()
+        }
+
+    def timeout(self, site):
+        adaptive = self.sites[site]
+        if not self.enabled:
+            return adaptive.initial
+        value = adaptive.value()
+        # Log a site's timeout whenever it moves by more than 20%
+        if adaptive.logged is None or abs(value - adaptive.logged) > 0.2 * adaptive.logged:
+            adaptive.logged = value
+            logging.info(f"ADAPTIVE TIMEOUT: {adaptive.describe()}")
+        return value
+
+    def observe(self, site, seconds):
+        self.sites[site].observe(seconds)
+
+    def timed_out(self, site):
+        self.sites[site].timed_out()
+
+    def log_summary(self):
+        if not self.enabled:
+            return
+        logging.info("ADAPTIVE TIMEOUTS:")
+        for adaptive in self.sites.values():
+            logging.info(f"  {adaptive.describe()}, {adaptive.timeouts} timeouts")
+
+    def load(self, path):
+        """Seed the sample windows from a previous run"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        for site, samples in saved.items():
+            if site in self.sites:
+                self.sites[site].samples.extend(float(s) for s in samples)
+
+    def save(self, path):
+        try:
+            tmp = path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({site: [round(s, 4) for s in a.samples] for site, a in self.sites.items()}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logging.warning(f"Could not save adaptive timeout samples: {str(e)}")
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark for run_campaign and open_chats_check_only.
+
+Starts the local fake WhatsApp Web, points the sender at it with headless
+Chrome and reports contacts/minute, WebDriver calls per contact and per-phase
+latencies. Every run is appended to benchmarks/results/bench_campaign.jsonl
+together with the current commit so regressions can be compared over time.
+
+    python benchmarks/bench_campaign.py --contacts 50 --chat-latency 0.5
+    python benchmarks/bench_campaign.py --mode check --compare
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+# Every log, report and cache of the runs goes to a temp dir, not the repo's logs/
+WORKDIR = tempfile.mkdtemp(prefix='wa_bench_')
+os.environ['LOGS_DIR'] = WORKDIR
+
+import whatsapp_bulk as wb
+from campaign_metrics import percentile
+from fake_whatsapp import add_latency_arguments, server_from_args
+
+RESULTS_FILE = os.path.join(BENCH_DIR, 'results', 'bench_campaign.jsonl')
+
+
+def git_revision():
+    try:
+        sha = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, text=True).strip()
+        dirty = subprocess.call(['git', 'diff', '--quiet', 'HEAD'], cwd=REPO_DIR) != 0
+        return sha + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def make_numbers(count, seed=11):
+    rng = random.Random(seed)
+    return [f"91{rng.randint(6000000000, 9999999999)}" for _ in range(count)]
+
+
+# WebDriver commands issued by the current run, keyed by command name
+DRIVER_CALLS = Counter()
+
+
+def instrument_driver_calls():
+    """Count every WebDriver command issued by drivers created via setup_driver"""
+    original_setup = wb.setup_driver
+
+    def counting_setup_driver():
+        backend = original_setup()
+        driver = backend.driver
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            DRIVER_CALLS[driver_command] += 1
+            return original_execute(driver_command, params)
+
+        driver.execute = execute
+        return backend
+
+    wb.setup_driver = counting_setup_driver
+
+
+def phase_stats(trace_path):
+    phases = {}
+    loop_seconds = 0.0
+    statuses = Counter()
+    if os.path.exists(trace_path):
+        with open(trace_path, encoding='utf-8') as f:
+            for line in f:
+                row = json.loads(line)
+                loop_seconds += row['total_s']
+                statuses[row['status']] += 1
+                for phase, seconds in row['phases'].items():
+                    phases.setdefault(phase, []).append(seconds)
+    summary = {}
+    for phase, values in phases.items():
+        values.sort()
+        summary[phase] = {'p50_ms': round(percentile(values, 50) * 1000, 1),
+                          'p95_ms': round(percentile(values, 95) * 1000, 1),
+                          'p99_ms': round(percentile(values, 99) * 1000, 1)}
+    return summary, loop_seconds, dict(statuses)
+
+
+def run_mode(mode, numbers, server, workdir, message):
+    DRIVER_CALLS.clear()
+    wb.SENT_MESSAGES_LOG = os.path.join(workdir, f'sent_{mode}.log')
+    wb.CONTACT_TRACE_LOG = os.path.join(workdir, f'trace_{mode}.jsonl')
+    wb.CHECK_REPORT = os.path.join(workdir, f'check_{mode}.csv')
+    sent_before = server.stats()['sent']
+    started = time.perf_counter()
+    try:
+        if mode == 'campaign':
+            wb.set_manual_data(numbers, message)
+            wb.run_campaign()
+        else:
+            wb.open_chats_check_only(numbers, verify='all')
+    finally:
+        wall = time.perf_counter() - started
+        if wb.CURRENT_DRIVER is not None:
+            wb.CURRENT_DRIVER.quit()
+            wb.CURRENT_DRIVER = None
+    phases, loop_seconds, statuses = phase_stats(wb.CONTACT_TRACE_LOG)
+    busy = loop_seconds or wall
+    calls = sum(DRIVER_CALLS.values())
+    return {
+        'contacts': len(numbers),
+        'wall_s': round(wall, 2),
+        'contacts_per_min': round(len(numbers) / busy * 60, 1) if busy else 0.0,
+        'webdriver_calls': calls,
+        'webdriver_calls_per_contact': round(calls / len(numbers), 1),
+        'top_commands': dict(DRIVER_CALLS.most_common(8)),
+        'delivered': server.stats()['sent'] - sent_before,
+        'statuses': statuses,
+        'phases': phases,
+    }
+
+
+def print_result(mode, result):
+    print(f"\n== {mode} ==")
+    print(f"contacts            {result['contacts']}")
+    print(f"wall time           {result['wall_s']}s")
+    print(f"contacts/minute     {result['contacts_per_min']}")
+    print(f"webdriver calls     {result['webdriver_calls']} ({result['webdriver_calls_per_contact']}/contact)")
+    print(f"delivered messages  {result['delivered']}")
+    if result['statuses']:
+        print(f"statuses            {result['statuses']}")
+    for phase, s in result['phases'].items():
+        print(f"  {phase:<16} p50 {s['p50_ms']:>8} ms   p95 {s['p95_ms']:>8} ms   p99 {s['p99_ms']:>8} ms")
+
+
+def load_previous(scenario):
+    if not os.path.exists(RESULTS_FILE):
+        return None
+    previous = None
+    with open(RESULTS_FILE, encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry.get('scenario') == scenario:
+                previous = entry
+    return previous
+
+
+def print_comparison(previous, current):
+    print(f"\n== compared with {previous['revision']} ({previous['timestamp']}) ==")
+    for mode, result in current['results'].items():
+        before = previous['results'].get(mode)
+        if not before:
+            continue
+        for key in ('contacts_per_min', 'webdriver_calls_per_contact', 'wall_s'):
+            old, new = before[key], result[key]
+            change = f"{(new - old) / old:+.1%}" if old else "n/a"
+            print(f"  {mode:<9} {key:<28} {old:>10} -> {new:<10} {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--contacts', type=int, default=20)
+    parser.add_argument('--mode', choices=('campaign', 'check', 'both'), default='both')
+    parser.add_argument('--message', default="Hello! This is a benchmark message.")
+    parser.add_argument('--keep-pacing', action='store_true', help='keep configured delays and batch breaks')
+    parser.add_argument('--compare', action='store_true', help='compare with the previous run of this scenario')
+    parser.add_argument('--no-save', action='store_true', help='do not append the result to the results file')
+    parser.add_argument('--verbose', action='store_true', help='keep INFO logging from the sender')
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    server = server_from_args(args).start()
+    workdir = WORKDIR
+    wb.WHATSAPP_WEB_URL = server.url
+    wb.HEADLESS = True
+    wb.USE_CLIPBOARD = False
+    wb.PERSISTENT_PROFILE_DIR = os.path.join(workdir, 'chrome_profile')
+    wb.TIMEOUT_SAMPLES_FILE = os.path.join(workdir, 'wait_latencies.json')
+    if not args.keep_pacing:
+        wb.DELAY_BETWEEN_CONTACTS = (0, 0)
+        wb.BATCH_DELAY = 0
+
+    instrument_driver_calls()
+
+    numbers = make_numbers(args.contacts)
+    modes = ['campaign', 'check'] if args.mode == 'both' else [args.mode]
+    scenario = {k: getattr(args, k) for k in ('contacts', 'keep_pacing', 'load_latency', 'chat_latency',
+                                              'search_latency', 'ack_latency', 'response_latency',
+                                              'invalid_rate', 'chats')}
+    entry = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'scenario': scenario,
+        'results': {},
+    }
+    try:
+        for mode in modes:
+            result = run_mode(mode, numbers, server, workdir, args.message)
+            entry['results'][mode] = result
+            print_result(mode, result)
+    finally:
+        server.stop()
+
+    previous = load_previous(scenario) if args.compare else None
+    if previous:
+        print_comparison(previous, entry)
+    elif args.compare:
+        print("\nNo previous run of this scenario to compare with.")
+    if not args.no_save:
+        os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+        with open(RESULTS_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+        print(f"\nResult appended to {RESULTS_FILE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Contact list memory and per-contact iteration cost: DataFrame vs ContactStore.
+
+Builds the same synthetic list both ways - the old manual-entry path (list of
+dicts -> DataFrame -> copy, iterated with iterrows) and the ContactStore path
+(raw columns -> pre-flight -> packed store) - each in a fresh subprocess. It
+reports the bytes per contact the list keeps (pandas deep memory usage vs
+ContactStore.nbytes), the process's peak RSS and the time to walk the
+contacts the way the send loop does.
+
+    python benchmarks/bench_contacts.py --contacts 1000000
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import pandas as pd
+
+from contact_store import ContactStore
+from preflight import run_preflight
+
+MESSAGE = "Hi! We are reaching out about our new offer. Reply STOP to opt out. " * 3
+
+
+def rss_bytes():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def peak_rss_bytes():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def walk_frame(data, limit):
+    started = time.perf_counter()
+    count = 0
+    for idx, row in data.iterrows():
+        number = str(row['Number'])
+        name = row.get('Name', '') if 'Name' in data.columns else ''
+        intro_msg = str(row['IntroMessage']).strip()
+        count += 1
+        if count >= limit:
+            break
+    return (time.perf_counter() - started) / count
+
+
+def walk_store(store, limit):
+    started = time.perf_counter()
+    count = 0
+    for contact in store:
+        number = contact.number
+        name = contact.name
+        intro_msg = contact.message
+        count += 1
+        if count >= limit:
+            break
+    return (time.perf_counter() - started) / count
+
+
+def run_one(mode, contacts, iterate, seed):
+    """Build and walk one representation in this process; returns its measurements"""
+    baseline = rss_bytes()
+    rng = random.Random(seed)
+    raw = [f"+91 {rng.randint(60000, 99999)} {rng.randint(10000, 99999)}" for _ in range(contacts)]
+    names = [f"Contact {i}" for i in range(contacts)]
+    started = time.perf_counter()
+    if mode == 'frame':
+        # set_manual_data + load_campaign_data before ContactStore
+        rows = [{'Number': n, 'Name': name, 'IntroMessage': MESSAGE} for n, name in zip(raw, names)]
+        data = pd.DataFrame(rows).copy()
+        del rows
+    else:
+        data = run_preflight(ContactStore.from_columns(raw, names, MESSAGE))[0]
+    build = time.perf_counter() - started
+    del raw, names
+    gc.collect()
+    kept = int(data.memory_usage(deep=True).sum()) if mode == 'frame' else data.nbytes()
+    walk = walk_frame(data, iterate) if mode == 'frame' else walk_store(data, iterate)
+    return {'bytes': kept, 'peak_rss': peak_rss_bytes() - baseline, 'build_s': build, 'walk_s': walk}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--contacts', type=int, default=1000000)
+    parser.add_argument('--iterate', type=int, default=200000, help='contacts walked per representation')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--mode', choices=('frame', 'store'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_one(args.mode, args.contacts, args.iterate, args.seed)))
+        return
+
+    results = {}
+    for mode in ('frame', 'store'):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), '--mode', mode,
+                              '--contacts', str(args.contacts), '--iterate', str(args.iterate),
+                              '--seed', str(args.seed)], capture_output=True, text=True, check=True)
+        results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    n = args.contacts
+    print(f"contacts               {n} (unique names, one shared {len(MESSAGE)}-char message)")
+    print(f"{'':<22} {'bytes/contact':>14} {'list MiB':>9} {'peak RSS MiB':>13} {'build s':>8} "
+          f"{'iterate ns/contact':>19}")
+    for mode, label in (('frame', 'DataFrame + iterrows'), ('store', 'ContactStore')):
+        r = results[mode]
+        print(f"{label:<22} {r['bytes'] / n:>14.0f} {r['bytes'] / 2 ** 20:>9.1f} {r['peak_rss'] / 2 ** 20:>13.1f} "
+              f"{r['build_s']:>8.2f} {r['walk_s'] * 1e9:>19.0f}")
+    print("ContactStore build time includes the pre-flight pass (canonicalize, validate, dedupe)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Compare the old full-page innerText scan with the targeted status probes.
+
+Loads a large saved WhatsApp-like DOM fixture in headless Chrome and reports,
+for each script, the median/p95 round-trip latency and the payload size that
+crosses the WebDriver wire.
+
+    python benchmarks/bench_dom_probes.py --chats 20000 --messages 1000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing whatsapp_bulk opens a sender log; keep it out of the repo's logs/
+os.environ['LOGS_DIR'] = tempfile.mkdtemp(prefix='wa_probes_')
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+import whatsapp_bulk as wb
+from dom_fixture import write_fixture
+
+INNER_TEXT_JS = "return document.body.innerText.toLowerCase()"
+
+
+def headless_driver():
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    return webdriver.Chrome(options=options)
+
+
+def measure(driver, script, runs):
+    timings = []
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = driver.execute_script(script)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    payload = len(json.dumps(result))
+    return statistics.median(timings), timings[int(0.95 * (len(timings) - 1))], payload, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--chats', type=int, default=5000)
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--runs', type=int, default=30)
+    args = parser.parse_args()
+
+    scripts = [
+        ("innerText (old)", INNER_TEXT_JS),
+        ("chat status probe", wb.CHAT_STATUS_PROBE_JS),
+        ("session state probe", wb.SESSION_STATE_PROBE_JS),
+    ]
+    driver = headless_driver()
+    try:
+        print(f"{'fixture':<20} {'script':<22} {'p50 ms':>8} {'p95 ms':>8} {'bytes':>10}  result")
+        for state in ('chat_open', 'invalid_number'):
+            path = write_fixture(state, args.chats, args.messages)
+            driver.get('file://' + os.path.abspath(path))
+            for label, script in scripts:
+                p50, p95, payload, result = measure(driver, script, args.runs)
+                shown = result if payload < 40 else f"<{payload} bytes of text>"
+                print(f"{state:<20} {label:<22} {p50:>8.2f} {p95:>8.2f} {payload:>10}  {shown}")
+    finally:
+        driver.quit()
+
+
+if __name__ == '__main__':
+    main()
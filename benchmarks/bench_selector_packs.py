@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Check every selector pack against offline WhatsApp Web DOM snapshots.
+
+Loads each snapshot in headless Chrome and, for every pack, site and syntax
+(CSS and XPath), checks that the selector matches when the page state
+should show that element, and that the first match is the right kind of
+element (a compose box inside the chat, a search result inside the chat
+list, and so on). It also checks that nothing matches when the element
+should be absent. Query latency is measured inside the page, which is the
+DOM scan the wait polls repeat, and as a find_elements round trip.
+
+By default the synthetic fixtures from dom_fixture.py are used. Pages saved
+from a real session ("Save page as", HTML only) can be checked instead by
+passing them with the state they show:
+
+    python benchmarks/bench_selector_packs.py --chats 20000 --messages 1000
+    python benchmarks/bench_selector_packs.py --snapshot chat_open=saved/chat.html \\
+        --snapshot main=saved/main.html --snapshot qr=saved/qr.html
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+
+from dom_fixture import EXPECTED_SITES, STATES, write_fixture
+from selector_packs import PACKS, PROBE_SITES, SYNTAXES, WAIT_SITES
+
+# Runs the query `runs` times in the page; returns [match count, first match is
+# the right kind of element, per-run milliseconds]
+QUERY_JS = """
+var site = arguments[0], syntax = arguments[1], query = arguments[2], runs = arguments[3];
+function run() {
+    if (syntax === 'css') { return Array.prototype.slice.call(document.querySelectorAll(query)); }
+    var found = document.evaluate(query, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < found.snapshotLength; i++) { nodes.push(found.snapshotItem(i)); }
+    return nodes;
+}
+var checks = {
+    compose_box: function (el) { return el.isContentEditable && !!el.closest('#main, footer'); },
+    search_box: function (el) { return (el.isContentEditable || el.tagName === 'INPUT') && !el.closest('#main'); },
+    search_result: function (el) { return !!el.closest('#pane-side'); },
+    invalid_popup: function (el) { return /invalid/i.test(el.textContent); },
+    chat_popup: function (el) { return /invalid/i.test(el.textContent); },
+    app_ready: function (el) { return !el.closest('.landing-window'); },
+    phone_alert: function (el) { return !el.closest('#main, #pane-side'); },
+    qr: function (el) { return el.tagName === 'CANVAS' || el.tagName === 'IMG' || !!el.querySelector('canvas, img'); },
+    chat_pane: function (el) { return !!el.querySelector('footer') && !el.closest('#pane-side'); },
+    message_out: function (el) { return !!el.closest('#main') && !el.closest('footer'); },
+    message_status: function (el) { return !!el.closest('#main') && /^(msg|status)-/.test(el.getAttribute('data-icon')); }
+};
+var timings = [], nodes = [];
+for (var r = 0; r < runs; r++) {
+    var started = performance.now();
+    nodes = run();
+    timings.push(performance.now() - started);
+}
+return [nodes.length, nodes.length ? checks[site](nodes[0]) : false, timings];
+"""
+
+
+def headless_driver():
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    return webdriver.Chrome(options=options)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[int(pct * (len(values) - 1))]
+
+
+def measure_site(driver, state, site, syntax, query, runs):
+    count, first_ok, timings = driver.execute_script(QUERY_JS, site, syntax, query, runs)
+    expected = state in EXPECTED_SITES[site]
+    correct = (count > 0 and first_ok) if expected else count == 0
+    trip = None
+    if site in WAIT_SITES:
+        by = By.CSS_SELECTOR if syntax == 'css' else By.XPATH
+        trips = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            driver.find_elements(by, query)
+            trips.append((time.perf_counter() - started) * 1000)
+        trip = statistics.median(trips)
+    return {'count': count, 'correct': correct, 'p50': statistics.median(timings),
+            'p95': percentile(timings, 0.95), 'trip': trip}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--chats', type=int, default=5000)
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--runs', type=int, default=30)
+    parser.add_argument('--snapshot', action='append', default=[], metavar='STATE=PATH',
+                        help=f"saved page and the state it shows ({', '.join(STATES)})")
+    parser.add_argument('--packs', default=','.join(PACKS), help='comma-separated packs to compare')
+    parser.add_argument('--verbose', action='store_true', help='print every site, not just the totals')
+    args = parser.parse_args()
+
+    packs = [PACKS[name.strip()] for name in args.packs.split(',') if name.strip()]
+    if args.snapshot:
+        pages = []
+        for item in args.snapshot:
+            state, _, path = item.partition('=')
+            if state not in STATES or not path:
+                parser.error(f"--snapshot expects STATE=PATH with STATE one of {', '.join(STATES)}")
+            pages.append((state, path))
+    else:
+        pages = [(state, write_fixture(state, args.chats, args.messages)) for state in STATES]
+
+    totals = {}  # (pack, syntax) -> [wrong sites, summed p50 ms]
+    driver = headless_driver()
+    try:
+        print(f"{'snapshot':<20} {'pack':<9} {'syntax':<6} {'correct':>8} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'find ms':>8}  wrong")
+        for state, path in pages:
+            driver.get('file://' + os.path.abspath(path))
+            for pack in packs:
+                for syntax in SYNTAXES:
+                    rows = {}
+                    for site in WAIT_SITES + PROBE_SITES:
+                        # The JavaScript probes always query with CSS, whatever the wait syntax
+                        used = 'css' if site in PROBE_SITES else syntax
+                        query = pack.css(site) if used == 'css' else pack.xpath(site)
+                        rows[site] = measure_site(driver, state, site, used, query, args.runs)
+                    wrong = [site for site, r in rows.items() if not r['correct']]
+                    waits = [rows[site] for site in WAIT_SITES]
+                    p50 = sum(r['p50'] for r in waits)
+                    p95 = sum(r['p95'] for r in waits)
+                    trip = sum(r['trip'] for r in waits)
+                    total = totals.setdefault((pack.name, syntax), [[], 0.0])
+                    total[0].extend(f"{state}:{site}" for site in wrong)
+                    total[1] += p50
+                    print(f"{state:<20} {pack.name:<9} {syntax:<6} {len(rows) - len(wrong):>4}/{len(rows):<3} "
+                          f"{p50:>8.3f} {p95:>8.3f} {trip:>8.2f}  {', '.join(wrong) or '-'}")
+                    if args.verbose:
+                        for site, r in rows.items():
+                            find = f"{r['trip']:>8.2f}" if r['trip'] is not None else f"{'':>8}"
+                            print(f"{'':<20}   {site:<22} {r['count']:>6} {r['p50']:>8.3f} {r['p95']:>8.3f} "
+                                  f"{find}  {'ok' if r['correct'] else 'WRONG'}")
+    finally:
+        driver.quit()
+
+    print("p50/p95: in-page query time summed over the wait sites; find ms: the same as find_elements "
+          "round trips; correct also counts the probe sites, which are always CSS")
+    correct = sorted((wait_p50, name, syntax) for (name, syntax), (wrong, wait_p50) in totals.items() if not wrong)
+    if correct:
+        wait_p50, name, syntax = correct[0]
+        print(f"fastest correct pack: {name} ({syntax}) - SELECTOR_PACK={name} SELECTOR_SYNTAX={syntax}, "
+              f"{wait_p50:.3f} ms of wait-site queries over {len(pages)} snapshots")
+    else:
+        print("no pack is correct on every snapshot; run with --verbose to see which sites fail")
+
+
+if __name__ == '__main__':
+    main()
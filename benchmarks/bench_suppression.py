@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Suppression list load time, memory and lookup cost.
+
+Writes a synthetic opt-out file, builds the index (cold), reopens it from the
+memory-mapped cache (warm) and times the campaign path: one bulk screen of
+the contact list, then a set lookup per contact.
+
+    python benchmarks/bench_suppression.py --numbers 2000000 --contacts 100000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from suppression import load_suppression_index, normalize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--numbers', type=int, default=2000000, help='opt-out numbers in the synthetic list')
+    parser.add_argument('--contacts', type=int, default=100000, help='campaign contacts to screen')
+    parser.add_argument('--hit-rate', type=float, default=0.05, help='share of contacts on the list')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix='wa_supp_')
+    source = os.path.join(workdir, 'optouts.csv')
+    opted_out = [f"91{rng.randint(6000000000, 9999999999)}" for _ in range(args.numbers)]
+    with open(source, 'w', encoding='utf-8') as f:
+        f.write("number\n")
+        f.write("\n".join(f"+{n}" for n in opted_out))
+        f.write("\n")
+
+    started = time.perf_counter()
+    index = load_suppression_index([source], cache_dir=workdir)
+    cold = time.perf_counter() - started
+    started = time.perf_counter()
+    index = load_suppression_index([source], cache_dir=workdir)
+    warm = time.perf_counter() - started
+
+    contacts = [rng.choice(opted_out) if rng.random() < args.hit_rate else f"91{rng.randint(6000000000, 9999999999)}"
+                for _ in range(args.contacts)]
+    started = time.perf_counter()
+    suppressed = index.screen(contacts)
+    screen = time.perf_counter() - started
+    started = time.perf_counter()
+    hits = sum(1 for n in contacts if normalize(n) in suppressed)
+    check = time.perf_counter() - started
+    sample = contacts[:10000]
+    started = time.perf_counter()
+    for n in sample:
+        n in index
+    scalar = time.perf_counter() - started
+
+    print(f"opt-out numbers     {len(index)} unique of {args.numbers}")
+    print(f"index size          {index.nbytes / 1024 / 1024:.1f} MiB ({index.nbytes / max(1, len(index)):.1f} bytes/number)")
+    print(f"cold build          {cold:.2f}s")
+    print(f"warm load (mmap)    {warm * 1000:.1f} ms")
+    print(f"bulk screen         {screen / len(contacts) * 1e9:.0f} ns/contact ({len(suppressed)} suppressed)")
+    print(f"per-contact check   {check / len(contacts) * 1e9:.0f} ns ({hits} hits)")
+    print(f"ad-hoc `in` lookup  {scalar / len(sample) * 1e9:.0f} ns")
+
+
+if __name__ == '__main__':
+    main()
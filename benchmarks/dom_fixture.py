@@ -0,0 +1,112 @@
+"""
+Synthetic WhatsApp Web DOM used by the offline benchmarks.
+
+The markup only reproduces the attributes the sender relies on (compose box
+data-tab/data-testid, pane-side, search box, invalid-number popup, outgoing
+bubbles and their status icons); sizes are
+configurable so probes can be measured against a realistically large page.
+"""
+
+import html
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+STATES = ('chat_open', 'invalid_number', 'main', 'qr', 'loading', 'phone_disconnected')
+FIXTURE_VERSION = 2  # Part of the cached file name; bump when the markup changes
+
+# States in which each selector site (see selector_packs) must match; it must not match anywhere else
+APP_STATES = ('chat_open', 'invalid_number', 'main', 'phone_disconnected')
+CHAT_STATES = ('chat_open', 'invalid_number')
+EXPECTED_SITES = {
+    'compose_box': CHAT_STATES,
+    'search_box': APP_STATES,
+    'search_result': APP_STATES,
+    'invalid_popup': ('invalid_number',),
+    'app_ready': APP_STATES,
+    'phone_alert': ('phone_disconnected',),
+    'qr': ('qr',),
+    'chat_popup': ('invalid_number',),
+    'chat_pane': CHAT_STATES,
+    'message_out': CHAT_STATES,
+    'message_status': CHAT_STATES,
+}
+
+_WORDS = ("hello", "thanks", "see", "you", "tomorrow", "meeting", "order", "delivered",
+          "call", "me", "when", "free", "ok", "great", "price", "list", "sent", "invoice")
+
+
+def _sentence(rng, low=3, high=14):
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(low, high)))
+
+
+def _chat_row(rng, i):
+    name = f"Contact {i:05d}"
+    return (
+        '<div role="listitem" class="_199zF zoWT4 chat">'
+        f'<div class="contact"><span title="{name}">{name}</span></div>'
+        f'<div class="_1qB8f"><span>{html.escape(_sentence(rng))}</span></div>'
+        f'<div class="_3Bxar"><span>{rng.randint(1, 12)}:{rng.randint(10, 59)} PM</span></div>'
+        '</div>'
+    )
+
+
+def _message_row(rng, i, outgoing):
+    direction = "message-out" if outgoing else "message-in"
+    icon = '<span data-icon="msg-dblcheck"></span>' if outgoing else ''
+    return (
+        f'<div data-id="{"true" if outgoing else "false"}_919876543210@c.us_3EB0{i:016X}" role="row">'
+        f'<div class="{direction}"><div class="copyable-text">'
+        f'<span class="selectable-text">{html.escape(_sentence(rng, 2, 30))}</span>'
+        f'{icon}</div></div></div>'
+    )
+
+
+def build_whatsapp_dom(state='chat_open', chats=5000, messages=500, seed=7):
+    """Return an HTML document reproducing WhatsApp Web in the given state"""
+    if state not in STATES:
+        raise ValueError(f"Unknown fixture state '{state}', expected one of {STATES}")
+    rng = random.Random(seed)
+    if state == 'loading':
+        body = '<div id="app"><div class="_3Bt9n"><progress value="40" max="100"></progress></div></div>'
+    elif state == 'qr':
+        body = ('<div id="app"><div class="landing-window"><div data-ref="2@abc">'
+                '<canvas aria-label="Scan me! QR code" width="264" height="264"></canvas>'
+                '</div></div></div>')
+    else:
+        chat_list = "".join(_chat_row(rng, i) for i in range(chats))
+        side = (
+            '<div id="side">'
+            '<div class="search"><div contenteditable="true" class="selectable-text" data-tab="3" '
+            'title="Search or start new chat" data-testid="chat-list-search"></div></div>'
+            f'<div id="pane-side" data-testid="pane-side"><div data-testid="chat-list" class="chat-list">{chat_list}</div></div>'
+            '</div>'
+        )
+        banner = ''
+        if state == 'phone_disconnected':
+            banner = '<div data-testid="alert-phone"><span data-icon="alert-phone"></span>Phone not connected</div>'
+        main = ''
+        if state in ('chat_open', 'invalid_number'):
+            history = "".join(_message_row(rng, i, i % 3 == 0) for i in range(messages))
+            main = (
+                f'<div id="main"><div class="copyable-area">{history}</div>'
+                '<footer><div contenteditable="true" role="textbox" class="selectable-text _13NKt" data-tab="10" '
+                'data-testid="conversation-compose-box-input"></div></footer></div>'
+            )
+        popup = ''
+        if state == 'invalid_number':
+            popup = ('<div data-animate-modal-popup="true"><div data-testid="popup-contents">'
+                     'Phone number shared via url is invalid.</div></div>')
+        body = f'<div id="app"><div class="two">{banner}{side}{main}</div>{popup}</div>'
+    return f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>WhatsApp</title></head><body>{body}</body></html>'
+
+
+def write_fixture(state='chat_open', chats=5000, messages=500, directory=FIXTURES_DIR):
+    """Write a fixture to disk (if missing) and return its path"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"whatsapp_{state}_{chats}x{messages}_v{FIXTURE_VERSION}.html")
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(build_whatsapp_dom(state, chats, messages))
+    return path
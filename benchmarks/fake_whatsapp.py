@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for WhatsApp Web used by the offline benchmarks.
+
+Serves a single-page app that reproduces the selectors the sender relies on
+(pane-side, search box with data-tab=3, compose box with data-tab=10 and
+data-testid, invalid-number popup, outgoing message bubbles) with configurable
+artificial latencies. Sent messages are reported back to the server so a
+benchmark can check what was actually delivered.
+
+    python benchmarks/fake_whatsapp.py --port 8765 --chat-latency 0.4
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from dom_fixture import _chat_row
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>WhatsApp</title>
+<style>
+  [contenteditable] { min-height: 20px; min-width: 200px; border: 1px solid #ccc; }
+  #pane-side { height: 400px; overflow-y: auto; }
+  [role=listitem] { padding: 4px; cursor: pointer; }
+</style></head>
+<body><div id="app"><div class="_3Bt9n">Loading...</div></div>
+<script>
+var CFG = __CONFIG__;
+var CHAT_LIST = __CHAT_LIST__;
+
+function openChat(phone) {
+  var old = document.getElementById('main');
+  if (old) { old.remove(); }
+  var main = document.createElement('div');
+  main.id = 'main';
+  main.innerHTML = '<div class="copyable-area" id="history"></div>' +
+    '<footer><div contenteditable="true" role="textbox" class="selectable-text _13NKt" data-tab="10" ' +
+    'data-testid="conversation-compose-box-input"></div></footer>';
+  document.querySelector('.two').appendChild(main);
+  var box = main.querySelector('[data-tab="10"]');
+  box.addEventListener('keydown', function (e) {
+    if (e.key !== 'Enter' || e.shiftKey) { return; }
+    e.preventDefault();
+    var text = box.innerText.replace(/\\n$/, '');
+    if (!text.trim()) { return; }
+    box.innerHTML = '';
+    var bubble = document.createElement('div');
+    bubble.className = 'message-out';
+    bubble.setAttribute('role', 'row');
+    bubble.setAttribute('data-id', 'true_' + phone + '@c.us_' + Date.now());
+    bubble.innerHTML = '<div class="copyable-text"><span class="selectable-text"></span>' +
+      '<span data-testid="msg-time" data-icon="msg-time"></span></div>';
+    bubble.querySelector('.selectable-text').textContent = text;
+    document.getElementById('history').appendChild(bubble);
+    fetch('/api/sent', {method: 'POST', body: JSON.stringify({phone: phone, text: text})});
+    setTimeout(function () {
+      var icon = bubble.querySelector('[data-icon]');
+      icon.setAttribute('data-icon', 'msg-check');
+      icon.setAttribute('data-testid', 'msg-check');
+    }, CFG.ack_latency_ms);
+  });
+}
+
+function showInvalidPopup() {
+  var popup = document.createElement('div');
+  popup.setAttribute('data-animate-modal-popup', 'true');
+  popup.innerHTML = '<div data-testid="popup-contents">Phone number shared via url is invalid.</div>';
+  document.getElementById('app').appendChild(popup);
+}
+
+function wireSearch() {
+  var search = document.querySelector('[data-testid="chat-list-search"]');
+  search.addEventListener('input', function () {
+    var term = search.innerText.trim();
+    setTimeout(function () {
+      var list = document.querySelector('[data-testid="chat-list"]');
+      if (!term) { list.innerHTML = CHAT_LIST; return; }
+      list.innerHTML = '<div role="listitem" class="_199zF zoWT4 chat"><div class="contact"><span title="' +
+        term + '">' + term + '</span></div></div>';
+      list.firstChild.addEventListener('click', function () {
+        setTimeout(function () { openChat(term); }, CFG.chat_latency_ms);
+      });
+    }, CFG.search_latency_ms);
+  });
+}
+
+setTimeout(function () {
+  document.getElementById('app').innerHTML = '<div class="two"><div id="side">' +
+    '<div class="search"><div contenteditable="true" class="selectable-text" data-tab="3" ' +
+    'title="Search or start new chat" data-testid="chat-list-search"></div></div>' +
+    '<div id="pane-side" data-testid="pane-side"><div data-testid="chat-list" class="chat-list">' +
+    CHAT_LIST + '</div></div></div></div>';
+  wireSearch();
+  if (CFG.phone) {
+    setTimeout(function () {
+      if (CFG.invalid) { showInvalidPopup(); } else { openChat(CFG.phone); }
+    }, CFG.chat_latency_ms);
+  }
+}, CFG.load_latency_ms);
+</script></body></html>
+"""
+
+
+class FakeWhatsAppServer:
+    """Threaded HTTP server serving the fake WhatsApp Web app"""
+
+    def __init__(self, host='127.0.0.1', port=0, load_latency=0.5, chat_latency=0.3,
+                 search_latency=0.2, ack_latency=0.2, response_latency=0.0,
+                 invalid_rate=0.0, chats=500, seed=7):
+        self.load_latency = load_latency
+        self.chat_latency = chat_latency
+        self.search_latency = search_latency
+        self.ack_latency = ack_latency
+        self.response_latency = response_latency
+        self.invalid_rate = invalid_rate
+        rng = random.Random(seed)
+        self.chat_list = "".join(_chat_row(rng, i) for i in range(chats))
+        self.sent = []
+        self.page_loads = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def is_invalid(self, phone):
+        """Deterministically mark a share of numbers as invalid"""
+        if not self.invalid_rate:
+            return False
+        return (zlib.crc32(phone.encode()) % 10000) < self.invalid_rate * 10000
+
+    def render_page(self, phone):
+        config = {
+            'phone': phone,
+            'invalid': bool(phone) and self.is_invalid(phone),
+            'load_latency_ms': int(self.load_latency * 1000),
+            'chat_latency_ms': int(self.chat_latency * 1000),
+            'search_latency_ms': int(self.search_latency * 1000),
+            'ack_latency_ms': int(self.ack_latency * 1000),
+        }
+        return (PAGE_TEMPLATE
+                .replace('__CONFIG__', json.dumps(config))
+                .replace('__CHAT_LIST__', json.dumps(self.chat_list)))
+
+    def stats(self):
+        with self._lock:
+            return {'page_loads': self.page_loads, 'sent': len(self.sent),
+                    'unique_recipients': len({m['phone'] for m in self.sent})}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code, body, content_type):
+                data = body.encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path == '/api/stats':
+                    self._reply(200, json.dumps(server.stats()), 'application/json')
+                    return
+                if parsed.path not in ('/', '/send'):
+                    self._reply(404, 'not found', 'text/plain')
+                    return
+                if server.response_latency:
+                    time.sleep(server.response_latency)
+                phone = parse_qs(parsed.query).get('phone', [''])[0] if parsed.path == '/send' else ''
+                with server._lock:
+                    server.page_loads += 1
+                self._reply(200, server.render_page(phone), 'text/html; charset=utf-8')
+
+            def do_POST(self):
+                if urlparse(self.path).path != '/api/sent':
+                    self._reply(404, 'not found', 'text/plain')
+                    return
+                length = int(self.headers.get('Content-Length', '0'))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                with server._lock:
+                    server.sent.append(payload)
+                self._reply(200, '{}', 'application/json')
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fake-whatsapp', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def add_latency_arguments(parser):
+    """Register the latency knobs shared by the server and the benchmarks"""
+    parser.add_argument('--load-latency', type=float, default=0.5, help='seconds before the app renders')
+    parser.add_argument('--chat-latency', type=float, default=0.3, help='seconds before a chat opens')
+    parser.add_argument('--search-latency', type=float, default=0.2, help='seconds before search results show')
+    parser.add_argument('--ack-latency', type=float, default=0.2, help='seconds before a bubble is marked sent')
+    parser.add_argument('--response-latency', type=float, default=0.0, help='server-side delay per page load')
+    parser.add_argument('--invalid-rate', type=float, default=0.0, help='share of numbers reported invalid')
+    parser.add_argument('--chats', type=int, default=500, help='rows in the chat list')
+
+
+def server_from_args(args, port=0):
+    return FakeWhatsAppServer(
+        port=port,
+        load_latency=args.load_latency,
+        chat_latency=args.chat_latency,
+        search_latency=args.search_latency,
+        ack_latency=args.ack_latency,
+        response_latency=args.response_latency,
+        invalid_rate=args.invalid_rate,
+        chats=args.chats,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for WhatsApp Web")
+    parser.add_argument('--port', type=int, default=8765)
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+    server = server_from_args(args, args.port).start()
+    print(f"Fake WhatsApp Web listening on {server.url} (set WHATSAPP_WEB_URL to use it)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Capacity-planning simulation of run_campaign.
+
+Runs the real campaign loop (pacing, retries, dedupe, batching) against the
+in-memory SimulatedBackend on a virtual clock, so a 100k-contact campaign
+finishes in seconds. Reports the simulated campaign duration, outcomes and
+phase percentiles.
+
+    python benchmarks/simulate_campaign.py --contacts 100000 --delay-min 2 --delay-max 5
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+# Every log, report and cache of the run goes to a temp dir, not the repo's logs/
+WORKDIR = tempfile.mkdtemp(prefix='wa_sim_')
+os.environ['LOGS_DIR'] = WORKDIR
+
+import whatsapp_bulk as wb
+from campaign_metrics import percentile
+from driver_backend import SimulationProfile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--contacts', type=int, default=10000)
+    parser.add_argument('--duplicate-rate', type=float, default=0.05, help='share of rows repeating an earlier number')
+    parser.add_argument('--batch-size', type=int, default=wb.BATCH_SIZE)
+    parser.add_argument('--batch-delay', type=int, default=wb.BATCH_DELAY)
+    parser.add_argument('--delay-min', type=int, default=wb.DELAY_BETWEEN_CONTACTS[0])
+    parser.add_argument('--delay-max', type=int, default=wb.DELAY_BETWEEN_CONTACTS[1])
+    parser.add_argument('--fast-mode', action='store_true', help='trim internal fixed sleeps like FAST_MODE=1')
+    parser.add_argument('--command-latency', type=float, default=0.01)
+    parser.add_argument('--load-latency', type=float, default=3.0)
+    parser.add_argument('--chat-latency', type=float, default=1.5)
+    parser.add_argument('--search-latency', type=float, default=0.8)
+    parser.add_argument('--jitter', type=float, default=0.3)
+    parser.add_argument('--invalid-rate', type=float, default=0.02)
+    parser.add_argument('--chat-failure-rate', type=float, default=0.01)
+    parser.add_argument('--search-failure-rate', type=float, default=0.5)
+    parser.add_argument('--send-failure-rate', type=float, default=0.005)
+    parser.add_argument('--disconnect-rate', type=float, default=0.0, help='chance per navigation that the phone drops off')
+    parser.add_argument('--disconnect-duration', type=float, default=120.0, help='mean seconds a disconnect lasts')
+    parser.add_argument('--ack-latency', type=float, default=0.5, help='seconds until a sent message is ticked')
+    parser.add_argument('--ack-failure-rate', type=float, default=0.0, help='share of messages that never leave')
+    parser.add_argument('--history-latency', type=float, default=0.0,
+                        help='seconds until a reopened chat shows its earlier messages')
+    parser.add_argument('--no-verify', action='store_true', help='trust ENTER without checking acks (VERIFY_SENDS=0)')
+    parser.add_argument('--no-watchdog', action='store_true', help='disable the session watchdog (SESSION_WATCHDOG=0)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    # Per-contact failures are expected here; keep the console to the report
+    logging.getLogger().setLevel(logging.CRITICAL)
+    workdir = WORKDIR
+    wb.DRIVER_BACKEND = 'simulated'
+    wb.SIMULATION_PROFILE = SimulationProfile(
+        command_latency=args.command_latency,
+        load_latency=args.load_latency,
+        chat_latency=args.chat_latency,
+        search_latency=args.search_latency,
+        jitter=args.jitter,
+        invalid_rate=args.invalid_rate,
+        chat_failure_rate=args.chat_failure_rate,
+        search_failure_rate=args.search_failure_rate,
+        send_failure_rate=args.send_failure_rate,
+        disconnect_rate=args.disconnect_rate,
+        disconnect_duration=args.disconnect_duration,
+        ack_latency=args.ack_latency,
+        ack_failure_rate=args.ack_failure_rate,
+        history_latency=args.history_latency,
+    )
+    wb.VERIFY_SENDS = not args.no_verify
+    wb.SESSION_WATCHDOG = not args.no_watchdog
+    wb.SENT_MESSAGES_LOG = os.path.join(workdir, 'sent.log')
+    wb.CONTACT_TRACE_LOG = os.path.join(workdir, 'trace.jsonl')
+    wb.RESULTS_DIR = workdir
+    wb.TIMEOUT_SAMPLES_FILE = os.path.join(workdir, 'wait_latencies.json')
+    wb.BATCH_SIZE = args.batch_size
+    wb.BATCH_DELAY = args.batch_delay
+    wb.DELAY_BETWEEN_CONTACTS = (args.delay_min, args.delay_max)
+    wb.NO_DELAY = False
+    wb.FAST_MODE = args.fast_mode
+    wb.CONTACT_LIMIT = args.contacts
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    numbers = []
+    for _ in range(args.contacts):
+        if numbers and rng.random() < args.duplicate_rate:
+            numbers.append(rng.choice(numbers))
+        else:
+            numbers.append(f"91{rng.randint(6000000000, 9999999999)}")
+    wb.set_manual_data(numbers, "Simulated intro message")
+
+    started = time.perf_counter()
+    wb.run_campaign()
+    wall = time.perf_counter() - started
+    simulated = wb.CLOCK.now()
+
+    statuses = Counter()
+    reasons = Counter()
+    phases = {}
+    with open(wb.CONTACT_TRACE_LOG, encoding='utf-8') as f:
+        for line in f:
+            row = json.loads(line)
+            statuses[row['status']] += 1
+            if row['reason']:
+                reasons[row['reason']] += 1
+            for phase, seconds in row['phases'].items():
+                phases.setdefault(phase, []).append(seconds)
+
+    print(f"contacts            {args.contacts}")
+    print(f"real time           {wall:.2f}s")
+    print(f"simulated duration  {timedelta(seconds=round(simulated))} ({simulated / 3600:.1f} h)")
+    print(f"throughput          {args.contacts / simulated * 60:.1f} contacts/min (simulated)")
+    print(f"outcomes            {dict(statuses)}")
+    if reasons:
+        print(f"failure reasons     {dict(reasons)}")
+    print(f"delivered           {sum(wb.CURRENT_DRIVER.delivered.values())} messages "
+          f"({wb.CURRENT_DRIVER.lost} lost in transit)")
+    ledgered = sum(1 for _ in open(wb.SENT_MESSAGES_LOG, encoding='utf-8')) if os.path.exists(wb.SENT_MESSAGES_LOG) else 0
+    print(f"ledger entries      {ledgered}")
+    print(f"results table       {os.path.join(workdir, 'campaign_results_*')}")
+    for phase, values in phases.items():
+        values.sort()
+        print(f"  {phase:<16} p50 {percentile(values, 50):>7.2f}s  p95 {percentile(values, 95):>7.2f}s  "
+              f"p99 {percentile(values, 99):>7.2f}s  total {sum(values) / 3600:>6.2f}h")
+
+
+if __name__ == '__main__':
+    main()
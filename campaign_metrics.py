@@ -0,0 +1,398 @@
+"""
+Per-phase timing and live progress for the send pipeline.
+
+run_campaign opens a CampaignTimer, marks the start of every contact and wraps
+each phase in span(). Durations are aggregated into fixed-size log-scale
+per-phase histograms that are logged as p50/p95/p99 at the end of the
+campaign, and every contact is written as one JSON line to a trace file for
+offline analysis (and, when a ResultsWriter is attached, as a row of the
+CSV/Parquet results table).
+
+ProgressTracker keeps the live counters (processed, success, skipped,
+failures by reason), an EWMA-based rate and ETA, and notifies listeners such
+as the status endpoint and the GUI.
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import Counter, deque
+from contextlib import nullcontext
+from datetime import datetime
+
+PHASES = (
+    'dedupe',
+    'open_chat',
+    'search_fallback',
+    'send_find',
+    'send_insert',
+    'send_submit',
+    'ack_verify',
+    'ledger_write',
+    'pacing_wait',
+    'session_recovery',
+)
+
+_ACTIVE = None  # CampaignTimer of the running campaign, if any
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+# Log-scale buckets, 16 per doubling: a bucket is ~4.4% wide, so a percentile read
+# from its midpoint is within ~2.2% of the exact value
+BUCKETS_PER_DOUBLING = 16
+MIN_SECONDS = 1e-6  # Everything faster shares bucket 0
+
+
+def _bucket(seconds):
+    if seconds <= MIN_SECONDS:
+        return 0
+    return int(math.log2(seconds / MIN_SECONDS) * BUCKETS_PER_DOUBLING) + 1
+
+
+def _bucket_value(bucket):
+    """Geometric midpoint of a bucket (seconds)"""
+    if bucket == 0:
+        return 0.0
+    return MIN_SECONDS * 2 ** ((bucket - 0.5) / BUCKETS_PER_DOUBLING)
+
+
+class PhaseHistogram:
+    """Duration histogram (seconds) for one phase.
+
+    Only per-bucket counts, the total and the maximum are kept, so memory stays
+    constant however many contacts a campaign has.
+    """
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = {}  # bucket -> samples
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        bucket = _bucket(seconds)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def state(self):
+        """Snapshot that summarize() turns into percentiles (a few hundred buckets at most)"""
+        return dict(self.counts), self.count, self.total, self.max
+
+    def summary(self):
+        return self.summarize(*self.state())
+
+    @staticmethod
+    def summarize(counts, count, total, maximum):
+        buckets = sorted(counts.items())
+
+        def quantile(pct):
+            # Nearest rank, like percentile(); never above the largest sample
+            rank = max(1, math.ceil(pct / 100.0 * count))
+            seen = 0
+            for bucket, n in buckets:
+                seen += n
+                if seen >= rank:
+                    return min(_bucket_value(bucket), maximum)
+            return maximum
+
+        return {
+            'count': count,
+            'p50': quantile(50) if count else 0.0,
+            'p95': quantile(95) if count else 0.0,
+            'p99': quantile(99) if count else 0.0,
+            'max': maximum,
+            'total': total,
+        }
+
+
+class ContactTrace:
+    """Timing record of a single contact"""
+    __slots__ = ('number', 'started_at', 'started', 'phases', 'status', 'reason', 'attempts')
+
+    def __init__(self, number, started):
+        self.number = number
+        self.started_at = datetime.now().isoformat(timespec='milliseconds')
+        self.started = started
+        self.phases = {}
+        self.status = 'processed'
+        self.reason = ''
+        self.attempts = 0
+
+    def to_dict(self, finished):
+        return {
+            'number': self.number,
+            'started_at': self.started_at,
+            'status': self.status,
+            'reason': self.reason,
+            'attempts': self.attempts,
+            'total_s': round(finished - self.started, 6),
+            'phases': {k: round(v, 6) for k, v in self.phases.items()},
+        }
+
+
+class CampaignTimer:
+    """Aggregates phase spans and writes one trace line per contact"""
+
+    def __init__(self, trace_path=None, clock=time.perf_counter, on_outcome=None, results=None):
+        self.trace_path = trace_path
+        self.clock = clock
+        self.on_outcome = on_outcome
+        self.results = results  # optional campaign_results.ResultsWriter
+        self.histograms = {phase: PhaseHistogram() for phase in PHASES}
+        self.current = None
+        self._lock = threading.Lock()
+        self._trace_file = open(trace_path, 'a', encoding='utf-8') if trace_path else None
+
+    def begin_contact(self, number):
+        """Start timing a new contact, closing the previous one"""
+        self._finish_contact()
+        self.current = ContactTrace(number, self.clock())
+        return self.current
+
+    def mark(self, status, reason=''):
+        """Record the outcome of the current contact"""
+        if self.current is not None:
+            self.current.status = status
+            self.current.reason = reason
+        if self.on_outcome is not None:
+            phases = dict(self.current.phases) if self.current is not None else None
+            self.on_outcome(status, reason, phases)
+
+    def requeue(self, reason=''):
+        """The current contact was interrupted and will be retried; not counted as an outcome"""
+        if self.current is not None:
+            self.current.status = 'requeued'
+            self.current.reason = reason
+
+    def record(self, phase, seconds):
+        with self._lock:
+            self.histograms.setdefault(phase, PhaseHistogram()).add(seconds)
+        if self.current is not None:
+            self.current.phases[phase] = self.current.phases.get(phase, 0.0) + seconds
+
+    def span(self, phase):
+        return _Span(self, phase)
+
+    def _finish_contact(self):
+        trace = self.current
+        if trace is None:
+            return
+        self.current = None
+        finished = self.clock()
+        if self._trace_file:
+            self._trace_file.write(json.dumps(trace.to_dict(finished)) + "\n")
+            self._trace_file.flush()
+        if self.results is not None:
+            self.results.append(trace, datetime.now().isoformat(timespec='milliseconds'), finished - trace.started)
+
+    def summary(self):
+        """Return {phase: {count, p50, p95, p99, max, total}} for phases that ran"""
+        # Copy the bucket counts under the lock, compute outside it so readers never stall the send loop
+        with self._lock:
+            copies = [(phase, hist.state()) for phase, hist in self.histograms.items() if hist.count]
+        return {phase: PhaseHistogram.summarize(*state) for phase, state in copies}
+
+    def log_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        logging.info("PHASE TIMINGS (ms):")
+        logging.info(f"  {'phase':<16} {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+        for phase, s in summary.items():
+            logging.info(
+                f"  {phase:<16} {s['count']:>7} {s['p50'] * 1000:>9.1f} {s['p95'] * 1000:>9.1f} "
+                f"{s['p99'] * 1000:>9.1f} {s['max'] * 1000:>9.1f}"
+            )
+        if self.trace_path:
+            logging.info(f"Per-contact trace written to {self.trace_path}")
+
+    def close(self):
+        self._finish_contact()
+        if self._trace_file:
+            self._trace_file.close()
+            self._trace_file = None
+        if self.results is not None:
+            self.results.close()
+            self.results = None
+
+
+class _Span:
+    """Context manager timing one phase (cheaper than a generator-based one)"""
+    __slots__ = ('timer', 'phase', 'started')
+
+    def __init__(self, timer, phase):
+        self.timer = timer
+        self.phase = phase
+
+    def __enter__(self):
+        self.started = self.timer.clock()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.record(self.phase, self.timer.clock() - self.started)
+        return False
+
+
+_NO_SPAN = nullcontext()
+
+
+def start_campaign(trace_path=None, clock=time.perf_counter, on_outcome=None, results=None):
+    """Create the timer used by span() for the current campaign"""
+    global _ACTIVE
+    _ACTIVE = CampaignTimer(trace_path, clock, on_outcome, results)
+    return _ACTIVE
+
+
+def finish_campaign():
+    """Log the phase summary and close the active timer"""
+    global _ACTIVE
+    timer = _ACTIVE
+    _ACTIVE = None
+    if timer is not None:
+        timer.close()
+        timer.log_summary()
+    return timer
+
+
+def active_timer():
+    return _ACTIVE
+
+
+def span(phase):
+    """Time a phase against the active campaign; no-op when none is running"""
+    timer = _ACTIVE
+    if timer is None:
+        return _NO_SPAN
+    return _Span(timer, phase)
+
+
+def count_attempt():
+    """Count one send attempt for the current contact; no-op when no campaign is running"""
+    timer = _ACTIVE
+    if timer is not None and timer.current is not None:
+        timer.current.attempts += 1
+
+
+class ProgressTracker:
+    """Live campaign counters with an EWMA rate and ETA.
+
+    The send loop calls record_outcome() once per contact; readers call
+    snapshot() from any thread. Listeners receive (event, snapshot) and must
+    be cheap, since they run on the send loop's thread.
+    """
+
+    def __init__(self, alpha=0.2, window=20):
+        self.alpha = alpha
+        self.window = window
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.reset()
+
+    def reset(self, total=0, clock=time.monotonic):
+        with self._lock:
+            self.clock = clock
+            self.total = total
+            self.state = 'idle'
+            self.processed = 0
+            self.success = 0
+            self.skipped_duplicates = 0
+            self.suppressed = 0
+            self.failures = Counter()
+            self.started = clock()
+            self.last_outcome = self.started
+            self.ewma_interval = None
+            self.recent_times = deque(maxlen=self.window)
+            self.recent_phases = deque(maxlen=self.window)
+        self._notify('reset')
+
+    def set_state(self, state):
+        with self._lock:
+            self.state = state
+        self._notify('state')
+
+    def record_outcome(self, status, reason='', phases=None):
+        with self._lock:
+            now = self.clock()
+            self.recent_times.append(now)
+            if phases:
+                self.recent_phases.append(phases)
+            interval = now - self.last_outcome
+            self.last_outcome = now
+            if self.ewma_interval is None:
+                self.ewma_interval = interval
+            else:
+                self.ewma_interval = self.alpha * interval + (1 - self.alpha) * self.ewma_interval
+            self.processed += 1
+            if status == 'sent':
+                self.success += 1
+            elif status == 'skipped_duplicate':
+                self.skipped_duplicates += 1
+            elif status == 'suppressed':
+                self.suppressed += 1
+            elif status == 'failed':
+                self.failures[reason or 'unknown'] += 1
+        self._notify('outcome')
+
+    def snapshot(self):
+        with self._lock:
+            elapsed = self.clock() - self.started
+            remaining = max(0, self.total - self.processed)
+            interval = self.ewma_interval
+            rolling = 0.0
+            if len(self.recent_times) > 1:
+                span_s = self.recent_times[-1] - self.recent_times[0]
+                rolling = 60.0 * (len(self.recent_times) - 1) / span_s if span_s > 0 else 0.0
+            totals = Counter()
+            for phases in self.recent_phases:
+                totals.update(phases)
+            slowest = None
+            if totals:
+                phase, seconds = totals.most_common(1)[0]
+                slowest = {'phase': phase, 'seconds': round(seconds / len(self.recent_phases), 3)}
+            return {
+                'state': self.state,
+                'total': self.total,
+                'processed': self.processed,
+                'remaining': remaining,
+                'success': self.success,
+                'skipped_duplicates': self.skipped_duplicates,
+                'suppressed': self.suppressed,
+                'failed': sum(self.failures.values()),
+                'failures_by_reason': dict(self.failures),
+                'elapsed_seconds': round(elapsed, 3),
+                'rate_per_minute': round(60.0 / interval, 2) if interval else 0.0,
+                'rolling_rate_per_minute': round(rolling, 2),
+                'slowest_recent_phase': slowest,
+                'eta_seconds': round(remaining * interval, 1) if interval is not None else None,
+            }
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event):
+        if not self._listeners:
+            return
+        snap = self.snapshot()
+        for callback in list(self._listeners):
+            try:
+                callback(event, snap)
+            except Exception as e:
+                logging.debug(f"Progress listener failed: {e}")
+
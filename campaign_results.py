@@ -0,0 +1,118 @@
+"""
+Per-contact campaign results table.
+
+Every contact's outcome (status, reason, send attempts, timestamps, total and
+per-phase durations) is buffered and appended in batches to a CSV file and,
+when pyarrow is installed, to a Parquet file with one row group per batch.
+Both load straight into pandas:
+
+    pd.read_parquet('logs/campaign_results_<ts>.parquet')
+    pd.read_csv('logs/campaign_results_<ts>.csv')
+"""
+
+import csv
+import logging
+import os
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+BASE_COLUMNS = ('seq', 'number', 'status', 'reason', 'attempts', 'started_at', 'finished_at', 'total_s')
+
+
+class ResultsWriter:
+    """Buffers result rows and appends them to CSV/Parquet every batch_size contacts"""
+
+    def __init__(self, csv_path=None, parquet_path=None, phases=(), batch_size=500):
+        self.csv_path = csv_path
+        self.parquet_path = parquet_path
+        self.phase_columns = [f"{phase}_s" for phase in phases]
+        self.columns = list(BASE_COLUMNS) + self.phase_columns
+        self.batch_size = max(1, batch_size)
+        self.rows = []
+        self.written = 0
+        self._csv_file = None
+        self._csv_writer = None
+        self._parquet_writer = None
+        self._schema = None
+        if parquet_path and pa is None:
+            logging.warning("pyarrow is not installed - writing campaign results as CSV only (pip install pyarrow)")
+            self.parquet_path = None
+
+    def append(self, trace, finished_at, total_s):
+        """Add one finished ContactTrace"""
+        row = {
+            'seq': self.written + len(self.rows) + 1,
+            'number': trace.number,
+            'status': trace.status,
+            'reason': trace.reason,
+            'attempts': trace.attempts,
+            'started_at': trace.started_at,
+            'finished_at': finished_at,
+            'total_s': round(total_s, 6),
+        }
+        for column in self.phase_columns:
+            row[column] = round(trace.phases.get(column[:-2], 0.0), 6)
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        rows, self.rows = self.rows, []
+        try:
+            if self.csv_path:
+                self._write_csv(rows)
+            if self.parquet_path:
+                self._write_parquet(rows)
+        except (OSError, ValueError) as e:
+            logging.error(f"Failed to write campaign results: {str(e)}")
+        self.written += len(rows)
+
+    def _write_csv(self, rows):
+        if self._csv_writer is None:
+            is_new = not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0
+            self._csv_file = open(self.csv_path, 'a', encoding='utf-8', newline='')
+            self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=self.columns)
+            if is_new:
+                self._csv_writer.writeheader()
+        self._csv_writer.writerows(rows)
+        self._csv_file.flush()
+
+    def _write_parquet(self, rows):
+        if self._parquet_writer is None:
+            fields = [
+                ('seq', pa.int64()),
+                ('number', pa.string()),
+                ('status', pa.string()),
+                ('reason', pa.string()),
+                ('attempts', pa.int32()),
+                ('started_at', pa.timestamp('ms')),
+                ('finished_at', pa.timestamp('ms')),
+                ('total_s', pa.float64()),
+            ] + [(column, pa.float64()) for column in self.phase_columns]
+            self._schema = pa.schema(fields)
+            self._parquet_writer = pq.ParquetWriter(self.parquet_path, self._schema)
+        columns = {name: [row[name] for row in rows] for name in self.columns}
+        for name in ('started_at', 'finished_at'):
+            columns[name] = [datetime.fromisoformat(value) for value in columns[name]]
+        self._parquet_writer.write_table(pa.table(columns, schema=self._schema))
+
+    def close(self):
+        self.flush()
+        if self._csv_file:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+        if self._parquet_writer:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self.written:
+            paths = [p for p in (self.csv_path, self.parquet_path) if p]
+            logging.info(f"Campaign results ({self.written} contacts) written to {', '.join(paths)}")
@@ -0,0 +1,182 @@
+"""
+Local contact files: CSV/TSV, Excel, Parquet and JSONL.
+
+Each format is a reader registered by file extension. Readers only
+materialize the Number, Name and IntroMessage columns (matched ignoring case
+and surrounding spaces):
+
+- CSV/TSV: pyarrow's multithreaded reader over a memory-mapped file with
+  include_columns, or pandas (usecols, memory_map) when pyarrow is missing;
+- Parquet: pyarrow reads just the projected column chunks, memory-mapped;
+- JSONL: pyarrow's JSON reader with an explicit three-field schema that
+  ignores every other field; files where a field is not always text (e.g.
+  numbers written as JSON numbers) or is missing from some records (which
+  may spell it differently) are streamed line by line from a memory map
+  instead, matching the field names of each record;
+- Excel: pandas with usecols (needs openpyxl for .xlsx, xlrd for .xls).
+
+All numbers are read as text so leading '+'/'00' survive; the pre-flight
+pass canonicalizes them. Other formats can be added with register_source().
+"""
+
+import csv
+import json
+import mmap
+import os
+
+import pandas as pd
+
+from contact_store import ContactStore
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.json as pa_json
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pa_csv = None
+    pa_json = None
+    pq = None
+
+CONTACT_COLUMNS = ('Number', 'Name', 'IntroMessage')
+
+_READERS = {}
+
+
+def register_source(extensions, reader):
+    """Register reader(path) -> {column: values} for the given file extensions"""
+    for ext in extensions:
+        _READERS[ext.lower()] = reader
+
+
+def supported_extensions():
+    return sorted(_READERS)
+
+
+def _match_columns(names):
+    """{wanted column: column name in the file} for the contact columns present"""
+    wanted = {c.lower(): c for c in CONTACT_COLUMNS}
+    matched = {}
+    for name in names:
+        column = wanted.get(str(name).strip().lower())
+        if column and column not in matched:
+            matched[column] = name
+    return matched
+
+
+def _read_delimited(path, delimiter):
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        header = next(csv.reader(f, delimiter=delimiter), [])
+    matched = _match_columns(header)
+    if not matched:
+        return {}
+    if pa_csv is not None:
+        table = pa_csv.read_csv(
+            pa.memory_map(path, 'r'),
+            parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=list(matched.values()),
+                column_types={name: pa.string() for name in matched.values()},
+            ),
+        )
+        return {column: table.column(name).to_pylist() for column, name in matched.items()}
+    frame = pd.read_csv(path, sep=delimiter, usecols=list(matched.values()), dtype=str,
+                        memory_map=True, encoding='utf-8-sig')
+    return {column: frame[name].tolist() for column, name in matched.items()}
+
+
+def read_csv(path):
+    return _read_delimited(path, ',')
+
+
+def read_tsv(path):
+    return _read_delimited(path, '\t')
+
+
+def read_parquet(path):
+    if pq is None:
+        raise ImportError("reading Parquet contacts needs pyarrow (pip install pyarrow)")
+    matched = _match_columns(pq.read_schema(path).names)
+    if not matched:
+        return {}
+    table = pq.read_table(path, columns=list(matched.values()), memory_map=True)
+    return {column: table.column(name).to_pylist() for column, name in matched.items()}
+
+
+def read_jsonl(path):
+    if os.path.getsize(path) == 0:
+        return {}
+    if pa_json is not None:
+        with open(path, 'rb') as f:
+            first = f.readline().strip()
+        # Field names as spelled in the first record; fields it lacks are read under their usual name
+        matched = _match_columns(json.loads(first).keys()) if first else {}
+        names = {column: matched.get(column, column) for column in CONTACT_COLUMNS}
+        try:
+            table = pa_json.read_json(pa.memory_map(path, 'r'), parse_options=pa_json.ParseOptions(
+                explicit_schema=pa.schema([(name, pa.string()) for name in names.values()]),
+                unexpected_field_behavior='ignore',
+            ))
+        except pa.ArrowInvalid:
+            pass  # some field is not text in every record
+        else:
+            nulls = [table.column(name).null_count for name in names.values()]
+            # A field missing from only some records may be spelled differently there
+            if all(n in (0, table.num_rows) for n in nulls):
+                return {column: table.column(name).to_pylist() for column, name in names.items()
+                        if table.column(name).null_count < table.num_rows}
+    return _stream_jsonl(path)
+
+
+def _stream_jsonl(path):
+    columns = {}
+    layouts = {}  # field names of a record -> {column: field name}
+    rows = 0
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line in iter(mm.readline, b''):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            fields = tuple(record)
+            matched = layouts.get(fields)
+            if matched is None:
+                matched = layouts[fields] = _match_columns(fields)
+            for column in matched.keys() - columns.keys():
+                # A field first seen in a later record is back-filled with None
+                columns[column] = [None] * rows
+            for column, values in columns.items():
+                key = matched.get(column)
+                values.append(record[key] if key is not None else None)
+            rows += 1
+    return columns
+
+
+def read_excel(path):
+    frame = pd.read_excel(path, usecols=lambda name: bool(_match_columns([name])), dtype=str)
+    matched = _match_columns(frame.columns)
+    return {column: frame[name].tolist() for column, name in matched.items()}
+
+
+register_source(('.csv',), read_csv)
+register_source(('.tsv', '.tab'), read_tsv)
+register_source(('.parquet', '.pq'), read_parquet)
+register_source(('.jsonl', '.ndjson'), read_jsonl)
+register_source(('.xlsx', '.xlsm', '.xls'), read_excel)
+
+
+def load_contacts(path):
+    """Read a local contacts file into a ContactStore.
+
+    Raises ValueError for unsupported extensions or files without a Number
+    column, ImportError when the format's optional dependency is missing.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    reader = _READERS.get(ext)
+    if reader is None:
+        raise ValueError(f"unsupported contacts file type '{ext}' (supported: {', '.join(supported_extensions())})")
+    columns = reader(path)
+    if 'Number' not in columns:
+        raise ValueError("no 'Number' column found")
+    return ContactStore.from_columns(columns['Number'], columns.get('Name'), columns.get('IntroMessage', ''))
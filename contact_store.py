@@ -0,0 +1,112 @@
+"""
+Compact contact list for the send loop.
+
+A DataFrame row per contact (iterrows builds a pandas Series each time) costs
+microseconds and a few hundred bytes per contact. ContactStore keeps three
+plain columns instead:
+
+- numbers: raw strings as loaded, or uint64 digits (array('Q')) once the
+  pre-flight pass has canonicalized them;
+- names: a list of strings, or None when the source has no names;
+- messages: an array('I') of indexes into a table of interned texts. A
+  campaign usually sends one intro to everybody, so a million contacts share
+  a single string.
+
+Iterating yields small __slots__ Contact records built on the fly.
+"""
+
+import math
+import sys
+from array import array
+
+
+class Contact:
+    """One contact of a ContactStore"""
+    __slots__ = ('index', 'number', 'name', 'message')
+
+    def __init__(self, index, number, name, message):
+        self.index = index
+        self.number = number
+        self.name = name
+        self.message = message
+
+
+def _text(value):
+    """Cell value as a stripped string; missing values (None/NaN) become ''"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    text = str(value).strip()
+    return '' if text.lower() == 'nan' else text
+
+
+class ContactStore:
+    """Column-oriented contact list with interned messages"""
+
+    def __init__(self, numbers, names=None, message_ids=None, messages=None):
+        self.numbers = numbers
+        self.names = names
+        self.messages = messages if messages is not None else ['']
+        self.message_ids = message_ids if message_ids is not None else array('I', [0]) * len(numbers)
+
+    @classmethod
+    def from_columns(cls, numbers, names=None, messages=''):
+        """Build a store from raw columns; messages is one text for everybody or one per contact.
+
+        Missing numbers (None/NaN) become '' so pre-flight reports them as missing.
+        """
+        numbers = [n.strip() if type(n) is str else _text(n) for n in numbers]
+        if names is not None:
+            names = [_text(n) for n in names]
+            if not any(names):
+                names = None
+        if isinstance(messages, str) or messages is None:
+            return cls(numbers, names, messages=[_text(messages)])
+        table = {}
+        message_ids = array('I', (table.setdefault(_text(m), len(table)) for m in messages))
+        return cls(numbers, names, message_ids, list(table))
+
+    @classmethod
+    def from_frame(cls, data):
+        """Build a store from a DataFrame with 'Number' and optional 'Name'/'IntroMessage' columns"""
+        names = data['Name'].tolist() if 'Name' in data.columns else None
+        messages = data['IntroMessage'].tolist() if 'IntroMessage' in data.columns else ''
+        return cls.from_columns(data['Number'].tolist(), names, messages)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __getitem__(self, i):
+        return Contact(i, str(self.numbers[i]), self.names[i] if self.names is not None else '',
+                       self.messages[self.message_ids[i]])
+
+    def __iter__(self):
+        names = self.names
+        messages = self.messages
+        for i, (number, message_id) in enumerate(zip(self.numbers, self.message_ids)):
+            yield Contact(i, str(number), names[i] if names is not None else '', messages[message_id])
+
+    def number_list(self):
+        return [str(n) for n in self.numbers]
+
+    def take(self, positions, numbers=None):
+        """New store with the rows at positions (in order), optionally with replacement numbers"""
+        if numbers is None:
+            numbers = [self.numbers[p] for p in positions]
+            if isinstance(self.numbers, array):
+                numbers = array(self.numbers.typecode, numbers)
+        names = [self.names[p] for p in positions] if self.names is not None else None
+        message_ids = array('I', (self.message_ids[p] for p in positions))
+        return ContactStore(numbers, names, message_ids, self.messages)
+
+    def with_message(self, message):
+        """Same contacts, all sending one message"""
+        return ContactStore(self.numbers, self.names, messages=[_text(message)])
+
+    def nbytes(self):
+        """Approximate resident size of the columns and everything they reference"""
+        size = sys.getsizeof(self.numbers) + sys.getsizeof(self.message_ids)
+        if not isinstance(self.numbers, array):
+            size += sum(sys.getsizeof(n) for n in {id(n): n for n in self.numbers}.values())
+        if self.names is not None:
+            size += sys.getsizeof(self.names) + sum(sys.getsizeof(n) for n in {id(n): n for n in self.names}.values())
+        return size + sum(sys.getsizeof(m) for m in self.messages)
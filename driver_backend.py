@@ -0,0 +1,311 @@
+"""
+Driver backends for the send pipeline.
+
+whatsapp_bulk talks to the browser only through the small interface below, so
+the same campaign logic can run against real Chrome (SeleniumBackend) or a
+pure-Python simulation (SimulatedBackend) with scriptable latencies and
+failure rates. The simulation runs on a virtual clock, which lets pacing,
+retries, dedupe and batching be exercised for 100k contacts in seconds.
+
+Every wait names the *site* it is waiting on ('chat_ready', 'search_box',
+'search_result', 'compose_box') and passes a (By, value) locator from the
+selector pack; Selenium ignores the site and uses the locator, the simulation
+ignores the locator and uses the site.
+
+JavaScript probes start with a ``/* probe:<name> */`` marker so the
+simulation can answer them without a DOM.
+"""
+
+import logging
+import random
+import re
+import time
+from collections import Counter
+from urllib.parse import parse_qs, urlparse
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+WAIT_SITES = ('chat_ready', 'search_box', 'search_result', 'compose_box')
+
+_PROBE_MARKER = re.compile(r'/\*\s*probe:(\w+)\s*\*/')
+
+
+class RealClock:
+    """Wall clock used with real browsers"""
+
+    def now(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class VirtualClock:
+    """Clock that only moves when the simulation sleeps or spends time"""
+
+    def __init__(self):
+        self.t = 0.0
+
+    def now(self):
+        return self.t
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.t += seconds
+
+
+class SeleniumBackend:
+    """Adapter around a selenium WebDriver"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.clock = RealClock()
+
+    @property
+    def current_url(self):
+        return self.driver.current_url
+
+    @property
+    def title(self):
+        return self.driver.title
+
+    def get(self, url):
+        self.driver.get(url)
+
+    def wait_for(self, site, locator, timeout, clickable=False):
+        """Return the element matching locator within timeout seconds, else None"""
+        condition = EC.element_to_be_clickable if clickable else EC.presence_of_element_located
+        try:
+            return WebDriverWait(self.driver, timeout).until(condition(locator))
+        except TimeoutException:
+            return None
+
+    def find_elements(self, site, locator):
+        return self.driver.find_elements(*locator)
+
+    def execute_script(self, script, *args):
+        return self.driver.execute_script(script, *args)
+
+    def execute_async_script(self, script, *args):
+        return self.driver.execute_async_script(script, *args)
+
+    def quit(self):
+        self.driver.quit()
+
+
+class SimulationProfile:
+    """Latencies (seconds) and failure rates for SimulatedBackend"""
+
+    def __init__(self, command_latency=0.01, load_latency=3.0, chat_latency=1.5, search_latency=0.8,
+                 jitter=0.3, invalid_rate=0.02, chat_failure_rate=0.01, search_failure_rate=0.5,
+                 send_failure_rate=0.005, poll_interval=0.5, disconnect_rate=0.0, disconnect_duration=120.0,
+                 ack_latency=0.5, ack_failure_rate=0.0, history_latency=0.0):
+        self.command_latency = command_latency
+        self.load_latency = load_latency
+        self.chat_latency = chat_latency
+        self.search_latency = search_latency
+        self.jitter = jitter
+        self.invalid_rate = invalid_rate
+        self.chat_failure_rate = chat_failure_rate
+        self.search_failure_rate = search_failure_rate
+        self.send_failure_rate = send_failure_rate
+        self.poll_interval = poll_interval
+        # Chance per navigation that the phone drops off for ~disconnect_duration seconds
+        self.disconnect_rate = disconnect_rate
+        self.disconnect_duration = disconnect_duration
+        # Seconds until a sent bubble gets its tick; a lost message keeps the clock
+        # until the chat is reloaded, then shows an error
+        self.ack_latency = ack_latency
+        self.ack_failure_rate = ack_failure_rate
+        # Seconds after a reopened chat is ready until its earlier messages render
+        self.history_latency = history_latency
+
+
+class SimulatedElement:
+    """Stand-in for a WebElement; typing into the compose box sends on ENTER"""
+
+    def __init__(self, backend, site):
+        self.backend = backend
+        self.site = site
+        self.buffer = []
+
+    def click(self):
+        self.backend._command()
+        if self.site == 'search_result':
+            self.backend._open_chat(self.backend.search_term, via_search=True)
+
+    def clear(self):
+        self.backend._command()
+        self.buffer = []
+
+    def send_keys(self, *values):
+        self.backend._command()
+        if Keys.DELETE in values:
+            self.buffer = []
+            return
+        if Keys.CONTROL in values:
+            return
+        if Keys.ENTER in values and Keys.SHIFT not in values:
+            if self.site == 'compose_box' and self.buffer:
+                self.backend._deliver("".join(self.buffer))
+                self.buffer = []
+            return
+        self.buffer.extend(v for v in values if v not in (Keys.SHIFT, Keys.ENTER))
+        if self.site == 'search_box':
+            self.backend._search("".join(self.buffer))
+
+
+class SimulatedBackend:
+    """In-memory WhatsApp Web with scriptable latencies on a virtual clock"""
+
+    def __init__(self, profile=None, seed=0):
+        self.profile = profile or SimulationProfile()
+        self.rng = random.Random(seed)
+        self.clock = VirtualClock()
+        self.current_url = ''
+        self.title = 'WhatsApp'
+        self.app_ready_at = float('inf')
+        self.chat_phone = None
+        self.chat_ready_at = float('inf')
+        self.chat_invalid = False
+        self.search_term = ''
+        self.search_ready_at = float('inf')
+        self.disconnected_until = 0.0
+        self.navigations = 0
+        self.outgoing = {}  # phone -> (acknowledged_at, navigation it was sent in)
+        self.delivered = Counter()
+        self.lost = 0
+        self.commands = 0
+
+    # --- internals -----------------------------------------------------
+    def _sample(self, mean):
+        if mean <= 0:
+            return 0.0
+        return max(0.0, self.rng.gauss(mean, mean * self.profile.jitter))
+
+    def _command(self):
+        self.commands += 1
+        self.clock.sleep(self._sample(self.profile.command_latency))
+
+    def _open_chat(self, phone, via_search=False):
+        self.chat_phone = phone
+        self.chat_invalid = not via_search and self.rng.random() < self.profile.invalid_rate
+        if not via_search and self.rng.random() < self.profile.chat_failure_rate:
+            self.chat_ready_at = float('inf')
+        else:
+            self.chat_ready_at = self.clock.now() + self._sample(self.profile.chat_latency)
+
+    def _search(self, term):
+        self.search_term = term
+        if self.rng.random() < self.profile.search_failure_rate:
+            self.search_ready_at = float('inf')
+        else:
+            self.search_ready_at = self.clock.now() + self._sample(self.profile.search_latency)
+
+    def _deliver(self, text):
+        now = self.clock.now()
+        if self.rng.random() < self.profile.ack_failure_rate:
+            self.lost += 1
+            self.outgoing[self.chat_phone] = (float('inf'), self.navigations)
+            return
+        self.delivered[self.chat_phone] += 1
+        acked_at = max(now, self.disconnected_until) + self._sample(self.profile.ack_latency)
+        self.outgoing[self.chat_phone] = (acked_at, self.navigations)
+
+    def _send_ack(self, timeout):
+        now = self.clock.now()
+        sent = self.outgoing.get(self.chat_phone) if self.chat_ready_at <= now else None
+        if sent is None:
+            return 'none'
+        acked_at, navigation = sent
+        if navigation != self.navigations and self.chat_ready_at + self.profile.history_latency > now:
+            return 'none'
+        if acked_at == float('inf'):
+            return 'pending' if navigation == self.navigations else 'failed'
+        if acked_at > now + timeout:
+            self.clock.sleep(timeout)
+            return 'pending'
+        # The MutationObserver fires on the icon change itself
+        self.clock.sleep(acked_at - now)
+        return 'sent'
+
+    def _ready_at(self, site):
+        if site == 'search_box':
+            return self.app_ready_at
+        # Without the phone nothing past the app shell loads until it reconnects
+        offline_until = self.disconnected_until
+        if site == 'search_result':
+            return max(self.search_ready_at, offline_until)
+        if site == 'chat_ready':
+            # The invalid-number popup sits on top of the main app
+            return max(self.app_ready_at if self.chat_invalid else self.chat_ready_at, offline_until)
+        if site == 'compose_box':
+            if self.chat_invalid or self.rng.random() < self.profile.send_failure_rate:
+                return float('inf')
+            return max(self.chat_ready_at, offline_until)
+        return float('inf')
+
+    # --- backend interface ---------------------------------------------
+    def get(self, url):
+        self._command()
+        self.current_url = url
+        self.navigations += 1
+        now = self.clock.now()
+        if now >= self.disconnected_until and self.rng.random() < self.profile.disconnect_rate:
+            self.disconnected_until = now + self._sample(self.profile.disconnect_duration)
+        self.app_ready_at = now + self._sample(self.profile.load_latency)
+        self.chat_phone = None
+        self.chat_ready_at = float('inf')
+        self.chat_invalid = False
+        self.search_ready_at = float('inf')
+        phone = parse_qs(urlparse(url).query).get('phone', [None])[0]
+        if phone:
+            self._open_chat(phone)
+
+    def wait_for(self, site, locator, timeout, clickable=False):
+        self._command()
+        now = self.clock.now()
+        ready_at = self._ready_at(site)
+        if ready_at <= now:
+            return SimulatedElement(self, site)
+        if ready_at > now + timeout:
+            self.clock.sleep(timeout)
+            return None
+        # WebDriverWait only notices the element on its next poll
+        polls = int((ready_at - now) / self.profile.poll_interval) + 1
+        self.clock.sleep(min(timeout, polls * self.profile.poll_interval))
+        return SimulatedElement(self, site)
+
+    def find_elements(self, site, locator):
+        self._command()
+        return [SimulatedElement(self, site)] if self._ready_at(site) <= self.clock.now() else []
+
+    def execute_script(self, script, *args):
+        self._command()
+        match = _PROBE_MARKER.search(script)
+        probe = match.group(1) if match else None
+        if probe == 'session_state':
+            now = self.clock.now()
+            if self.app_ready_at > now:
+                return 'loading'
+            return 'phone_disconnected' if now < self.disconnected_until else 'ready'
+        if probe == 'chat_status':
+            return 'invalid' if self.chat_invalid else 'ok'
+        if probe == 'send_ack':
+            return self._send_ack(0)
+        return None
+
+    def execute_async_script(self, script, *args):
+        self._command()
+        match = _PROBE_MARKER.search(script)
+        if match and match.group(1) == 'send_ack':
+            return self._send_ack(args[0] / 1000.0 if args else 0)
+        return None
+
+    def quit(self):
+        logging.info(f"Simulated backend: {self.commands} commands, "
+                     f"{sum(self.delivered.values())} messages delivered, {self.lost} lost")
@@ -1,15 +1,18 @@
 import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 
 import whatsapp_bulk as wb
+from contact_sources import load_contacts, supported_extensions
+
+STATS_REFRESH_MS = 500  # Stats panel redraw interval; progress events in between are coalesced
 
 
 class WhatsAppGUI:
         def __init__(self, root: tk.Tk):
             self.root = root
             self.root.title("WhatsApp Bulk Sender")
-            self.root.geometry("600x640")
+            self.root.geometry("600x780")
 
             # State vars
             self.status_var = tk.StringVar(value="Idle")
@@ -25,6 +28,7 @@ class WhatsAppGUI:
             self.contact_limit_var = tk.StringVar(value=str(wb.CONTACT_LIMIT))
             self.no_delay_var = tk.BooleanVar(value=wb.NO_DELAY)
             self.fast_mode_var = tk.BooleanVar(value=wb.FAST_MODE)
+            self.verify_chats_var = tk.BooleanVar(value=bool(wb.CHECK_VERIFY))
 
             def add_row(r, label, var, width=10):
                 ttk.Label(cfg, text=label).grid(row=r, column=0, sticky='w')
@@ -35,6 +39,8 @@ class WhatsAppGUI:
             add_row(2, "Contact Limit", self.contact_limit_var)
             ttk.Checkbutton(cfg, text="No Delay", variable=self.no_delay_var).grid(row=0, column=2, sticky='w', padx=(12,0))
             ttk.Checkbutton(cfg, text="Fast Mode", variable=self.fast_mode_var).grid(row=1, column=2, sticky='w', padx=(12,0))
+            verify_label = f"Check Only: open {wb.CHECK_VERIFY} chats" if wb.CHECK_VERIFY else "Check Only: open not-sent chats"
+            ttk.Checkbutton(cfg, text=verify_label, variable=self.verify_chats_var).grid(row=2, column=2, sticky='w', padx=(12,0))
 
             # Manual numbers frame
             manual = ttk.LabelFrame(container, text="Manual Numbers & Message")
@@ -48,7 +54,15 @@ class WhatsAppGUI:
             ttk.Label(right, text="Message:").pack(anchor='w')
             self.message_text = tk.Text(right, height=8)
             self.message_text.pack(fill=tk.BOTH, expand=True, pady=(0,4))
-            ttk.Label(right, text="Leave blank to use sheet messages").pack(anchor='w')
+            ttk.Label(right, text="Leave blank to use the contacts file or sheet").pack(anchor='w')
+
+            # Local contacts file (used when no numbers are typed above)
+            source = ttk.Frame(container)
+            source.pack(fill=tk.X)
+            self.contacts_file_var = tk.StringVar(value=wb.CONTACTS_FILE or "Google Sheet")
+            ttk.Button(source, text="Contacts File...", command=self.choose_contacts_file).pack(side=tk.LEFT, padx=4)
+            ttk.Button(source, text="Use Sheet", command=self.clear_contacts_file).pack(side=tk.LEFT, padx=4)
+            ttk.Label(source, textvariable=self.contacts_file_var).pack(side=tk.LEFT, padx=4)
 
             # Buttons
             btns = ttk.Frame(container)
@@ -63,6 +77,28 @@ class WhatsAppGUI:
             ttk.Label(container, text="Status:").pack(anchor='w')
             ttk.Label(container, textvariable=self.status_var, foreground='blue').pack(anchor='w')
 
+            # Live stats panel (fed by wb.PROGRESS events, redrawn every STATS_REFRESH_MS)
+            stats = ttk.LabelFrame(container, text="Progress")
+            stats.pack(fill=tk.X, pady=(6,0))
+            self.progress_bar = ttk.Progressbar(stats, mode='determinate', maximum=1)
+            self.progress_bar.grid(row=0, column=0, columnspan=4, sticky='ew', padx=4, pady=(4,2))
+            stats.columnconfigure(1, weight=1)
+            stats.columnconfigure(3, weight=1)
+            self.stat_vars = {}
+            for i, (key, label) in enumerate([
+                ('processed', "Processed"), ('rate', "Rate"),
+                ('eta', "ETA"), ('counts', "Sent / Failed / Skipped / Opted out"),
+                ('slowest', "Slowest phase"),
+            ]):
+                self.stat_vars[key] = tk.StringVar(value="-")
+                r, c = 1 + i // 2, (i % 2) * 2
+                ttk.Label(stats, text=label + ":").grid(row=r, column=c, sticky='w', padx=4)
+                ttk.Label(stats, textvariable=self.stat_vars[key]).grid(row=r, column=c + 1, sticky='w')
+            self._latest_progress = None
+            self._rendered_progress = None
+            wb.PROGRESS.add_listener(self._on_progress)
+            self.root.after(STATS_REFRESH_MS, self._refresh_stats)
+
             self.log_box = tk.Text(container, height=14, state='disabled', wrap='word')
             self.log_box.pack(fill=tk.BOTH, expand=True, pady=(6,0))
 
@@ -82,6 +118,30 @@ class WhatsAppGUI:
 
             wb.logging.info = hooked
 
+        def _on_progress(self, event, snapshot):
+            # Runs on the worker thread: only keep the newest snapshot
+            self._latest_progress = snapshot
+
+        def _refresh_stats(self):
+            snap = self._latest_progress
+            if snap is not None and snap is not self._rendered_progress:
+                self._rendered_progress = snap
+                total = snap['total'] or 1
+                self.progress_bar.configure(maximum=total, value=min(snap['processed'], total))
+                self.stat_vars['processed'].set(f"{snap['processed']}/{snap['total']}")
+                self.stat_vars['rate'].set(f"{snap['rolling_rate_per_minute']:.1f} contacts/min")
+                eta = snap['eta_seconds']
+                if eta is None or snap['state'] == 'finished':
+                    self.stat_vars['eta'].set("-")
+                else:
+                    m, sec = divmod(int(eta), 60)
+                    h, m = divmod(m, 60)
+                    self.stat_vars['eta'].set(f"{h:d}:{m:02d}:{sec:02d}")
+                self.stat_vars['counts'].set(f"{snap['success']} / {snap['failed']} / {snap['skipped_duplicates']} / {snap['suppressed']}")
+                slowest = snap['slowest_recent_phase']
+                self.stat_vars['slowest'].set(f"{slowest['phase']} ({slowest['seconds']:.1f}s)" if slowest else "-")
+            self.root.after(STATS_REFRESH_MS, self._refresh_stats)
+
         def _append_log(self, text: str):
             self.log_box.configure(state='normal')
             self.log_box.insert(tk.END, text + "\n")
@@ -116,9 +176,21 @@ class WhatsAppGUI:
             self.worker_thread.start()
             self._append_log("Campaign started")
 
+        def choose_contacts_file(self):
+            patterns = " ".join(f"*{ext}" for ext in supported_extensions())
+            path = filedialog.askopenfilename(title="Contacts file",
+                                              filetypes=[("Contact files", patterns), ("All files", "*.*")])
+            if path:
+                wb.CONTACTS_FILE = path
+                self.contacts_file_var.set(path)
+
+        def clear_contacts_file(self):
+            wb.CONTACTS_FILE = ''
+            self.contacts_file_var.set("Google Sheet")
+
         def _run(self):
             try:
-                wb.run_campaign()
+                wb.run_profiled(wb.run_campaign)
                 self.status_var.set("Finished")
             except Exception as e:
                 self.status_var.set(f"Error: {e}")
@@ -147,8 +219,8 @@ class WhatsAppGUI:
                 messagebox.showinfo("Running", "Another task is running")
                 return
             numbers = [n.strip() for n in self.numbers_text.get('1.0', tk.END).strip().splitlines() if n.strip()]
-            if not numbers:
-                messagebox.showerror("No Numbers", "Enter numbers to check")
+            if not numbers and not wb.CONTACTS_FILE:
+                messagebox.showerror("No Numbers", "Enter numbers or choose a contacts file to check")
                 return
             self.status_var.set("Checking")
             self.worker_thread = threading.Thread(target=self._run_check, daemon=True)
@@ -158,7 +230,11 @@ class WhatsAppGUI:
         def _run_check(self):
             try:
                 numbers = [n.strip() for n in self.numbers_text.get('1.0', tk.END).strip().splitlines() if n.strip()]
-                wb.open_chats_check_only(numbers)
+                if not numbers:
+                    numbers = load_contacts(wb.CONTACTS_FILE).number_list()
+                # The configured CHECK_VERIFY / --verify= statuses; NOT_SENT when none are set
+                verify = (wb.CHECK_VERIFY or 'NOT_SENT') if self.verify_chats_var.get() else ''
+                wb.run_profiled(wb.open_chats_check_only, numbers, verify=verify)
                 self.status_var.set("Check Complete")
             except Exception as e:
                 self.status_var.set(f"Error: {e}")
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Indexed send history across all sent-message ledgers.
+
+Every `sent_messages_*.log` (plain or gzip-rotated) is ingested into a small
+SQLite database keyed by canonical number and send time, so "when did we last
+message X?" and date-range questions are answered from an index instead of by
+grepping months of logs. Ingestion is incremental: plain ledgers are read
+from the last ingested byte offset, rotated files only once.
+
+rotate_logs() gzips ledgers, sender logs and contact traces that have not
+been written to for `keep_days` days, re-keying the index so nothing is
+ingested twice.
+
+    python history.py 919876543210 "+91 98765 43211"
+    python history.py --since 2025-01-01 --until 2025-01-31
+    python history.py --rotate --keep-days 14
+"""
+
+import argparse
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import time
+
+from preflight import canonical_number
+
+LEDGER_PREFIX = 'sent_messages_'
+ROTATED_PREFIXES = ('sent_messages_', 'whatsapp_sender_', 'contact_trace_')
+ROTATED_SUFFIXES = ('.log', '.jsonl')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sends (
+    number  TEXT NOT NULL,
+    sent_at TEXT NOT NULL,
+    name    TEXT,
+    preview TEXT,
+    source  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sends_by_number ON sends (number, sent_at);
+CREATE INDEX IF NOT EXISTS sends_by_time ON sends (sent_at);
+CREATE TABLE IF NOT EXISTS ingested (
+    source TEXT PRIMARY KEY,
+    size   INTEGER NOT NULL,
+    offset INTEGER NOT NULL
+);
+"""
+
+
+def _is_ledger(name):
+    return name.startswith(LEDGER_PREFIX) and (name.endswith('.log') or name.endswith('.log.gz'))
+
+
+def _parse_ledger(lines, source, default_country_code):
+    """Yield (number, sent_at, name, preview, source) rows from ledger lines"""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        # Format: timestamp|number|name|message_preview
+        parts = line.split('|', 3)
+        if len(parts) < 2:
+            continue
+        number = canonical_number(parts[1], default_country_code)[0]
+        if not number:
+            continue
+        name = parts[2] if len(parts) > 2 else ''
+        preview = parts[3] if len(parts) > 3 else ''
+        yield number, parts[0].strip(), name, preview, source
+
+
+class HistoryIndex:
+    """SQLite index of every send recorded in the ledgers of a logs directory"""
+
+    def __init__(self, db_path, default_country_code=''):
+        self.db_path = db_path
+        self.default_country_code = default_country_code
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # --- ingestion -----------------------------------------------------
+    def sync(self, logs_dir):
+        """Ingest new ledger lines from logs_dir; returns the number of sends added"""
+        added = 0
+        known = dict((row[0], (row[1], row[2])) for row in self.conn.execute("SELECT source, size, offset FROM ingested"))
+        with self.conn:
+            for name in sorted(os.listdir(logs_dir)):
+                if not _is_ledger(name):
+                    continue
+                path = os.path.join(logs_dir, name)
+                size = os.path.getsize(path)
+                done_size, offset = known.get(name, (0, 0))
+                if name.endswith('.gz'):
+                    if name in known and done_size == size:
+                        continue
+                    self.conn.execute("DELETE FROM sends WHERE source = ?", (name,))
+                    with gzip.open(path, 'rt', encoding='utf-8', errors='replace') as f:
+                        rows = list(_parse_ledger(f, name, self.default_country_code))
+                    new_offset = size
+                else:
+                    if size == offset:
+                        continue
+                    if size < offset:
+                        # Truncated or replaced: start over
+                        self.conn.execute("DELETE FROM sends WHERE source = ?", (name,))
+                        offset = 0
+                    with open(path, 'rb') as f:
+                        f.seek(offset)
+                        chunk = f.read()
+                    # Leave a partially written last line for the next sync
+                    complete = chunk[:chunk.rfind(b'\n') + 1]
+                    text = complete.decode('utf-8', errors='replace')
+                    rows = list(_parse_ledger(text.splitlines(), name, self.default_country_code))
+                    new_offset = offset + len(complete)
+                self.conn.executemany("INSERT INTO sends VALUES (?, ?, ?, ?, ?)", rows)
+                self.conn.execute("INSERT OR REPLACE INTO ingested VALUES (?, ?, ?)", (name, size, new_offset))
+                added += len(rows)
+        return added
+
+    def rename_source(self, old_name, new_name, new_size):
+        """Re-key a ledger after it was rotated so it is not ingested again"""
+        with self.conn:
+            self.conn.execute("UPDATE sends SET source = ? WHERE source = ?", (new_name, old_name))
+            self.conn.execute("DELETE FROM ingested WHERE source = ?", (old_name,))
+            self.conn.execute("INSERT OR REPLACE INTO ingested VALUES (?, ?, ?)", (new_name, new_size, new_size))
+
+    # --- queries -------------------------------------------------------
+    def lookup(self, number, since=None, until=None):
+        """All sends to one number (any format), oldest first, optionally within [since, until]"""
+        canonical = canonical_number(number, self.default_country_code)[0]
+        sql = "SELECT number, sent_at, name, preview, source FROM sends WHERE number = ?"
+        params = [canonical]
+        sql, params = self._time_filter(sql, params, since, until)
+        return [self._row(r) for r in self.conn.execute(sql + " ORDER BY sent_at", params)]
+
+    def last_sent(self, number):
+        """Timestamp of the most recent send to a number, or None"""
+        canonical = canonical_number(number, self.default_country_code)[0]
+        row = self.conn.execute("SELECT MAX(sent_at) FROM sends WHERE number = ?", (canonical,)).fetchone()
+        return row[0] if row else None
+
+    def last_sent_many(self, numbers):
+        """{canonical number: last sent_at} for the numbers that were ever messaged"""
+        canonical = {canonical_number(n, self.default_country_code)[0] for n in numbers}
+        canonical.discard('')
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (number TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM wanted")
+            self.conn.executemany("INSERT INTO wanted VALUES (?)", ((n,) for n in canonical))
+        rows = self.conn.execute(
+            "SELECT s.number, MAX(s.sent_at) FROM wanted w JOIN sends s ON s.number = w.number GROUP BY s.number"
+        )
+        return dict(rows.fetchall())
+
+    def between(self, since=None, until=None, limit=None):
+        """Sends within [since, until] (ISO dates or timestamps), oldest first"""
+        sql, params = self._time_filter("SELECT number, sent_at, name, preview, source FROM sends WHERE 1 = 1",
+                                        [], since, until)
+        sql += " ORDER BY sent_at"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [self._row(r) for r in self.conn.execute(sql, params)]
+
+    def stats(self):
+        count, numbers, first, last = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT number), MIN(sent_at), MAX(sent_at) FROM sends"
+        ).fetchone()
+        return {'sends': count, 'numbers': numbers, 'first': first, 'last': last}
+
+    @staticmethod
+    def _time_filter(sql, params, since, until):
+        if since:
+            sql += " AND sent_at >= ?"
+            params.append(since)
+        if until:
+            # A bare date means the whole day
+            sql += " AND sent_at <= ?"
+            params.append(until + ' 23:59:59' if len(until) == 10 else until)
+        return sql, params
+
+    @staticmethod
+    def _row(row):
+        return {'number': row[0], 'sent_at': row[1], 'name': row[2], 'preview': row[3], 'source': row[4]}
+
+
+def list_logs(logs_dir, prefix, suffix):
+    """Names of the logs with that prefix and suffix, plain or rotated (.gz), oldest first"""
+    return sorted(
+        name for name in os.listdir(logs_dir)
+        if name.startswith(prefix) and (name.endswith(suffix) or name.endswith(suffix + '.gz'))
+    )
+
+
+def open_log(path):
+    """Open a plain or rotated (.gz) log for reading text"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8')
+
+
+def rotate_logs(logs_dir, keep_days=14, index=None):
+    """Gzip ledgers, sender logs and traces untouched for keep_days days; returns the files compressed.
+
+    When an index is given it is synced first and re-keyed for rotated ledgers.
+    """
+    if index is not None:
+        index.sync(logs_dir)
+    cutoff = time.time() - keep_days * 86400
+    rotated = []
+    for name in sorted(os.listdir(logs_dir)):
+        if not name.startswith(ROTATED_PREFIXES) or not name.endswith(ROTATED_SUFFIXES):
+            continue
+        path = os.path.join(logs_dir, name)
+        try:
+            if os.path.getmtime(path) > cutoff:
+                continue
+            with open(path, 'rb') as src, gzip.open(path + '.gz', 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path)
+        except OSError as e:
+            logging.warning(f"Could not rotate {name}: {str(e)}")
+            continue
+        if index is not None and _is_ledger(name):
+            index.rename_source(name, name + '.gz', os.path.getsize(path + '.gz'))
+        rotated.append(name)
+    if rotated:
+        logging.info(f"Rotated {len(rotated)} old log file(s) older than {keep_days} days to .gz")
+    return rotated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the indexed send history")
+    parser.add_argument('numbers', nargs='*', help='numbers to look up (any format)')
+    parser.add_argument('--since', help='start date/time, e.g. 2025-01-01')
+    parser.add_argument('--until', help='end date/time (a bare date includes the whole day)')
+    parser.add_argument('--limit', type=int, default=200, help='max rows for date-range queries')
+    parser.add_argument('--logs-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs'))
+    parser.add_argument('--db', help='index file (default: <logs-dir>/history.sqlite)')
+    parser.add_argument('--country-code', default=os.environ.get('DEFAULT_COUNTRY_CODE', ''),
+                        help='country code for national-format numbers')
+    parser.add_argument('--rotate', action='store_true', help='gzip old logs before querying')
+    parser.add_argument('--keep-days', type=int, default=int(os.environ.get('LOG_RETENTION_DAYS', '14')))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    index = HistoryIndex(args.db or os.path.join(args.logs_dir, 'history.sqlite'), args.country_code)
+    started = time.perf_counter()
+    if args.rotate:
+        rotate_logs(args.logs_dir, args.keep_days, index)
+    added = index.sync(args.logs_dir)
+    stats = index.stats()
+    print(f"index: {stats['sends']} sends to {stats['numbers']} numbers ({stats['first']} .. {stats['last']}), "
+          f"{added} new, synced in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    started = time.perf_counter()
+    if args.numbers:
+        for number in args.numbers:
+            rows = index.lookup(number, args.since, args.until)
+            if not rows:
+                print(f"{number}: never messaged")
+                continue
+            print(f"{number}: {len(rows)} send(s), last {rows[-1]['sent_at']}")
+            for row in rows:
+                print(f"  {row['sent_at']}  {row['name'] or '-'}  {row['preview']}  [{row['source']}]")
+    elif args.since or args.until:
+        rows = index.between(args.since, args.until, args.limit)
+        for row in rows:
+            print(f"{row['sent_at']}  {row['number']}  {row['name'] or '-'}  {row['preview']}")
+        print(f"{len(rows)} send(s){' (limit reached)' if len(rows) == args.limit else ''}")
+    print(f"query: {(time.perf_counter() - started) * 1000:.1f} ms")
+    index.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
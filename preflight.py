@@ -0,0 +1,131 @@
+"""
+Pre-flight validation of the contact table.
+
+Runs once over the whole table before the browser opens: every number is
+canonicalized to international digits (country code included, no '+'),
+malformed and out-of-range numbers are rejected, and rows repeating an
+earlier number in another format ("+91 98..." vs "9198...") are collapsed.
+Only the sendable rows are handed to the send loop, with the canonical
+numbers packed as uint64.
+"""
+
+import json
+import logging
+import math
+import re
+from array import array
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+# E.164: at most 15 digits including the country code; nothing real is shorter than 8
+MIN_DIGITS = 8
+MAX_DIGITS = 15
+# Numbers written without '+'/'00' and at most this long are treated as national
+# numbers when a default country code is configured
+NATIONAL_MAX_DIGITS = 10
+
+_ALLOWED = re.compile(r'[\d\s+\-().]+')
+_FLOAT_SUFFIX = re.compile(r'(\d+)\.0+')
+_SCIENTIFIC = re.compile(r'\d(?:\.\d+)?[eE]\+?\d+')
+_NON_DIGITS = re.compile(r'\D')
+
+
+def canonical_number(raw, default_country_code=''):
+    """Return (digits, reason) for one raw number.
+
+    digits is the canonical international number without '+'; reason is ''
+    when the number is sendable and a short rejection reason otherwise.
+    """
+    if raw is None or (isinstance(raw, float) and math.isnan(raw)):
+        return '', 'missing'
+    text = str(raw).strip()
+    if not text or text.lower() == 'nan':
+        return '', 'missing'
+    if text.isdigit():
+        digits = text
+        international = text.startswith('00')
+    else:
+        # Sheets hand numeric cells over as floats ("919876543210.0", "9.1987654321E+11")
+        match = _FLOAT_SUFFIX.fullmatch(text)
+        if match:
+            text = match.group(1)
+        elif _SCIENTIFIC.fullmatch(text):
+            try:
+                text = str(int(Decimal(text)))
+            except (InvalidOperation, ValueError):
+                return '', 'malformed'
+        if not _ALLOWED.fullmatch(text):
+            return '', 'malformed'
+        international = text.startswith(('+', '00'))
+        digits = _NON_DIGITS.sub('', text)
+    if international and digits.startswith('00'):
+        digits = digits[2:]
+    if default_country_code and not international:
+        subscriber = digits.lstrip('0')  # drop the national trunk prefix
+        if len(subscriber) <= NATIONAL_MAX_DIGITS:
+            digits = default_country_code + subscriber
+    if len(digits) < MIN_DIGITS:
+        return digits, 'too short'
+    if len(digits) > MAX_DIGITS:
+        return digits, 'too long'
+    if digits.startswith('0'):
+        return digits, 'no country code'
+    return digits, ''
+
+
+def run_preflight(contacts, default_country_code=''):
+    """Validate and deduplicate a ContactStore.
+
+    Returns (sendable, report): sendable is a new store with the valid,
+    first-seen contacts and their canonical numbers; report summarizes what
+    was dropped and why.
+    """
+    keep = []
+    canonical = []
+    first_row = {}
+    rejected = []
+    for pos, raw in enumerate(contacts.numbers):
+        digits, reason = canonical_number(raw, default_country_code)
+        if not reason:
+            seen = first_row.get(digits)
+            if seen is None:
+                first_row[digits] = pos
+                keep.append(pos)
+                canonical.append(digits)
+                continue
+            reason = 'duplicate in list'
+        entry = {'row': pos + 1, 'number': '' if reason == 'missing' else str(raw), 'reason': reason}
+        if reason == 'duplicate in list':
+            entry['canonical'] = digits
+            entry['duplicate_of_row'] = seen + 1
+        rejected.append(entry)
+
+    # Canonical numbers never start with 0, so they survive the round trip through uint64
+    sendable = contacts.take(keep, numbers=array('Q', map(int, canonical)))
+    report = {
+        'rows': len(contacts),
+        'sendable': len(sendable),
+        'rejected': len(rejected),
+        'rejected_by_reason': dict(Counter(r['reason'] for r in rejected)),
+        'rejected_rows': rejected,
+    }
+    return sendable, report
+
+
+def write_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def log_report(report, path=None):
+    logging.info("PRE-FLIGHT SUMMARY:")
+    logging.info(f"  Rows checked:  {report['rows']}")
+    logging.info(f"  Sendable:      {report['sendable']}")
+    for reason, count in sorted(report['rejected_by_reason'].items()):
+        logging.info(f"  Rejected ({reason}): {count}")
+    for entry in report['rejected_rows'][:5]:
+        logging.info(f"    row {entry['row']}: '{entry['number']}' - {entry['reason']}")
+    if report['rejected'] > 5:
+        logging.info(f"    ... {report['rejected'] - 5} more")
+    if path:
+        logging.info(f"  Full report:   {path}")
@@ -0,0 +1,225 @@
+"""
+Opt-in profiling for campaign runs.
+
+Two modes are available:
+
+- ``cprofile``: deterministic cProfile run, dumped as a .prof file (open with
+  snakeviz or pstats).
+- ``sample``: a wall-clock sampling profiler. A background thread samples the
+  worker thread's stack every few milliseconds and tags each sample as
+  ``cpu`` (Python busy), ``webdriver`` (blocked on a WebDriver round trip) or
+  ``wait`` (sleeps, pacing, other I/O). Samples are written as folded stacks
+  plus a self-contained SVG flame graph.
+
+Both modes log the top offending functions when the run finishes.
+"""
+
+import cProfile
+import html
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+MODES = ('cprofile', 'sample')
+SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', '0.005'))
+TOP_N = 20
+
+# A sample counts as CPU when the thread burned at least this share of the
+# wall time elapsed since the previous sample.
+_CPU_BUSY_RATIO = 0.5
+
+
+def resolve_mode(value):
+    """Map PROFILE / --profile values to a mode ('' disables profiling)"""
+    value = (value or '').strip().lower()
+    if value in ('', '0', 'false', 'off', 'no'):
+        return ''
+    if value in ('1', 'true', 'on', 'yes'):
+        return 'sample'
+    if value not in MODES:
+        logging.warning(f"Unknown profile mode '{value}', using 'sample'")
+        return 'sample'
+    return value
+
+
+def _thread_cpu_clock(thread_id):
+    """Return a callable reading the CPU time of another thread, if the OS allows it"""
+    try:
+        clock_id = time.pthread_getcpuclockid(thread_id)
+        time.clock_gettime(clock_id)
+        return lambda: time.clock_gettime(clock_id)
+    except (AttributeError, OSError):
+        return None
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}"
+
+
+def _is_webdriver_stack(frames):
+    return any(
+        'selenium' in f.f_code.co_filename or 'urllib3' in f.f_code.co_filename
+        for f in frames
+    )
+
+
+class SamplingProfiler:
+    """Samples one thread's stack at a fixed wall-clock interval"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.categories = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._cpu_clock = _thread_cpu_clock(thread_id)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        last_wall = time.perf_counter()
+        last_cpu = self._cpu_clock() if self._cpu_clock else 0.0
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(frame)
+                frame = frame.f_back
+            frames.reverse()
+
+            now = time.perf_counter()
+            if self._cpu_clock:
+                cpu = self._cpu_clock()
+                busy = (cpu - last_cpu) >= _CPU_BUSY_RATIO * (now - last_wall)
+                last_cpu = cpu
+            else:
+                # No per-thread CPU clock (e.g. Windows): treat everything
+                # outside WebDriver calls as CPU.
+                busy = not _is_webdriver_stack(frames)
+            last_wall = now
+
+            if busy:
+                category = 'cpu'
+            elif _is_webdriver_stack(frames):
+                category = 'webdriver'
+            else:
+                category = 'wait'
+            self.categories[category] += 1
+            self.stacks[';'.join([category] + [_frame_label(f) for f in frames])] += 1
+
+    def write_folded(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def top_functions(self, n=TOP_N):
+        """Return [(category, function, samples)] sorted by self samples"""
+        leaf = Counter()
+        for stack, count in self.stacks.items():
+            parts = stack.split(';')
+            leaf[(parts[0], parts[-1])] += count
+        return [(cat, fn, count) for (cat, fn), count in leaf.most_common(n)]
+
+
+def write_flamegraph_svg(stacks, path, title="Wall-clock flame graph", width=1200, row_height=16):
+    """Render folded stacks {stack: samples} into a standalone SVG"""
+    root = {'name': 'all', 'value': 0, 'children': {}}
+    for stack, count in stacks.items():
+        node = root
+        node['value'] += count
+        for part in stack.split(';'):
+            node = node['children'].setdefault(part, {'name': part, 'value': 0, 'children': {}})
+            node['value'] += count
+
+    colors = {'cpu': (230, 110, 60), 'webdriver': (70, 130, 200), 'wait': (150, 150, 150)}
+    depth_count = 1 + max((stack.count(';') + 1 for stack in stacks), default=0)
+    height = depth_count * row_height + 30
+    rects = []
+
+    def walk(node, x, depth, category):
+        w = node['value'] / root['value'] * width if root['value'] else 0
+        if w < 0.5:
+            return
+        # Flame graphs grow upwards: depth 0 sits at the bottom
+        y = height - (depth + 1) * row_height
+        r, g, b = colors.get(category, (200, 170, 80))
+        shade = (depth * 13) % 40
+        label = html.escape(node['name'])
+        text = f'<text x="{x + 3:.1f}" y="{y + row_height - 4}" font-size="11">{label[:int(w / 7)]}</text>' if w > 30 else ''
+        rects.append(
+            f'<g><title>{label} ({node["value"]} samples)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 1}" '
+            f'fill="rgb({min(255, r + shade)},{min(255, g + shade)},{min(255, b + shade)})"/>{text}</g>'
+        )
+        child_x = x
+        for child in sorted(node['children'].values(), key=lambda c: c['name']):
+            walk(child, child_x, depth + 1, category if depth else child['name'])
+            child_x += child['value'] / root['value'] * width
+
+    walk(root, 0.0, 0, 'all')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace">'
+            f'<text x="4" y="16" font-size="13">{html.escape(title)} '
+            '(orange = Python CPU, blue = WebDriver wait, grey = sleeps/other wait)</text>'
+            f'{"".join(rects)}</svg>'
+        )
+
+
+def run_profiled(func, *args, mode='sample', output_dir='.', label='run', **kwargs):
+    """Run func(*args, **kwargs) under the given profiler and dump results to output_dir"""
+    mode = resolve_mode(mode)
+    if not mode:
+        return func(*args, **kwargs)
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, f"profile_{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    logging.info(f"PROFILING ENABLED ({mode}): results will be written to {base}.*")
+
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(base + '.prof')
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(TOP_N)
+            logging.info(f"Profile saved to {base}.prof")
+            logging.info(f"Top {TOP_N} functions by cumulative time:\n{out.getvalue()}")
+
+    sampler = SamplingProfiler(threading.get_ident())
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        sampler.stop()
+        elapsed = time.perf_counter() - started
+        sampler.write_folded(base + '.folded')
+        write_flamegraph_svg(sampler.stacks, base + '.svg', title=f"{label} ({elapsed:.1f}s wall)")
+        total = sum(sampler.categories.values()) or 1
+        logging.info(f"Profile saved to {base}.folded and {base}.svg")
+        logging.info(
+            "Wall-clock split: "
+            + ", ".join(f"{cat}={sampler.categories[cat] / total:.1%}" for cat in ('cpu', 'webdriver', 'wait'))
+        )
+        logging.info(f"Top {TOP_N} functions by self samples:")
+        for category, function, count in sampler.top_functions():
+            logging.info(f"  {count / total:6.1%}  [{category}] {function}")
@@ -0,0 +1,175 @@
+"""
+Versioned selector packs for WhatsApp Web.
+
+Each pack is the full set of selectors the sender needs for one generation of
+the WhatsApp Web markup, per site:
+
+- wait sites: 'compose_box', 'search_box', 'search_result', 'invalid_popup'
+  ('chat_ready' waits on compose_box and invalid_popup together);
+- probe sites, only queried from the JavaScript probes: 'app_ready',
+  'phone_alert', 'qr', 'chat_popup', and for the send-acknowledgement probe
+  'chat_pane' (the open chat), 'message_out' (outgoing bubbles inside it) and
+  'message_status' (the clock/tick/error icon inside a bubble).
+
+Every selector is an (xpath, css) pair. A site's selectors are combined into
+one XPath union or one CSS selector list. Both return matches in document
+order, so either syntax finds the same first element. CSS is used whenever
+every selector of the site has a CSS form, since the browser matches it
+natively. Probe-only selectors have no XPath.
+
+Packs:
+
+- 'classic': the obfuscated class names of the older UI (_13NKt, zoWT4, _199zF);
+- 'testid': data-testid / data-tab / data-id / data-icon / id hooks only, no
+  class-name scans;
+- 'combined' (default): both, in the order the sender has always tried them.
+
+benchmarks/bench_selector_packs.py checks every pack against saved DOM
+snapshots and times it, to pick the fastest correct pack for a UI version.
+"""
+
+import logging
+
+from selenium.webdriver.common.by import By
+
+WAIT_SITES = ('compose_box', 'search_box', 'search_result', 'invalid_popup')
+PROBE_SITES = ('app_ready', 'phone_alert', 'qr', 'chat_popup', 'chat_pane', 'message_out', 'message_status')
+SYNTAXES = ('css', 'xpath')
+
+DEFAULT_PACK = 'combined'
+
+
+class SelectorPack:
+    """Selectors for one version of the WhatsApp Web markup"""
+
+    def __init__(self, name, version, description, sites):
+        self.name = name
+        self.version = version
+        self.description = description
+        self.sites = sites  # site -> [(xpath or None, css or None), ...]
+
+    def xpath(self, *sites):
+        """XPath union of the sites' selectors, or None if one has no XPath form"""
+        parts = [xpath for site in sites for xpath, _ in self.sites[site]]
+        return None if None in parts else " | ".join(parts)
+
+    def css(self, *sites):
+        """CSS selector list of the sites' selectors, or None if one has no CSS form"""
+        parts = [css for site in sites for _, css in self.sites[site]]
+        return None if None in parts else ", ".join(parts)
+
+    def locator(self, *sites, syntax='css'):
+        """(By, value) for a wait on any of the sites, in the preferred syntax when it has one"""
+        css = self.css(*sites)
+        if css is not None and (syntax == 'css' or self.xpath(*sites) is None):
+            return (By.CSS_SELECTOR, css)
+        return (By.XPATH, self.xpath(*sites))
+
+
+_CLASSIC = {
+    'compose_box': [
+        ("//footer//div[@contenteditable='true']", "footer div[contenteditable='true']"),
+        ("//div[contains(@class, '_13NKt')][@contenteditable='true']", "div[class*='_13NKt'][contenteditable='true']"),
+    ],
+    'search_box': [
+        ("//input[@type='text'][@placeholder='Search or start new chat']",
+         "input[type='text'][placeholder='Search or start new chat']"),
+        ("//div[@title='Search or start new chat']", "div[title='Search or start new chat']"),
+        ("//div[contains(@class, 'search')]//div[@contenteditable='true']",
+         "div[class*='search'] div[contenteditable='true']"),
+    ],
+    'search_result': [
+        ("//div[@id='pane-side']//div[contains(@class, 'zoWT4')]//span", "div#pane-side div[class*='zoWT4'] span"),
+        ("//div[contains(@class, '_199zF')]", "div[class*='_199zF']"),
+        ("//div[contains(@class, 'zoWT4')]", "div[class*='zoWT4']"),
+    ],
+    'invalid_popup': [
+        ("//div[@data-animate-modal-popup='true']", "div[data-animate-modal-popup='true']"),
+    ],
+    'app_ready': [(None, "#pane-side"), (None, "div.two")],
+    'phone_alert': [(None, "[data-icon='alert-phone']")],
+    'qr': [(None, "div[data-ref] canvas"), (None, "div[class*='qr-']")],
+    'chat_popup': [(None, "[data-animate-modal-popup='true']"), (None, "div[role='dialog']")],
+    'chat_pane': [(None, "#main")],
+    'message_out': [(None, ".message-out")],
+    'message_status': [(None, "[data-icon^='msg-']"), (None, "[data-icon^='status-']")],
+}
+
+_TESTID = {
+    'compose_box': [
+        ("//*[@data-testid='conversation-compose-box-input']", "[data-testid='conversation-compose-box-input']"),
+        ("//*[@data-testid='compose-box-input']", "[data-testid='compose-box-input']"),
+        ("//div[@contenteditable='true'][@data-tab='10']", "div[contenteditable='true'][data-tab='10']"),
+    ],
+    'search_box': [
+        ("//div[@contenteditable='true'][@data-tab='3']", "div[contenteditable='true'][data-tab='3']"),
+        ("//*[@data-testid='chat-list-search']", "[data-testid='chat-list-search']"),
+    ],
+    'search_result': [
+        ("//*[@id='pane-side']//*[@role='listitem']", "#pane-side [role='listitem']"),
+    ],
+    'invalid_popup': [
+        ("//*[@data-testid='popup-contents']", "[data-testid='popup-contents']"),
+    ],
+    'app_ready': [(None, "#pane-side"), (None, "[data-testid='pane-side']"), (None, "[data-testid='chat-list']"),
+                  (None, "#main")],
+    'phone_alert': [(None, "[data-testid='alert-phone']"), (None, "[data-testid='alert-computer']")],
+    'qr': [(None, "canvas[aria-label*='QR' i]"), (None, "img[alt*='QR' i]")],
+    'chat_popup': [(None, "[data-testid='popup-contents']"), (None, "div[role='dialog']")],
+    'chat_pane': [(None, "#main")],
+    # Message ids of outgoing messages start with 'true_' (fromMe)
+    'message_out': [(None, "[data-id^='true_']")],
+    'message_status': [(None, "[data-icon^='msg-']"), (None, "[data-icon^='status-']")],
+}
+
+# The selectors the sender used before packs existed, in the same order
+_COMBINED = {
+    'compose_box': _TESTID['compose_box'] + _CLASSIC['compose_box'],
+    'search_box': [
+        _TESTID['search_box'][0],
+        _CLASSIC['search_box'][0],
+        _CLASSIC['search_box'][1],
+        _TESTID['search_box'][1],
+        _CLASSIC['search_box'][2],
+    ],
+    'search_result': [
+        _CLASSIC['search_result'][0],
+        ("//div[contains(@class, 'chat-list')]//div[contains(@class, 'chat')]",
+         "div[class*='chat-list'] div[class*='chat']"),
+        ("//div[@role='listitem']//div[contains(@class, 'contact')]", "div[role='listitem'] div[class*='contact']"),
+        ("//div[contains(@class, 'chat')]//div[contains(@class, 'contact')]",
+         "div[class*='chat'] div[class*='contact']"),
+        ("//div[@role='listitem']//div[contains(@class, 'chat')]", "div[role='listitem'] div[class*='chat']"),
+        _CLASSIC['search_result'][1],
+        _CLASSIC['search_result'][2],
+    ],
+    'invalid_popup': _TESTID['invalid_popup'] + _CLASSIC['invalid_popup'],
+    'app_ready': [(None, "#pane-side"), (None, "[data-testid='pane-side']"), (None, "[data-testid='chat-list']"),
+                  (None, "#main"), (None, "div.two")],
+    'phone_alert': [(None, "[data-testid='alert-phone']"), (None, "[data-icon='alert-phone']"),
+                    (None, "[data-testid='alert-computer']")],
+    'qr': [(None, "canvas[aria-label*='QR' i]"), (None, "div[data-ref] canvas"), (None, "img[alt*='QR' i]"),
+           (None, "div[class*='qr-']")],
+    'chat_popup': [(None, "[data-testid='popup-contents']"), (None, "[data-animate-modal-popup='true']"),
+                   (None, "div[role='dialog']")],
+    'chat_pane': _CLASSIC['chat_pane'],
+    # The bubble inside a message row comes after the row in document order, so the
+    # last match is always the newest bubble
+    'message_out': _TESTID['message_out'] + _CLASSIC['message_out'],
+    'message_status': _CLASSIC['message_status'],
+}
+
+PACKS = {
+    'classic': SelectorPack('classic', 1, "obfuscated class names of the older UI", _CLASSIC),
+    'testid': SelectorPack('testid', 2, "data-testid / data-tab attributes only", _TESTID),
+    'combined': SelectorPack('combined', 3, "classic and testid selectors together", _COMBINED),
+}
+
+
+def resolve_pack(name):
+    """Map SELECTOR_PACK / --selectors values to a pack"""
+    name = (name or '').strip().lower() or DEFAULT_PACK
+    if name not in PACKS:
+        logging.warning(f"Unknown selector pack '{name}', using '{DEFAULT_PACK}'")
+        name = DEFAULT_PACK
+    return PACKS[name]
@@ -0,0 +1,78 @@
+"""
+Send-acknowledgement tracking.
+
+Pressing ENTER only hands a message to WhatsApp Web. The outgoing bubble shows
+a clock (msg-time) until the message has left, then a tick (msg-check), a
+double tick (delivered) and a blue double tick (read). A message that never
+leaves the clock state, or gets an error icon, is lost unless someone notices.
+
+run_campaign submits every send here and checks its bubble once, just before
+the next chat is opened, so the check overlaps the pacing delay instead of
+adding to send latency. Confirmed sends are written to the ledger; the rest
+are queued and re-checked (and re-sent if they show an error) after the last
+contact.
+"""
+
+import logging
+from collections import Counter
+
+CONFIRMED = ('sent', 'delivered', 'read')
+# The bubble or its status icon could not be read (layout changes); such sends
+# are trusted as before rather than re-sent
+UNREADABLE = ('none', 'unknown')
+
+
+class PendingSend:
+    """A submitted message waiting for its acknowledgement"""
+    __slots__ = ('number', 'name', 'message', 'status')
+
+    def __init__(self, number, name, message):
+        self.number = number
+        self.name = name
+        self.message = message
+        self.status = 'pending'
+
+
+class AckTracker:
+    """Holds the last submitted send and the queue of unconfirmed ones"""
+
+    def __init__(self):
+        self.pending = None
+        self.queue = []
+        self.statuses = Counter()
+        self.recovered = 0
+        self.lost = 0
+
+    def submit(self, number, name, message):
+        self.pending = PendingSend(number, name, message)
+
+    def take(self):
+        pending, self.pending = self.pending, None
+        return pending
+
+    def settle(self, pending, status):
+        """Record the first check of a send; returns True when it can go to the ledger"""
+        pending.status = status
+        self.statuses[status] += 1
+        if status in CONFIRMED or status in UNREADABLE:
+            return True
+        self.queue.append(pending)
+        return False
+
+    def drain(self):
+        queue, self.queue = self.queue, []
+        return queue
+
+    def log_summary(self):
+        if not self.statuses:
+            return
+        confirmed = sum(self.statuses[s] for s in CONFIRMED)
+        unreadable = sum(self.statuses[s] for s in UNREADABLE)
+        queued = sum(self.statuses.values()) - confirmed - unreadable
+        logging.info("SEND ACKNOWLEDGEMENTS:")
+        logging.info(f"  Confirmed on first check: {confirmed} "
+                     f"({', '.join(f'{s} {self.statuses[s]}' for s in CONFIRMED if self.statuses[s]) or 'none'})")
+        if unreadable:
+            logging.info(f"  Status unreadable (trusted): {unreadable}")
+        if queued:
+            logging.info(f"  Unconfirmed: {queued} -> {self.recovered} confirmed on re-check, {self.lost} lost")
@@ -0,0 +1,82 @@
+"""
+Session health watchdog for the send loop.
+
+When WhatsApp Web drops into "phone not connected", "reconnecting" or a stale
+tab, every following contact would burn the chat-load timeout and the search
+fallback before being marked failed. The watchdog samples the session state
+with the one-round-trip readiness probe and watches per-contact progress:
+
+- before a contact, when the last probe is older than `interval` seconds;
+- right after a chat or message-box wait timed out;
+- after `stall_after` consecutive contacts could not open a chat, which is
+  treated as a stale tab even while the probe still reports 'ready'.
+
+An unhealthy session raises SessionInterrupted; the send loop then pauses,
+recovers the session and re-queues the interrupted contact, along with the
+contacts whose chats failed to open while the session was going bad.
+"""
+
+import logging
+
+
+class SessionInterrupted(Exception):
+    """The session stopped being usable while a contact was in progress"""
+
+    def __init__(self, state):
+        super().__init__(f"session {state}")
+        self.state = state
+
+
+class SessionWatchdog:
+    """Cheap session health checks driven by the send loop"""
+
+    def __init__(self, probe, clock, enabled=True, interval=30.0, stall_after=3):
+        self.probe = probe  # driver -> 'loading' / 'qr' / 'ready' / 'phone_disconnected'
+        self.clock = clock
+        self.enabled = enabled
+        self.interval = interval
+        self.stall_after = stall_after
+        self.last_probe = None
+        self.failed_opens = 0
+        self.interruptions = 0
+        self.recoveries = 0
+
+    def check(self, driver, force=False):
+        """Raise SessionInterrupted unless the session is ready.
+
+        Unforced checks probe at most once per interval, so calling this
+        before every contact costs nothing on a healthy session.
+        """
+        if not self.enabled:
+            return
+        now = self.clock.now()
+        if not force and self.last_probe is not None and now - self.last_probe < self.interval:
+            return
+        self.last_probe = now
+        state = self.probe(driver)
+        if state != 'ready':
+            self.interruptions += 1
+            logging.warning(f"SESSION WATCHDOG: session is '{state}'")
+            raise SessionInterrupted(state)
+
+    def record_open(self, opened):
+        """Track chat-open outcomes; returns True when the session looks stalled"""
+        if opened or not self.enabled:
+            self.failed_opens = 0
+            return False
+        self.failed_opens += 1
+        if self.stall_after and self.failed_opens >= self.stall_after:
+            logging.warning(f"SESSION WATCHDOG: {self.failed_opens} chats in a row failed to open - assuming a stale tab")
+            self.failed_opens = 0
+            self.interruptions += 1
+            return True
+        return False
+
+    def recovered(self):
+        self.recoveries += 1
+        self.failed_opens = 0
+        self.last_probe = self.clock.now()
+
+    def log_summary(self):
+        if self.enabled and self.interruptions:
+            logging.info(f"SESSION WATCHDOG: {self.interruptions} interruption(s), {self.recoveries} recovered")
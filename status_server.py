@@ -0,0 +1,121 @@
+"""
+Optional local HTTP status endpoint for headless runs.
+
+    GET  /status    JSON counters, rate, ETA and phase latency percentiles
+    GET  /metrics   the same data in Prometheus text format
+    POST /pause     pause sending after the current contact
+    POST /resume    resume sending
+    POST /stop      stop after the current contact
+
+The server runs on daemon threads and only reads snapshots, so the send loop
+never waits on a scrape.
+"""
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+def render_prometheus(snapshot, phases, prefix='whatsapp_bulk'):
+    """Render a progress snapshot and phase summaries as Prometheus text"""
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for labels, value in samples:
+            label_text = '{' + ','.join(f'{k}="{_label(v)}"' for k, v in labels.items()) + '}' if labels else ''
+            lines.append(f"{prefix}_{name}{label_text} {value}")
+
+    metric('contacts_total', 'gauge', 'Contacts in the campaign', [({}, snapshot['total'])])
+    metric('contacts_processed_total', 'counter', 'Contacts handled so far', [({}, snapshot['processed'])])
+    metric('contacts_success_total', 'counter', 'Contacts messaged successfully', [({}, snapshot['success'])])
+    metric('contacts_skipped_duplicate_total', 'counter', 'Contacts skipped as already messaged',
+           [({}, snapshot['skipped_duplicates'])])
+    metric('contacts_suppressed_total', 'counter', 'Contacts skipped because they are on the suppression list',
+           [({}, snapshot['suppressed'])])
+    metric('contacts_failed_total', 'counter', 'Failed contacts by reason',
+           [({'reason': reason}, count) for reason, count in snapshot['failures_by_reason'].items()])
+    metric('rate_per_minute', 'gauge', 'EWMA contacts per minute', [({}, snapshot['rate_per_minute'])])
+    eta = snapshot['eta_seconds']
+    metric('eta_seconds', 'gauge', 'Estimated seconds to completion', [({}, eta if eta is not None else 'NaN')])
+    metric('paused', 'gauge', '1 while sending is paused', [({}, 1 if snapshot['state'] == 'paused' else 0)])
+    samples = []
+    for phase, s in phases.items():
+        for key, quantile in (('p50', '0.5'), ('p95', '0.95'), ('p99', '0.99')):
+            samples.append(({'phase': phase, 'quantile': quantile}, s[key]))
+    metric('phase_seconds', 'summary', 'Per-contact phase latency', samples)
+    for phase, s in phases.items():
+        lines.append(f'{prefix}_phase_seconds_count{{phase="{_label(phase)}"}} {s["count"]}')
+        lines.append(f'{prefix}_phase_seconds_sum{{phase="{_label(phase)}"}} {s["total"]}')
+    return "\n".join(lines) + "\n"
+
+
+class StatusServer:
+    """Serves progress and accepts pause/resume/stop on a background thread"""
+
+    def __init__(self, progress, phases_source, controls, host='127.0.0.1', port=8787):
+        self.progress = progress
+        self.phases_source = phases_source  # callable returning {phase: summary}
+        self.controls = controls  # {'pause': fn, 'resume': fn, 'stop': fn}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code, body, content_type='application/json'):
+                data = body.encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if path in ('/', '/status'):
+                    body = dict(server.progress.snapshot(), phases=server.phases_source())
+                    self._reply(200, json.dumps(body))
+                elif path == '/metrics':
+                    text = render_prometheus(server.progress.snapshot(), server.phases_source())
+                    self._reply(200, text, 'text/plain; version=0.0.4')
+                else:
+                    self._reply(404, json.dumps({'error': 'not found'}))
+
+            def do_POST(self):
+                action = urlparse(self.path).path.strip('/')
+                control = server.controls.get(action)
+                if control is None:
+                    self._reply(404, json.dumps({'error': f"unknown action '{action}'"}))
+                    return
+                control()
+                self._reply(200, json.dumps({'ok': True, 'action': action}))
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='status-server', daemon=True)
+        self._thread.start()
+        logging.info(f"Status endpoint listening on {self.url} (/status, /metrics, POST /pause /resume /stop)")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,186 @@
+"""
+Suppression (opt-out) list with a compact sorted index.
+
+Numbers are read from local text/CSV files (first column, one number per
+line), canonicalized like campaign numbers (preflight.canonical_number, so
+national numbers get DEFAULT_COUNTRY_CODE) and stored as one sorted uint64
+array: 8 bytes per number. The built index is cached next to the logs as a .npy file and
+memory-mapped on later runs, so millions of numbers load instantly and are
+paged in on demand.
+
+A campaign screens its whole contact list against the index in one
+vectorized pass (screen()), which leaves a small set of suppressed numbers
+for the per-contact check; single ad-hoc lookups use binary search.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from preflight import canonical_number
+
+SOURCE_EXTENSIONS = ('.txt', '.csv', '.tsv')
+MAX_DIGITS = 19  # Anything longer is not a phone number and would overflow uint64
+
+_NON_DIGITS = re.compile(r'\D')
+
+
+def normalize(number):
+    """Reduce a phone number to its digits ('' when there are none)"""
+    number = str(number)
+    return number if number.isdigit() else _NON_DIGITS.sub('', number)
+
+
+def expand_sources(paths):
+    """Resolve files and directories into a sorted list of source files"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(SOURCE_EXTENSIONS):
+                    files.append(os.path.join(path, name))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            logging.warning(f"Suppression source not found: {path}")
+    return files
+
+
+def opt_out_digits(raw, default_country_code=''):
+    """Canonical digits of an opt-out entry, matching the campaign's canonical numbers.
+
+    Entries pre-flight would reject are still suppressed by their bare digits,
+    so an oddly written opt-out is never dropped; '' when there are no digits.
+    """
+    digits, reason = canonical_number(raw, default_country_code)
+    return digits if digits and reason != 'malformed' else normalize(raw)
+
+
+def read_numbers(path, default_country_code=''):
+    """Return the suppressed numbers in the first column of a file as a uint64 array"""
+    sep = '\t' if path.lower().endswith('.tsv') else ','
+    try:
+        column = pd.read_csv(path, sep=sep, header=None, usecols=[0], dtype=str,
+                             skip_blank_lines=True, on_bad_lines='skip', encoding_errors='ignore')[0]
+    except pd.errors.EmptyDataError:
+        logging.warning(f"Suppression source is empty, skipping: {path}")
+        return np.empty(0, dtype=np.uint64)
+    # Header rows and blank cells have no digits and are dropped here
+    digits = [opt_out_digits(raw, default_country_code) for raw in column.dropna().tolist()]
+    return np.fromiter((int(d) for d in digits if d and len(d) <= MAX_DIGITS), dtype=np.uint64)
+
+
+class SuppressionIndex:
+    """Sorted uint64 array supporting `number in index` and bulk screening.
+
+    Lookups take canonical numbers (as produced by the pre-flight pass);
+    formatting is stripped but no country code is added.
+    """
+
+    def __init__(self, values, source_files=()):
+        self.values = values
+        self.source_files = list(source_files)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, number):
+        digits = normalize(number)
+        if not digits or len(digits) > MAX_DIGITS or not len(self.values):
+            return False
+        value = np.uint64(int(digits))
+        i = int(np.searchsorted(self.values, value))
+        return i < len(self.values) and self.values[i] == value
+
+    @property
+    def nbytes(self):
+        return int(self.values.nbytes)
+
+    def screen(self, numbers):
+        """Return the set of canonical numbers from `numbers` that are suppressed"""
+        if not len(self.values):
+            return set()
+        digits = {d for d in map(normalize, numbers) if d and len(d) <= MAX_DIGITS}
+        if not digits:
+            return set()
+        candidates = np.fromiter(map(int, digits), dtype=np.uint64, count=len(digits))
+        # Sorted needles walk the index in order, which keeps the binary search cache-friendly
+        candidates.sort()
+        pos = np.searchsorted(self.values, candidates)
+        pos[pos == len(self.values)] = 0
+        hits = candidates[np.asarray(self.values[pos]) == candidates]
+        return {str(v) for v in hits.tolist()}
+
+    @classmethod
+    def build(cls, files, default_country_code=''):
+        """Read every source file and build an in-memory index"""
+        parts = [read_numbers(path, default_country_code) for path in files]
+        values = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.uint64)
+        return cls(values.astype(np.uint64, copy=False), files)
+
+    def save(self, path):
+        np.save(path, self.values)
+
+    @classmethod
+    def open_mapped(cls, path, source_files=()):
+        return cls(np.load(path, mmap_mode='r'), source_files)
+
+
+def _cache_key(files, default_country_code=''):
+    digest = hashlib.sha1()
+    # National opt-outs are stored with the country code, so it is part of the key
+    digest.update(f"cc={default_country_code}\n".encode('utf-8'))
+    for path in files:
+        st = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def _remove_stale_caches(cache_dir, keep):
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.startswith('suppression_') and name.endswith('.npy') and path != keep:
+            os.remove(path)
+
+
+def load_suppression_index(paths, cache_dir=None, default_country_code=''):
+    """Load (or build and cache) the index for the given files/directories.
+
+    National numbers in the files get default_country_code. Returns None when
+    no source files exist.
+    """
+    files = expand_sources(paths)
+    if not files:
+        return None
+    started = time.perf_counter()
+    index = None
+    cache_path = None
+    origin = 'memory-mapped cache'
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_path = os.path.join(cache_dir, f"suppression_{_cache_key(files, default_country_code)}.npy")
+        if os.path.exists(cache_path):
+            try:
+                index = SuppressionIndex.open_mapped(cache_path, files)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable suppression cache {cache_path}: {str(e)}")
+    if index is None:
+        index = SuppressionIndex.build(files, default_country_code)
+        origin = f"{len(files)} source file(s)"
+        if cache_path:
+            try:
+                index.save(cache_path)
+                _remove_stale_caches(cache_dir, keep=cache_path)
+            except OSError as e:
+                logging.warning(f"Could not cache suppression index: {str(e)}")
+    elapsed = time.perf_counter() - started
+    logging.info(
+        f"Suppression list: {len(index)} numbers from {origin} in {elapsed:.2f}s "
+        f"(index {index.nbytes / 1024 / 1024:.1f} MiB, 8 bytes/number)"
+    )
+    return index
@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Anything importing whatsapp_bulk writes its logs here instead of the repo's logs/
+os.environ.setdefault('LOGS_DIR', tempfile.mkdtemp(prefix='wa_tests_'))
+
+
+@pytest.fixture
+def logs_dir(monkeypatch, tmp_path):
+    """Point whatsapp_bulk's ledger, reports, history and opt-out list at an empty temp dir"""
+    import whatsapp_bulk as wb
+    monkeypatch.setattr(wb, 'LOGS_DIR', str(tmp_path))
+    monkeypatch.setattr(wb, 'SENT_MESSAGES_LOG', str(tmp_path / 'sent_messages_20260101.log'))
+    monkeypatch.setattr(wb, 'PREFLIGHT_REPORT', str(tmp_path / 'preflight.json'))
+    monkeypatch.setattr(wb, 'CHECK_REPORT', str(tmp_path / 'check_report.csv'))
+    monkeypatch.setattr(wb, 'HISTORY_DB', str(tmp_path / 'history.sqlite'))
+    monkeypatch.setattr(wb, 'SUPPRESSION_SOURCES', [str(tmp_path / 'suppression')])
+    monkeypatch.setattr(wb, 'DEFAULT_COUNTRY_CODE', '91')
+    return tmp_path
+
+
+@pytest.fixture
+def simulated(logs_dir, monkeypatch):
+    """Run whatsapp_bulk against SimulatedBackend; returns start(**profile) -> backend.
+
+    The profile defaults to no jitter and no random failures.
+    """
+    import threading
+
+    import whatsapp_bulk as wb
+    from driver_backend import SimulationProfile
+    for name in ('CLOCK', 'TIMEOUTS', 'WATCHDOG', 'CURRENT_DRIVER', 'MANUAL_DATA'):
+        monkeypatch.setattr(wb, name, getattr(wb, name))
+    monkeypatch.setattr(wb, 'STOP_EVENT', threading.Event())
+    monkeypatch.setattr(wb, 'DRIVER_BACKEND', 'simulated')
+    monkeypatch.setattr(wb, 'ADAPTIVE_TIMEOUTS', False)
+    monkeypatch.setattr(wb, 'USE_CLIPBOARD', False)
+    monkeypatch.setattr(wb, 'CONTACT_TRACE_LOG', str(logs_dir / 'trace.jsonl'))
+    monkeypatch.setattr(wb, 'RESULTS_DIR', str(logs_dir))
+    monkeypatch.setattr(wb, 'TIMEOUT_SAMPLES_FILE', str(logs_dir / 'wait_latencies.json'))
+
+    def start(**profile):
+        profile = dict(dict(jitter=0, command_latency=0.0, invalid_rate=0, chat_failure_rate=0,
+                            send_failure_rate=0, search_failure_rate=0), **profile)
+        monkeypatch.setattr(wb, 'SIMULATION_PROFILE', SimulationProfile(**profile))
+        return wb.setup_driver()
+
+    return start
@@ -0,0 +1,59 @@
+from adaptive_timeouts import AdaptiveTimeout, TimeoutController
+
+
+def test_initial_value_until_enough_samples():
+    timeout = AdaptiveTimeout('chat_ready', initial=20, floor=3, ceiling=40, min_samples=5)
+    for _ in range(4):
+        timeout.observe(1.0)
+    assert timeout.value() == 20
+    timeout.observe(1.0)
+    assert timeout.value() == 3  # 1.0s x1.5 is below the floor
+
+
+def test_percentile_times_margin_within_bounds():
+    timeout = AdaptiveTimeout('chat_ready', initial=20, floor=1, ceiling=40, pct=99, margin=1.5, min_samples=10)
+    for i in range(100):
+        timeout.observe(2.0 + i / 100)
+    assert 4.4 < timeout.value() < 4.5
+    for _ in range(200):
+        timeout.observe(100.0)
+    assert timeout.value() == 40
+
+
+def test_timeouts_boost_and_successes_decay():
+    timeout = AdaptiveTimeout('compose_box', initial=2, floor=1, ceiling=8, min_samples=1)
+    timeout.observe(1.0)
+    assert timeout.value() == 1.5
+    timeout.timed_out()
+    timeout.timed_out()
+    assert timeout.boost == 4.0
+    assert timeout.value() == 6.0
+    # Each success takes the square root: 4 -> 2 -> 1.41 -> 1.19 -> 1.09 -> 1.04 -> 1
+    for _ in range(5):
+        timeout.observe(1.0)
+    assert 1.0 < timeout.boost < 1.05
+    timeout.observe(1.0)
+    assert timeout.boost == 1.0
+    assert timeout.timeouts == 2
+
+
+def test_disabled_controller_keeps_static_values():
+    bounds = {'chat_ready': (20, 3, 40)}
+    controller = TimeoutController(bounds, enabled=False, min_samples=1)
+    controller.observe('chat_ready', 1.0)
+    assert controller.timeout('chat_ready') == 20
+    assert TimeoutController(bounds, min_samples=1).timeout('chat_ready') == 20
+
+
+def test_samples_persist_between_runs(tmp_path):
+    bounds = {'chat_ready': (20, 3, 40), 'search_box': (10, 2, 20)}
+    path = str(tmp_path / 'wait_latencies.json')
+    first = TimeoutController(bounds, min_samples=3)
+    for seconds in (4.0, 4.0, 4.0):
+        first.observe('chat_ready', seconds)
+    first.save(path)
+    second = TimeoutController(bounds, min_samples=3)
+    second.load(path)
+    assert second.timeout('chat_ready') == 6.0
+    assert second.timeout('search_box') == 10
+    TimeoutController(bounds).load(str(tmp_path / 'missing.json'))
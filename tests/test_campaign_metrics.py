@@ -0,0 +1,47 @@
+import random
+
+from campaign_metrics import BUCKETS_PER_DOUBLING, CampaignTimer, PhaseHistogram, percentile
+
+
+def test_histogram_percentiles_stay_within_a_bucket_of_the_exact_values():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(0, 1.5) for _ in range(20000)]
+    histogram = PhaseHistogram()
+    for value in values:
+        histogram.add(value)
+    summary = histogram.summary()
+    ordered = sorted(values)
+    for pct in (50, 95, 99):
+        exact = percentile(ordered, pct)
+        assert abs(summary[f'p{pct}'] - exact) / exact < 0.05
+    assert summary['count'] == len(values)
+    assert summary['max'] == ordered[-1]
+    assert abs(summary['total'] - sum(values)) < 1e-6
+
+
+def test_histogram_memory_does_not_grow_with_samples():
+    histogram = PhaseHistogram()
+    for i in range(100000):
+        histogram.add(0.5 + (i % 1000) / 1000.0)
+    assert len(histogram.counts) <= 2 * BUCKETS_PER_DOUBLING  # 0.5s..1.5s spans under two doublings
+    assert histogram.summary()['p99'] <= histogram.max
+
+
+def test_empty_and_zero_duration_phases():
+    assert PhaseHistogram().summary() == {'count': 0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0, 'total': 0.0}
+    histogram = PhaseHistogram()
+    histogram.add(0.0)
+    assert histogram.summary()['p50'] == 0.0
+
+
+def test_timer_summary_covers_only_phases_that_ran():
+    now = [0.0]
+    timer = CampaignTimer(clock=lambda: now[0])
+    timer.begin_contact('919876543210')
+    with timer.span('open_chat'):
+        now[0] += 1.5
+    timer.record('send_submit', 0.2)
+    summary = timer.summary()
+    assert sorted(summary) == ['open_chat', 'send_submit']
+    assert abs(summary['open_chat']['p50'] - 1.5) / 1.5 < 0.03
+    assert timer.current.phases == {'open_chat': 1.5, 'send_submit': 0.2}
@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from campaign_metrics import ContactTrace
+from campaign_results import BASE_COLUMNS, ResultsWriter
+
+PHASES = ('open_chat', 'send_submit')
+
+
+def trace(number, status='sent', reason='', phases=None):
+    row = ContactTrace(number, started=0.0)
+    row.status = status
+    row.reason = reason
+    row.attempts = 1
+    row.phases = phases or {'open_chat': 1.25}
+    return row
+
+
+def append_rows(writer, count):
+    for i in range(count):
+        writer.append(trace(f"9198765432{i:02d}", phases={'open_chat': 1.25, 'send_submit': 0.1 * i}),
+                      '2026-01-01T10:00:00.000', 2.5)
+
+
+def test_rows_are_appended_every_batch(tmp_path):
+    path = tmp_path / 'results.csv'
+    writer = ResultsWriter(csv_path=str(path), phases=PHASES, batch_size=3)
+    append_rows(writer, 4)
+    assert writer.written == 3 and len(writer.rows) == 1
+    assert len(pd.read_csv(path)) == 3  # a crash now keeps the first batch
+    writer.close()
+    assert writer.written == 4
+    assert pd.read_csv(path, dtype={'number': str})['number'].tolist()[-1] == '919876543203'
+
+
+def test_csv_columns_and_values(tmp_path):
+    path = tmp_path / 'results.csv'
+    writer = ResultsWriter(csv_path=str(path), phases=PHASES, batch_size=10)
+    append_rows(writer, 2)
+    writer.append(trace('919876543299', 'failed', 'Could not open chat'), '2026-01-01T10:00:05.000', 30.0)
+    writer.close()
+    table = pd.read_csv(path, dtype={'number': str}, keep_default_na=False)
+    assert list(table.columns) == list(BASE_COLUMNS) + ['open_chat_s', 'send_submit_s']
+    assert table['seq'].tolist() == [1, 2, 3]
+    assert table.loc[2, ['status', 'reason']].tolist() == ['failed', 'Could not open chat']
+    assert table.loc[2, 'send_submit_s'] == 0.0  # phases that did not run are 0
+    assert table.loc[1, 'send_submit_s'] == pytest.approx(0.1)
+
+
+def test_reopened_csv_keeps_a_single_header(tmp_path):
+    path = tmp_path / 'results.csv'
+    for _ in range(2):
+        writer = ResultsWriter(csv_path=str(path), phases=PHASES, batch_size=10)
+        append_rows(writer, 2)
+        writer.close()
+    assert len(pd.read_csv(path)) == 4
+
+
+def test_parquet_schema(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = tmp_path / 'results.parquet'
+    writer = ResultsWriter(parquet_path=str(path), phases=PHASES, batch_size=2)
+    append_rows(writer, 3)
+    writer.close()
+    parquet = pq.ParquetFile(str(path))
+    assert parquet.metadata.num_row_groups == 2  # one per batch
+    schema = parquet.schema_arrow
+    assert schema.names == list(BASE_COLUMNS) + ['open_chat_s', 'send_submit_s']
+    assert str(schema.field('seq').type) == 'int64'
+    assert str(schema.field('attempts').type) == 'int32'
+    assert str(schema.field('started_at').type) == 'timestamp[ms]'
+    assert str(schema.field('open_chat_s').type) == 'double'
+    table = pd.read_parquet(path)
+    assert table['number'].tolist() == ['919876543200', '919876543201', '919876543202']
+    assert table['finished_at'].iloc[0] == pd.Timestamp('2026-01-01 10:00:00')
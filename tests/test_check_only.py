@@ -0,0 +1,27 @@
+import pandas as pd
+
+import whatsapp_bulk as wb
+
+
+def test_report_has_a_row_per_input_number_in_order(logs_dir):
+    (logs_dir / 'suppression').mkdir()
+    (logs_dir / 'suppression' / 'optout.txt').write_text('919876543212\n', encoding='utf-8')
+    (logs_dir / 'sent_messages_20260101.log').write_text(
+        '2026-01-01 10:00:00|919876543211|Ravi|Hello\n', encoding='utf-8')
+    numbers = ['98765 43210', '12', '919876543211', '+91 98765 43210', None, '919876543212']
+    report = wb.classify_contacts(numbers)
+    assert list(report.columns) == ['number', 'status', 'reason', 'last_sent', 'chat']
+    assert report['status'].tolist() == ['NOT_SENT', 'INVALID', 'SENT_BEFORE', 'DUPLICATE', 'INVALID', 'SUPPRESSED']
+    assert report['reason'].tolist() == ['', 'too short', '', 'duplicate in list', 'missing', '']
+    assert report['number'].tolist()[:4] == ['919876543210', '12', '919876543211', '+91 98765 43210']
+    assert report.loc[2, 'last_sent'].startswith('2026-01-01')
+    written = pd.read_csv(wb.CHECK_REPORT, dtype=str, keep_default_na=False)
+    assert written['status'].tolist() == report['status'].tolist()
+
+
+def test_only_sent_and_unsent_rows_are_opened(logs_dir, monkeypatch):
+    opened = []
+    monkeypatch.setattr(wb, 'setup_driver', lambda: opened.append('driver'))
+    report = wb.open_chats_check_only(['12', '12'], verify='INVALID,DUPLICATE,SUPPRESSED')
+    assert report['status'].tolist() == ['INVALID', 'INVALID']
+    assert opened == []
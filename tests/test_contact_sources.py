@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from contact_sources import load_contacts, supported_extensions
+from preflight import run_preflight
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def contacts(store):
+    return [(c.number, c.name, c.message) for c in store]
+
+
+def write_jsonl(path, records):
+    path.write_text(''.join(json.dumps(r) + '\n' for r in records), encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('ext, sep', [('.csv', ','), ('.tsv', '\t')])
+def test_delimited_reads_only_contact_columns(tmp_path, ext, sep):
+    path = tmp_path / f'contacts{ext}'
+    rows = [['id', ' number ', 'NAME', 'IntroMessage', 'notes'],
+            ['1', '+91 98765 43210', 'Asha', 'Hello', 'x'],
+            ['2', '00447700900123', '', 'Hi', 'y']]
+    path.write_text(''.join(sep.join(r) + '\n' for r in rows), encoding='utf-8')
+    store = load_contacts(str(path))
+    assert contacts(store) == [('+91 98765 43210', 'Asha', 'Hello'), ('00447700900123', '', 'Hi')]
+
+
+@pytest.mark.skipif(pyarrow is None, reason='needs pyarrow')
+def test_parquet_projects_contact_columns(tmp_path):
+    import pyarrow.parquet as pq
+    path = str(tmp_path / 'contacts.parquet')
+    pq.write_table(pyarrow.table({'Number': ['919876543210'], 'Name': ['Asha'], 'other': [1]}), path)
+    assert contacts(load_contacts(path)) == [('919876543210', 'Asha', '')]
+
+
+def test_jsonl_text_fields(tmp_path):
+    path = write_jsonl(tmp_path / 'c.jsonl', [
+        {'Number': '919876543210', 'Name': 'Asha', 'IntroMessage': 'Hello', 'city': 'Pune'},
+        {'Number': '919876543211', 'Name': 'Ravi', 'IntroMessage': 'Hello'},
+    ])
+    store = load_contacts(path)
+    assert contacts(store) == [('919876543210', 'Asha', 'Hello'), ('919876543211', 'Ravi', 'Hello')]
+    assert store.messages == ['Hello']
+
+
+def test_jsonl_numeric_numbers_are_streamed(tmp_path):
+    path = write_jsonl(tmp_path / 'c.jsonl', [{'Number': 919876543210, 'Name': 'Asha'}, {'Number': '919876543211'}])
+    assert contacts(load_contacts(path)) == [('919876543210', 'Asha', ''), ('919876543211', '', '')]
+
+
+def test_jsonl_matches_field_names_per_record(tmp_path):
+    path = write_jsonl(tmp_path / 'c.ndjson', [
+        {'number': '919876543210'},
+        {'Number': '919876543211', 'name': 'Ravi'},
+        {'NUMBER': '919876543212', 'Name': 'Mira'},
+    ])
+    assert contacts(load_contacts(path)) == [('919876543210', '', ''), ('919876543211', 'Ravi', ''),
+                                             ('919876543212', 'Mira', '')]
+
+
+def test_jsonl_record_without_number_is_reported_missing(tmp_path):
+    path = write_jsonl(tmp_path / 'c.jsonl', [{'Number': '919876543210'}, {'Name': 'No number'}])
+    store = load_contacts(path)
+    assert store[1].number == ''
+    sendable, report = run_preflight(store)
+    assert len(sendable) == 1
+    assert report['rejected_by_reason'] == {'missing': 1}
+
+
+def test_excel(tmp_path):
+    pytest.importorskip('openpyxl')
+    import pandas as pd
+    path = str(tmp_path / 'contacts.xlsx')
+    pd.DataFrame({'Number': ['919876543210'], 'Name': ['Asha'], 'x': [1]}).to_excel(path, index=False)
+    assert contacts(load_contacts(path)) == [('919876543210', 'Asha', '')]
+
+
+def test_unsupported_type_and_missing_number_column(tmp_path):
+    assert '.csv' in supported_extensions()
+    with pytest.raises(ValueError, match='unsupported'):
+        load_contacts(str(tmp_path / 'contacts.xml'))
+    path = tmp_path / 'contacts.csv'
+    path.write_text('Name,IntroMessage\nAsha,Hello\n', encoding='utf-8')
+    with pytest.raises(ValueError, match='Number'):
+        load_contacts(str(path))
@@ -0,0 +1,59 @@
+from array import array
+
+import pandas as pd
+
+from contact_store import ContactStore
+
+
+def rows(store):
+    return [(c.index, c.number, c.name, c.message) for c in store]
+
+
+def test_from_frame_interns_messages_and_cleans_cells():
+    frame = pd.DataFrame({
+        'Number': [' 919876543210 ', 919876543211.0, None],
+        'Name': ['Asha', float('nan'), 'nan'],
+        'IntroMessage': ['Hello ', 'Hello', 'Hi'],
+    })
+    store = ContactStore.from_frame(frame)
+    assert len(store) == 3
+    assert store.messages == ['Hello', 'Hi']
+    assert list(store.message_ids) == [0, 0, 1]
+    assert rows(store) == [(0, '919876543210', 'Asha', 'Hello'),
+                           (1, '919876543211.0', '', 'Hello'),
+                           (2, '', '', 'Hi')]
+
+
+def test_stores_without_names_or_per_contact_messages():
+    store = ContactStore.from_columns(['1', '2'], names=['', None], messages='  Hello  ')
+    assert store.names is None
+    assert store.messages == ['Hello']
+    assert [c.name for c in store] == ['', '']
+    assert store[1].message == 'Hello'
+
+
+def test_take_keeps_rows_in_order_and_replaces_numbers():
+    store = ContactStore.from_columns(['a', 'b', 'c'], names=['A', 'B', 'C'], messages=['x', 'y', 'x'])
+    taken = store.take([2, 0])
+    assert rows(taken) == [(0, 'c', 'C', 'x'), (1, 'a', 'A', 'x')]
+    replaced = store.take([1], numbers=['919876543210'])
+    assert rows(replaced) == [(0, '919876543210', 'B', 'y')]
+    assert replaced.messages is store.messages
+
+
+def test_with_message_sends_one_text_to_everybody():
+    store = ContactStore.from_columns(['1', '2'], names=['A', 'B'], messages=['x', 'y'])
+    same = store.with_message(' Hello ')
+    assert [(c.number, c.name, c.message) for c in same] == [('1', 'A', 'Hello'), ('2', 'B', 'Hello')]
+    assert len(same.messages) == 1
+
+
+def test_uint64_numbers_round_trip():
+    # Canonical numbers as the pre-flight pass stores them, up to the uint64 limit
+    numbers = [919876543210, 447700900123, 18446744073709551615]
+    store = ContactStore(array('Q', numbers), names=['A', 'B', 'C'])
+    assert store.number_list() == ['919876543210', '447700900123', '18446744073709551615']
+    assert [c.number for c in store] == store.number_list()
+    assert store.take([2]).numbers.typecode == 'Q'
+    assert int(store[2].number) == numbers[2]
+    assert store.nbytes() < ContactStore.from_columns(store.number_list(), names=['A', 'B', 'C']).nbytes()
@@ -0,0 +1,95 @@
+import gzip
+import json
+import os
+import time
+
+from history import HistoryIndex, list_logs, open_log, rotate_logs
+
+
+def write_ledger(logs_dir, name, lines, mode='w'):
+    path = os.path.join(logs_dir, name)
+    with open(path, mode, encoding='utf-8') as f:
+        f.write(''.join(line + '\n' for line in lines))
+    return path
+
+
+def age(path, days):
+    old = time.time() - days * 86400
+    os.utime(path, (old, old))
+
+
+def test_sync_is_incremental_and_canonical(tmp_path):
+    logs = str(tmp_path)
+    path = write_ledger(logs, 'sent_messages_20250101.log', [
+        '2025-01-01 10:00:00|+91 98765 43210|Asha|Hello',
+        '2025-01-01 10:05:00|919876543211|Ravi|Hello',
+    ])
+    index = HistoryIndex(os.path.join(logs, 'history.sqlite'))
+    assert index.sync(logs) == 2
+    assert index.sync(logs) == 0
+    # A partially written line waits for the next sync
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('2025-01-02 09:00:00|919876543210|Asha|Again\n2025-01-02 09:01')
+    assert index.sync(logs) == 1
+    assert index.last_sent('+91 98765-43210') == '2025-01-02 09:00:00'
+    assert index.last_sent_many(['919876543211', '919876543299']) == {'919876543211': '2025-01-01 10:05:00'}
+    assert len(index.between('2025-01-01', '2025-01-01')) == 2
+    index.close()
+
+
+def test_national_numbers_use_the_country_code(tmp_path):
+    logs = str(tmp_path)
+    write_ledger(logs, 'sent_messages_20250101.log', ['2025-01-01 10:00:00|098765 43210|Asha|Hello'])
+    index = HistoryIndex(os.path.join(logs, 'history.sqlite'), default_country_code='91')
+    index.sync(logs)
+    assert index.last_sent('919876543210') == '2025-01-01 10:00:00'
+    index.close()
+
+
+def test_rotate_gzips_old_logs_without_double_counting(tmp_path):
+    logs = str(tmp_path)
+    old = write_ledger(logs, 'sent_messages_20250101.log', ['2025-01-01 10:00:00|919876543210|Asha|Hello'])
+    new = write_ledger(logs, 'sent_messages_20250301.log', ['2025-03-01 10:00:00|919876543211|Ravi|Hello'])
+    trace = write_ledger(logs, 'contact_trace_20250101_100000.jsonl', [json.dumps({'status': 'sent', 'total_s': 4.0})])
+    age(old, 30)
+    age(trace, 30)
+    index = HistoryIndex(os.path.join(logs, 'history.sqlite'))
+    rotated = rotate_logs(logs, keep_days=14, index=index)
+    assert sorted(rotated) == ['contact_trace_20250101_100000.jsonl', 'sent_messages_20250101.log']
+    assert not os.path.exists(old) and os.path.exists(old + '.gz')
+    assert os.path.exists(new)
+    assert index.sync(logs) == 0
+    assert index.stats()['sends'] == 2
+    assert index.lookup('919876543210')[0]['source'] == 'sent_messages_20250101.log.gz'
+    index.close()
+
+    # A fresh index ingests the rotated ledger too
+    fresh = HistoryIndex(os.path.join(logs, 'fresh.sqlite'))
+    assert fresh.sync(logs) == 2
+    fresh.close()
+
+
+def test_list_logs_and_open_log_include_rotated_files(tmp_path):
+    logs = str(tmp_path)
+    write_ledger(logs, 'contact_trace_20250102_100000.jsonl', ['{"status": "sent"}'])
+    with gzip.open(os.path.join(logs, 'contact_trace_20250101_100000.jsonl.gz'), 'wt', encoding='utf-8') as f:
+        f.write('{"status": "failed"}\n')
+    write_ledger(logs, 'whatsapp_sender_20250101_100000.log', ['x'])
+    names = list_logs(logs, 'contact_trace_', '.jsonl')
+    assert names == ['contact_trace_20250101_100000.jsonl.gz', 'contact_trace_20250102_100000.jsonl']
+    with open_log(os.path.join(logs, names[0])) as f:
+        assert json.loads(f.readline()) == {'status': 'failed'}
+
+
+def test_planner_reads_rotated_traces_and_sender_logs(tmp_path, monkeypatch):
+    import whatsapp_bulk as wb
+
+    logs = str(tmp_path)
+    with gzip.open(os.path.join(logs, 'contact_trace_20250101_100000.jsonl.gz'), 'wt', encoding='utf-8') as f:
+        f.write(json.dumps({'status': 'sent', 'total_s': 9.0, 'phases': {'pacing_wait': 3.0}}) + '\n')
+        f.write(json.dumps({'status': 'skipped_duplicate', 'total_s': 0.1}) + '\n')
+    with gzip.open(os.path.join(logs, 'whatsapp_sender_20250101_100000.log.gz'), 'wt', encoding='utf-8') as f:
+        f.write('2025-01-01 10:00:00,000 - INFO - STARTUP METRIC: time_to_ready=12.50s\n')
+    monkeypatch.setattr(wb, 'LOGS_DIR', logs)
+    assert wb.load_contact_history() == [6.0]
+    assert wb.load_startup_history() == 12.5
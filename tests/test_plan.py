@@ -0,0 +1,62 @@
+import gzip
+import json
+
+import pytest
+
+import whatsapp_bulk as wb
+
+NUMBERS = [
+    '98765 43210',       # sendable
+    '+91 98765 43210',   # repeated in the list
+    '12',                # invalid
+    '919876543211',      # already in the ledger
+    '919876543212',      # opted out
+    '919876543213',      # sendable
+    '919876543214',      # sendable
+]
+
+
+@pytest.fixture
+def plan(logs_dir, monkeypatch):
+    """Plan a campaign over NUMBERS with one ledger entry and one opt-out; returns plan(limit)"""
+    (logs_dir / 'suppression').mkdir()
+    (logs_dir / 'suppression' / 'optout.txt').write_text('098765 43212\n', encoding='utf-8')
+    (logs_dir / 'sent_messages_20260101.log').write_text(
+        '2026-01-01 10:00:00|919876543211|Ravi|Hello\n', encoding='utf-8')
+    monkeypatch.setattr(wb, 'MANUAL_DATA', None)
+    monkeypatch.setattr(wb, 'FAST_MODE', True)
+    monkeypatch.setattr(wb, 'NO_DELAY', True)
+    wb.set_manual_data(NUMBERS, "Hello")
+
+    def run(limit=999999):
+        monkeypatch.setattr(wb, 'CONTACT_LIMIT', limit)
+        return wb.plan_campaign()
+
+    return run
+
+
+def test_send_count_after_ledger_and_suppression(plan):
+    result = plan()
+    assert (result['rows'], result['suppressed'], result['sends']) == (7, 1, 3)
+    # No history: the default per-contact and startup estimates, no pacing
+    expected = wb.PLAN_DEFAULT_STARTUP_SECONDS + 3 * wb.PLAN_DEFAULT_CONTACT_SECONDS
+    assert result['expected_seconds'] == pytest.approx(expected)
+
+
+def test_contact_limit_applies_after_suppression(plan):
+    assert plan(limit=2)['sends'] == 2
+    assert plan(limit=3)['sends'] == 3
+    assert plan(limit=5)['sends'] == 3
+
+
+def test_estimates_come_from_past_traces_and_logs(plan, logs_dir):
+    rows = [{'status': 'sent', 'total_s': 7.0, 'phases': {'pacing_wait': 3.0}},
+            {'status': 'failed', 'total_s': 6.0, 'phases': {}},
+            {'status': 'skipped_duplicate', 'total_s': 0.1, 'phases': {}}]
+    with gzip.open(logs_dir / 'contact_trace_20260101_100000.jsonl.gz', 'wt', encoding='utf-8') as f:
+        f.write(''.join(json.dumps(row) + '\n' for row in rows))
+    (logs_dir / 'whatsapp_sender_20260101.log').write_text(
+        '2026-01-01 10:00:00 - INFO - STARTUP METRIC: time_to_ready=12.5s\n', encoding='utf-8')
+    result = plan()
+    # Browser time excludes pacing: (4 + 6) / 2 per contact
+    assert result['expected_seconds'] == pytest.approx(12.5 + 3 * 5.0)
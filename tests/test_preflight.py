@@ -0,0 +1,44 @@
+import pytest
+
+from contact_store import ContactStore
+from preflight import canonical_number, run_preflight
+
+
+@pytest.mark.parametrize('raw, cc, expected', [
+    ('919876543210', '', ('919876543210', '')),
+    ('+91 98765-43210', '', ('919876543210', '')),
+    ('0091 98765 43210', '', ('919876543210', '')),
+    ('919876543210.0', '', ('919876543210', '')),
+    ('9.1987654321E+11', '', ('919876543210', '')),
+    (919876543210.0, '', ('919876543210', '')),
+    ('098765 43210', '91', ('919876543210', '')),
+    ('98765 43210', '91', ('919876543210', '')),
+    ('+44 7700 900123', '91', ('447700900123', '')),
+    ('919876543210', '91', ('919876543210', '')),
+])
+def test_canonical_numbers(raw, cc, expected):
+    assert canonical_number(raw, cc) == expected
+
+
+@pytest.mark.parametrize('raw, reason', [
+    (None, 'missing'),
+    (float('nan'), 'missing'),
+    ('', 'missing'),
+    ('nan', 'missing'),
+    ('98765abc10', 'malformed'),
+    ('12345', 'too short'),
+    ('1234567890123456', 'too long'),
+    ('098765 43210', 'no country code'),
+])
+def test_rejections(raw, reason):
+    assert canonical_number(raw)[1] == reason
+
+
+def test_run_preflight_collapses_formats_of_one_number():
+    store = ContactStore.from_columns(['+91 98765 43210', '919876543210', None, 'abc', '447700900123'],
+                                      ['A', 'B', 'C', 'D', 'E'], 'Hi')
+    sendable, report = run_preflight(store)
+    assert [(c.number, c.name) for c in sendable] == [('919876543210', 'A'), ('447700900123', 'E')]
+    assert report['rejected_by_reason'] == {'duplicate in list': 1, 'missing': 1, 'malformed': 1}
+    duplicate = next(r for r in report['rejected_rows'] if r['reason'] == 'duplicate in list')
+    assert duplicate['duplicate_of_row'] == 1 and duplicate['canonical'] == '919876543210'
@@ -0,0 +1,74 @@
+import logging
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from benchmarks.dom_fixture import EXPECTED_SITES, STATES, build_whatsapp_dom
+from selector_packs import DEFAULT_PACK, PACKS, PROBE_SITES, WAIT_SITES, resolve_pack
+
+html = pytest.importorskip('lxml.html')
+pytest.importorskip('cssselect')
+
+
+@pytest.fixture(scope='module')
+def pages():
+    return {state: html.fromstring(build_whatsapp_dom(state, chats=30, messages=12)) for state in STATES}
+
+
+@pytest.mark.parametrize('name', sorted(PACKS))
+def test_css_and_xpath_find_the_same_elements(pages, name):
+    pack = PACKS[name]
+    for state, page in pages.items():
+        for site in WAIT_SITES:
+            by_css = page.cssselect(pack.css(site))
+            assert by_css == page.xpath(pack.xpath(site)), f"{name} {state} {site}"
+            assert bool(by_css) == (state in EXPECTED_SITES[site]), f"{name} {state} {site}"
+        both = page.cssselect(pack.css('compose_box', 'invalid_popup'))
+        assert both == page.xpath(pack.xpath('compose_box', 'invalid_popup'))
+
+
+@pytest.mark.parametrize('name', sorted(PACKS))
+def test_probe_sites_match_only_in_their_states(pages, name):
+    pack = PACKS[name]
+    for state, page in pages.items():
+        for site in PROBE_SITES:
+            assert pack.xpath(site) is None
+            assert bool(page.cssselect(pack.css(site))) == (state in EXPECTED_SITES[site]), f"{name} {state} {site}"
+
+
+@pytest.mark.parametrize('name', sorted(PACKS))
+def test_send_ack_sites_find_the_newest_outgoing_bubble(pages, name):
+    pack = PACKS[name]
+    pane = pages['chat_open'].cssselect(pack.css('chat_pane'))[0]
+    bubbles = pane.cssselect(pack.css('message_out'))
+    # Outgoing messages are every third row of the fixture's history: 0, 3, 6 and 9
+    assert len({bubble.text_content() for bubble in bubbles}) == 4
+    icon = bubbles[-1].cssselect(pack.css('message_status'))[0]
+    assert icon.get('data-icon') == 'msg-dblcheck'
+    assert pane.cssselect('footer')[0] not in bubbles
+
+
+def test_compose_box_is_the_chat_input_not_the_search_box(pages):
+    page = pages['chat_open']
+    for pack in PACKS.values():
+        box = page.cssselect(pack.css('compose_box'))[0]
+        assert box.get('data-tab') == '10'
+        assert page.cssselect(pack.css('search_box'))[0].get('data-tab') == '3'
+
+
+def test_locator_prefers_the_requested_syntax():
+    pack = PACKS['combined']
+    assert pack.locator('compose_box') == (By.CSS_SELECTOR, pack.css('compose_box'))
+    assert pack.locator('compose_box', syntax='xpath') == (By.XPATH, pack.xpath('compose_box'))
+    # Probe-only sites have no XPath form, so they stay CSS
+    assert pack.locator('app_ready', syntax='xpath') == (By.CSS_SELECTOR, pack.css('app_ready'))
+    assert pack.xpath('compose_box', 'app_ready') is None
+
+
+def test_resolve_pack_falls_back_to_the_default(caplog):
+    assert resolve_pack(' TestID ') is PACKS['testid']
+    assert resolve_pack('') is PACKS[DEFAULT_PACK]
+    assert resolve_pack(None) is PACKS[DEFAULT_PACK]
+    with caplog.at_level(logging.WARNING):
+        assert resolve_pack('nightly') is PACKS[DEFAULT_PACK]
+    assert "Unknown selector pack 'nightly'" in caplog.text
@@ -0,0 +1,120 @@
+import pytest
+from selenium.webdriver.common.keys import Keys
+
+import whatsapp_bulk as wb
+from campaign_metrics import CampaignTimer
+from driver_backend import SimulatedBackend, SimulationProfile
+from send_ack import AckTracker
+
+URL = 'https://web.whatsapp.com/send?phone=919876543210'
+
+
+def send_in_simulation(**profile):
+    profile = dict(dict(jitter=0, command_latency=0.0, invalid_rate=0, chat_failure_rate=0, send_failure_rate=0),
+                   **profile)
+    backend = SimulatedBackend(SimulationProfile(**profile))
+    backend.get(URL)
+    box = backend.wait_for('compose_box', None, 10, clickable=True)
+    box.send_keys('Hello')
+    box.send_keys(Keys.ENTER)
+    return backend
+
+
+def test_settle_confirms_trusts_unreadable_and_queues_the_rest():
+    acks = AckTracker()
+    for number, status in [('1', 'sent'), ('2', 'read'), ('3', 'unknown'), ('4', 'pending'), ('5', 'failed')]:
+        acks.submit(number, 'Name', 'Hello')
+        pending = acks.take()
+        assert pending.number == number
+        assert acks.settle(pending, status) == (status in ('sent', 'read', 'unknown'))
+    assert [p.number for p in acks.drain()] == ['4', '5']
+    assert acks.drain() == []
+    assert acks.statuses['pending'] == 1 and acks.statuses['sent'] == 1
+
+
+def test_take_clears_the_pending_send():
+    acks = AckTracker()
+    assert acks.take() is None
+    acks.submit('919876543210', 'Asha', 'Hello')
+    assert acks.take().status == 'pending'
+    assert acks.take() is None
+
+
+def test_probe_waits_for_the_tick_in_simulation():
+    backend = send_in_simulation(ack_latency=0.5)
+    started = backend.clock.now()
+    assert wb.probe_send_ack(backend, timeout=5) == 'sent'
+    assert 0.4 < backend.clock.now() - started < 0.6
+
+
+def test_lost_message_stays_pending_then_fails_after_reload():
+    backend = send_in_simulation(ack_failure_rate=1.0)
+    acks = AckTracker()
+    acks.submit('919876543210', 'Asha', 'Hello')
+    pending = acks.take()
+    assert not acks.settle(pending, wb.probe_send_ack(backend, timeout=1))
+    backend.get(URL)
+    backend.clock.sleep(5)
+    assert wb.probe_send_ack(backend, timeout=1) == 'failed'
+    assert backend.lost == 1 and sum(backend.delivered.values()) == 0
+
+
+@pytest.fixture
+def campaign(simulated):
+    """Simulated backend as run_campaign sets it up; returns start(**profile) -> (backend, timer, outcomes)"""
+    def start(**profile):
+        backend = simulated(**profile)
+        outcomes = []
+        timer = CampaignTimer(clock=backend.clock.now, on_outcome=lambda status, reason, phases:
+                              outcomes.append((status, reason)))
+        return backend, timer, outcomes
+
+    return start
+
+
+def queue_first_send(backend, timer, acks):
+    timer.begin_contact('919876543210')
+    assert wb.search_and_open_chat(backend, '919876543210')
+    assert wb.send_message(backend, 'Hello')
+    acks.submit('919876543210', 'Asha', 'Hello')
+    assert not wb.settle_pending_send(backend, timer, acks, set())
+
+
+def test_reopened_chat_waits_for_its_history_before_checking(campaign):
+    backend, timer, outcomes = campaign(ack_latency=12, history_latency=3)
+    acks = AckTracker()
+    queue_first_send(backend, timer, acks)
+    assert wb.verify_unconfirmed_sends(backend, timer, acks, set()) == []
+    assert outcomes == [('sent', '')]
+    assert backend.delivered['919876543210'] == 1 and acks.recovered == 1
+
+
+def test_unrendered_bubble_is_unconfirmed_not_sent_again(campaign):
+    backend, timer, outcomes = campaign(ack_latency=12, history_latency=60)
+    acks = AckTracker()
+    queue_first_send(backend, timer, acks)
+    lost = wb.verify_unconfirmed_sends(backend, timer, acks, set())
+    assert lost == [{'number': '919876543210', 'reason': 'Unconfirmed send (none)'}]
+    assert outcomes == [('failed', 'Unconfirmed send (none)')]
+    assert backend.delivered['919876543210'] == 1
+
+
+def test_failed_bubble_is_sent_again(campaign):
+    backend, timer, outcomes = campaign(ack_failure_rate=1.0)
+    acks = AckTracker()
+    queue_first_send(backend, timer, acks)
+    lost = wb.verify_unconfirmed_sends(backend, timer, acks, set())
+    assert backend.lost == 2  # the re-send was attempted, and was lost too
+    assert [entry['reason'] for entry in lost] == ['Unconfirmed send (pending)']
+
+
+def test_stop_leaves_the_queue_unverified(campaign):
+    backend, timer, outcomes = campaign(ack_failure_rate=1.0)
+    acks = AckTracker()
+    queue_first_send(backend, timer, acks)
+    wb.STOP_EVENT.set()
+    navigations = backend.navigations
+    lost = wb.verify_unconfirmed_sends(backend, timer, acks, set())
+    assert backend.navigations == navigations and backend.lost == 1
+    assert outcomes == [('failed', 'Unconfirmed send (stopped)')]
+    assert len(lost) == 1
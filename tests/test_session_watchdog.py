@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+import whatsapp_bulk as wb
+from driver_backend import SimulatedBackend, SimulationProfile
+from session_watchdog import SessionInterrupted, SessionWatchdog
+
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(SimulationProfile(jitter=0, load_latency=3.0, command_latency=0.0))
+    backend.get('https://web.whatsapp.com')
+    return backend
+
+
+def watchdog_for(backend, **kwargs):
+    return SessionWatchdog(wb.probe_session_state, backend.clock, **kwargs)
+
+
+def test_check_raises_until_the_app_is_ready(backend):
+    watchdog = watchdog_for(backend)
+    with pytest.raises(SessionInterrupted) as interrupted:
+        watchdog.check(backend, force=True)
+    assert interrupted.value.state == 'loading'
+    backend.clock.sleep(5)
+    watchdog.check(backend, force=True)
+    assert watchdog.interruptions == 1
+
+
+def test_unforced_checks_probe_once_per_interval(backend):
+    backend.clock.sleep(5)
+    watchdog = watchdog_for(backend, interval=30)
+    watchdog.check(backend)
+    backend.disconnected_until = backend.clock.now() + 120
+    watchdog.check(backend)  # within the interval: no probe
+    with pytest.raises(SessionInterrupted, match='phone_disconnected'):
+        watchdog.check(backend, force=True)
+    backend.clock.sleep(31)
+    with pytest.raises(SessionInterrupted):
+        watchdog.check(backend)
+    backend.clock.sleep(120)
+    watchdog.check(backend, force=True)
+    watchdog.recovered()
+    assert (watchdog.interruptions, watchdog.recoveries) == (2, 1)
+
+
+def test_disabled_watchdog_never_probes(backend):
+    watchdog = watchdog_for(backend, enabled=False)
+    commands = backend.commands
+    watchdog.check(backend, force=True)
+    assert backend.commands == commands
+    assert not any(watchdog.record_open(False) for _ in range(10))
+
+
+def test_record_open_flags_a_stalled_session(backend):
+    watchdog = watchdog_for(backend, stall_after=3)
+    assert not watchdog.record_open(False)
+    assert not watchdog.record_open(False)
+    assert not watchdog.record_open(True)  # a success resets the streak
+    assert [watchdog.record_open(False) for _ in range(3)] == [False, False, True]
+    assert watchdog.failed_opens == 0
+    assert watchdog.interruptions == 1
+
+
+
+def run_campaign_with_failed_opens(simulated, monkeypatch, failed_opens):
+    """Run a 4-contact simulated campaign whose first `failed_opens` chat opens fail.
+    Returns the final trace row per number and every number whose chat was tried."""
+    simulated(load_latency=1.0, ack_latency=0.1)
+    monkeypatch.setattr(wb, 'NO_DELAY', True)
+    monkeypatch.setattr(wb, 'STALL_AFTER_FAILURES', 3)
+    tried = []
+    open_chat = wb.search_and_open_chat
+
+    def flaky_open(driver, number, name=None):
+        tried.append(number)
+        return len(tried) > failed_opens and open_chat(driver, number, name)
+
+    monkeypatch.setattr(wb, 'search_and_open_chat', flaky_open)
+    wb.set_manual_data([f"91987654321{i}" for i in range(4)], "Hello")
+    wb.run_campaign()
+    final = {}
+    with open(wb.CONTACT_TRACE_LOG, encoding='utf-8') as f:
+        for line in f:
+            row = json.loads(line)
+            if row['status'] != 'requeued':
+                final[row['number']] = (row['status'], row['reason'])
+    return final, tried
+
+
+def test_contacts_of_a_stall_are_requeued_after_recovery(simulated, monkeypatch):
+    final, tried = run_campaign_with_failed_opens(simulated, monkeypatch, failed_opens=3)
+    assert tried == ['919876543210', '919876543211', '919876543212',
+                     '919876543210', '919876543211', '919876543212', '919876543213']
+    assert set(final.values()) == {('sent', '')}
+    assert len(final) == 4
+    assert wb.WATCHDOG.recoveries == 1
+
+
+def test_chat_failures_without_a_stall_are_failed(simulated, monkeypatch):
+    final, tried = run_campaign_with_failed_opens(simulated, monkeypatch, failed_opens=2)
+    assert len(tried) == 4 and wb.WATCHDOG.recoveries == 0
+    assert final['919876543210'] == ('failed', 'Could not open chat')
+    assert final['919876543211'] == ('failed', 'Could not open chat')
+    assert final['919876543213'] == ('sent', '')
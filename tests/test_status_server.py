@@ -0,0 +1,98 @@
+import json
+from urllib.request import Request, urlopen
+
+import pytest
+
+from campaign_metrics import ProgressTracker
+from status_server import StatusServer, render_prometheus
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def progress():
+    clock = FakeClock()
+    tracker = ProgressTracker(alpha=0.5, window=3)
+    tracker.reset(total=10, clock=clock)
+    tracker.fake_clock = clock
+    return tracker
+
+
+def record(progress, seconds, status, reason='', phases=None):
+    progress.fake_clock.now += seconds
+    progress.record_outcome(status, reason, phases)
+
+
+def test_rate_and_eta_follow_the_ewma_interval(progress):
+    record(progress, 10, 'sent', phases={'open_chat': 4.0})
+    assert progress.snapshot()['rate_per_minute'] == 6.0
+    assert progress.snapshot()['eta_seconds'] == 90.0
+    record(progress, 20, 'failed', 'Could not open chat', {'open_chat': 8.0})
+    record(progress, 20, 'suppressed')
+    snap = progress.snapshot()
+    # EWMA with alpha 0.5: 10 -> 15 -> 17.5 seconds per contact
+    assert snap['rate_per_minute'] == round(60 / 17.5, 2)
+    assert snap['eta_seconds'] == 7 * 17.5
+    assert snap['rolling_rate_per_minute'] == 60.0 * 2 / 40
+    assert (snap['processed'], snap['remaining'], snap['success'], snap['suppressed'], snap['failed']) == (3, 7, 1, 1, 1)
+    assert snap['failures_by_reason'] == {'Could not open chat': 1}
+    assert snap['slowest_recent_phase'] == {'phase': 'open_chat', 'seconds': 6.0}
+
+
+def test_eta_is_unknown_before_the_first_outcome(progress):
+    snap = progress.snapshot()
+    assert snap['eta_seconds'] is None and snap['rate_per_minute'] == 0.0
+    assert 'whatsapp_bulk_eta_seconds NaN' in render_prometheus(snap, {})
+
+
+def test_listeners_get_snapshots(progress):
+    events = []
+
+    def listener(event, snap):
+        events.append((event, snap['state']))
+
+    progress.add_listener(listener)
+    progress.set_state('running')
+    record(progress, 1, 'sent')
+    progress.remove_listener(listener)
+    progress.set_state('finished')
+    assert events == [('state', 'running'), ('outcome', 'running')]
+
+
+def test_prometheus_text(progress):
+    record(progress, 10, 'sent')
+    record(progress, 10, 'failed', 'Failed "send"\nretry')
+    progress.set_state('paused')
+    phases = {'open_chat': {'count': 2, 'p50': 1.5, 'p95': 2.0, 'p99': 2.0, 'max': 2.0, 'total': 3.5}}
+    text = render_prometheus(progress.snapshot(), phases)
+    lines = text.splitlines()
+    assert '# TYPE whatsapp_bulk_contacts_processed_total counter' in lines
+    assert 'whatsapp_bulk_contacts_total 10' in lines
+    assert 'whatsapp_bulk_contacts_processed_total 2' in lines
+    assert 'whatsapp_bulk_contacts_failed_total{reason="Failed \\"send\\" retry"} 1' in lines
+    assert 'whatsapp_bulk_paused 1' in lines
+    assert 'whatsapp_bulk_phase_seconds{phase="open_chat",quantile="0.95"} 2.0' in lines
+    assert 'whatsapp_bulk_phase_seconds_count{phase="open_chat"} 2' in lines
+    assert 'whatsapp_bulk_phase_seconds_sum{phase="open_chat"} 3.5' in lines
+    assert text.endswith('\n')
+
+
+def test_server_serves_status_and_controls(progress):
+    actions = []
+    controls = {name: (lambda name=name: actions.append(name)) for name in ('pause', 'resume', 'stop')}
+    server = StatusServer(progress, lambda: {}, controls, port=0).start()
+    try:
+        status = json.load(urlopen(server.url + '/status', timeout=5))
+        assert status['total'] == 10 and status['phases'] == {}
+        metrics = urlopen(server.url + '/metrics', timeout=5).read().decode('utf-8')
+        assert 'whatsapp_bulk_contacts_total 10' in metrics
+        reply = json.load(urlopen(Request(server.url + '/pause', data=b'', method='POST'), timeout=5))
+        assert reply == {'ok': True, 'action': 'pause'} and actions == ['pause']
+    finally:
+        server.stop()
@@ -0,0 +1,61 @@
+import os
+
+from preflight import canonical_number
+from suppression import SuppressionIndex, load_suppression_index
+
+
+def write_list(tmp_path, name, lines):
+    path = tmp_path / name
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def test_screen_and_contains_match_formatted_numbers(tmp_path):
+    source = write_list(tmp_path, 'optout.txt', ['Number', '+91 98765 43210', '44-7700-900123', ''])
+    index = SuppressionIndex.build([source])
+    assert len(index) == 2
+    assert '919876543210' in index
+    assert '447700900123' in index
+    assert '919876543211' not in index
+    assert index.screen(['919876543210', '919876543211', '447700900123']) == {'919876543210', '447700900123'}
+
+
+def test_national_opt_out_matches_canonical_campaign_number(tmp_path):
+    source = write_list(tmp_path, 'optout.csv', ['098765 43210'])
+    index = load_suppression_index([source], cache_dir=str(tmp_path / 'cache'), default_country_code='91')
+    campaign_number, reason = canonical_number('98765 43210', '91')
+    assert reason == '' and campaign_number == '919876543210'
+    assert index.screen([campaign_number]) == {campaign_number}
+    assert campaign_number in index
+
+
+def test_cache_is_keyed_by_country_code(tmp_path):
+    source = write_list(tmp_path, 'optout.txt', ['098765 43210'])
+    cache = str(tmp_path / 'cache')
+    plain = load_suppression_index([source], cache_dir=cache)
+    assert '919876543210' not in plain
+    with_cc = load_suppression_index([source], cache_dir=cache, default_country_code='91')
+    assert '919876543210' in with_cc
+    # The second load reuses its own memory-mapped cache
+    again = load_suppression_index([source], cache_dir=cache, default_country_code='91')
+    assert '919876543210' in again
+    assert len([n for n in os.listdir(cache) if n.endswith('.npy')]) == 1
+
+
+def test_empty_index_and_missing_sources(tmp_path):
+    assert load_suppression_index([str(tmp_path / 'missing.txt')]) is None
+    index = SuppressionIndex.build([write_list(tmp_path, 'empty.txt', ['Number'])])
+    assert len(index) == 0
+    assert index.screen(['919876543210']) == set()
+    assert '919876543210' not in index
+
+
+def test_empty_source_file_is_skipped(tmp_path):
+    empty = tmp_path / 'empty.txt'
+    empty.write_text('', encoding='utf-8')
+    blank = write_list(tmp_path, 'blank.csv', ['', ''])
+    source = write_list(tmp_path, 'optout.txt', ['919876543210'])
+    index = load_suppression_index([str(tmp_path)], cache_dir=str(tmp_path / 'cache'))
+    assert sorted(index.source_files) == sorted([blank, str(empty), source])
+    assert len(index) == 1
+    assert '919876543210' in index
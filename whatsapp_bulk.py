@@ -3,13 +3,33 @@ import sys
 import time
 import random
 import logging
-from datetime import datetime
+import json
+from datetime import datetime, timedelta
 import threading
+from collections import Counter, deque
 import pandas as pd
 import pyperclip
 
-# Create logs directory if it doesn't exist
-LOGS_DIR = os.path.join(os.path.dirname(__file__), 'logs')
+from campaign_metrics import (
+    PHASES, span, count_attempt, start_campaign, finish_campaign, active_timer, percentile, ProgressTracker,
+)
+from campaign_results import ResultsWriter
+from status_server import StatusServer
+import profiling
+from driver_backend import RealClock, SeleniumBackend, SimulatedBackend
+from adaptive_timeouts import TimeoutController
+from session_watchdog import SessionInterrupted, SessionWatchdog
+from send_ack import AckTracker, CONFIRMED as ACK_CONFIRMED
+from contact_store import ContactStore
+from contact_sources import load_contacts
+from selector_packs import resolve_pack
+from suppression import load_suppression_index, normalize as normalize_digits
+from history import HistoryIndex, list_logs, open_log, rotate_logs
+from preflight import canonical_number, run_preflight, write_report as write_preflight_report, log_report as log_preflight_report
+
+# Create logs directory if it doesn't exist. LOGS_DIR moves every log, ledger,
+# report and cache the sender writes (benchmarks point it at a temp dir).
+LOGS_DIR = os.environ.get('LOGS_DIR') or os.path.join(os.path.dirname(__file__), 'logs')
 os.makedirs(LOGS_DIR, exist_ok=True)
 try:
     import pyautogui
@@ -25,12 +45,9 @@ if sys.platform.startswith('win'):
         pass
 
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import WebDriverException
 
 # Fix Windows console encoding issues
 if sys.platform.startswith('win'):
@@ -51,6 +68,8 @@ logging.basicConfig(
 # ====== CONFIG ======
 GOOGLE_SHEET_CSV_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vRW84c1YtBx33dt8e5i57wgvgc3JKSgXiSgNYGf5L5huBCfkcEo6pTI2NSevcUwue1zdeV5mqgiQQtN/pub?gid=0&single=true&output=csv"
 USE_BETA_UI = True  # Prioritize WhatsApp Web Beta UI selectors
+# Base URL of WhatsApp Web (override to point at a local stand-in for benchmarks)
+WHATSAPP_WEB_URL = os.environ.get('WHATSAPP_WEB_URL', 'https://web.whatsapp.com').rstrip('/')
 # Speed controls (override via env)
 # You can disable automatic delays by setting NO_DELAY=1 in the environment.
 # You can also set a fixed delay with DELAY_SECONDS or use DELAY_MIN / DELAY_MAX.
@@ -80,19 +99,89 @@ BATCH_DELAY = 5  # Seconds to wait between batches (reduced from 10)
 PERSISTENT_PROFILE_DIR = r"./chrome_profile"
 MAX_RETRIES = int(os.environ.get('MAX_RETRIES', '2'))
 CHAT_LOAD_TIMEOUT = int(os.environ.get('CHAT_LOAD_TIMEOUT', '20'))
-MESSAGE_SEND_TIMEOUT = int(os.environ.get('MESSAGE_SEND_TIMEOUT', '1'))
+MESSAGE_SEND_TIMEOUT = int(os.environ.get('MESSAGE_SEND_TIMEOUT', '2'))
 WHATSAPP_LOAD_TIMEOUT = int(os.environ.get('WHATSAPP_LOAD_TIMEOUT', '45'))
+# Adaptive timeouts (see adaptive_timeouts.py): once a wait site has enough samples its
+# timeout becomes the TIMEOUT_PERCENTILE latency x TIMEOUT_MARGIN, kept within the
+# bounds below. The static values above are the starting points. ADAPTIVE_TIMEOUTS=0
+# keeps them fixed.
+ADAPTIVE_TIMEOUTS = os.environ.get('ADAPTIVE_TIMEOUTS', '1') == '1'
+TIMEOUT_PERCENTILE = float(os.environ.get('TIMEOUT_PERCENTILE', '99'))
+TIMEOUT_MARGIN = float(os.environ.get('TIMEOUT_MARGIN', '1.5'))
+# site: (initial, floor, ceiling) in seconds
+WAIT_TIMEOUT_BOUNDS = {
+    'app_ready': (WHATSAPP_LOAD_TIMEOUT, 10, WHATSAPP_LOAD_TIMEOUT * 2),
+    'chat_ready': (CHAT_LOAD_TIMEOUT, 3, CHAT_LOAD_TIMEOUT * 2),
+    'search_box': (10, 2, 20),
+    'search_result': (5, 1, 10),
+    'compose_box': (MESSAGE_SEND_TIMEOUT, 1, MESSAGE_SEND_TIMEOUT * 4),
+}
+# Session watchdog (see session_watchdog.py): probe the session every WATCHDOG_INTERVAL
+# seconds and after every failed chat/message-box wait; STALL_AFTER_FAILURES chats in a
+# row that fail to open count as a stale tab. An unhealthy session pauses sending, is
+# recovered (reconnect wait or reload) and the interrupted contact is re-queued.
+SESSION_WATCHDOG = os.environ.get('SESSION_WATCHDOG', '1') == '1'
+WATCHDOG_INTERVAL = float(os.environ.get('WATCHDOG_INTERVAL', '30'))
+STALL_AFTER_FAILURES = int(os.environ.get('STALL_AFTER_FAILURES', '3'))
+SESSION_RECOVERY_TIMEOUT = int(os.environ.get('SESSION_RECOVERY_TIMEOUT', '300'))  # Per recovery attempt
+SESSION_RECOVERY_ATTEMPTS = 3
+MAX_REQUEUES = 2  # Times one contact may be re-queued before it is marked failed
+# Send acknowledgements (see send_ack.py): each message's bubble is checked for the
+# sent tick before the next chat opens, waiting at most ACK_TIMEOUT seconds; only
+# confirmed sends go to the ledger. VERIFY_SENDS=0 trusts ENTER as before.
+VERIFY_SENDS = os.environ.get('VERIFY_SENDS', '1') == '1'
+ACK_TIMEOUT = min(float(os.environ.get('ACK_TIMEOUT', '10')), 25.0)  # Below Selenium's 30s script timeout
 SYNC_DURATION = int(os.environ.get('SYNC_DURATION', '0'))  # Seconds to keep sync-only session alive (0 = infinite until CTRL+C)
 
 # Duplicate prevention
 SENT_MESSAGES_LOG = os.path.join(LOGS_DIR, f"sent_messages_{datetime.now().strftime('%Y%m%d')}.log")
+# Per-contact phase timings (one JSON object per line)
+CONTACT_TRACE_LOG = os.path.join(LOGS_DIR, f"contact_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+# Per-contact results table: RESULTS_FORMATS=csv,parquet (Parquet needs pyarrow),
+# appended every RESULTS_BATCH_SIZE contacts to RESULTS_DIR/campaign_results_<ts>.*.
+# Empty RESULTS_FORMATS disables it.
+RESULTS_DIR = LOGS_DIR
+RESULTS_FORMATS = {f.strip().lower() for f in os.environ.get('RESULTS_FORMATS', 'csv,parquet').split(',') if f.strip()}
+RESULTS_BATCH_SIZE = int(os.environ.get('RESULTS_BATCH_SIZE', '500'))
 CHECK_DUPLICATES = True  # Set to False to disable duplicate checking
+# Indexed send history over every ledger next to SENT_MESSAGES_LOG (see history.py),
+# stored in history.sqlite there unless HISTORY_DB is set. Ledgers, sender logs and
+# traces untouched for LOG_RETENTION_DAYS are gzipped (0 keeps them as-is).
+HISTORY_DB = os.environ.get('HISTORY_DB') or None
+# Check-only mode (--check-only / CHECK_ONLY=1) runs offline and writes CHECK_REPORT.
+# CHECK_VERIFY (or --verify=NOT_SENT,SENT_BEFORE / --verify=all) also opens the chats
+# of numbers with those statuses in the browser.
+CHECK_REPORT = os.path.join(LOGS_DIR, f"check_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+CHECK_VERIFY = os.environ.get('CHECK_VERIFY', '')
+for _arg in sys.argv[1:]:
+    if _arg.startswith('--verify='):
+        CHECK_VERIFY = _arg.split('=', 1)[1]
+CHECK_LOG_LIMIT = 200  # Per-number [CHECK] lines are logged for lists up to this size
+LOG_RETENTION_DAYS = int(os.environ.get('LOG_RETENTION_DAYS', '14'))
+# Country code added to numbers written in national format (e.g. '91' turns
+# '098765 43210' into 919876543210). Empty: numbers must carry a country code.
+DEFAULT_COUNTRY_CODE = ''.join(ch for ch in os.environ.get('DEFAULT_COUNTRY_CODE', '') if ch.isdigit())
+# Pre-flight validation report (sendable/rejected rows with reasons)
+PREFLIGHT_REPORT = os.path.join(LOGS_DIR, f"preflight_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+# Opt-out lists: files or directories of .txt/.csv/.tsv numbers (first column),
+# separated by os.pathsep. Defaults to ./suppression/ when it exists. The built
+# index is cached in LOGS_DIR and memory-mapped on later runs.
+SUPPRESSION_SOURCES = [p for p in os.environ.get(
+    'SUPPRESSION_FILES', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'suppression')
+).split(os.pathsep) if p.strip()]
 
 # Data balancing
 AUTO_BALANCE_DATA = True  # Set to False to disable automatic data balancing
  
+# Local contacts file (CSV/TSV, Excel, Parquet or JSONL; see contact_sources.py) used
+# instead of the Google Sheet: CONTACTS_FILE=path or --contacts=path
+CONTACTS_FILE = os.environ.get('CONTACTS_FILE', '')
+for _arg in sys.argv[1:]:
+    if _arg.startswith('--contacts='):
+        CONTACTS_FILE = _arg.split('=', 1)[1]
+
 # ====== MANUAL DATA OVERRIDE (set via GUI) ======
-MANUAL_DATA = None  # If set (DataFrame), run_campaign will use this instead of loading sheet
+MANUAL_DATA = None  # If set (ContactStore), run_campaign will use this instead of loading sheet
 
 # More robust CONTACT_LIMIT handling
 try:
@@ -108,6 +197,45 @@ except (ValueError, TypeError) as e:
     logging.warning(f"Invalid CONTACT_LIMIT environment variable, using default: {CONTACT_LIMIT}")
 
 DISABLE_IMAGES = os.environ.get('DISABLE_IMAGES', '1') == '1'
+HEADLESS = os.environ.get('HEADLESS', '0') == '1'
+# Browser backend: 'selenium' (real Chrome) or 'simulated' (in-memory fake on a
+# virtual clock, see driver_backend.py). SIMULATION_PROFILE tunes the fake.
+DRIVER_BACKEND = os.environ.get('DRIVER_BACKEND', 'selenium').strip().lower()
+SIMULATION_PROFILE = None
+# Selector pack for the WhatsApp Web markup (see selector_packs.py): SELECTOR_PACK=
+# classic|testid|combined or --selectors=NAME. SELECTOR_SYNTAX=xpath waits with the
+# XPath forms instead of CSS.
+SELECTOR_PACK = os.environ.get('SELECTOR_PACK', '')
+for _arg in sys.argv[1:]:
+    if _arg.startswith('--selectors='):
+        SELECTOR_PACK = _arg.split('=', 1)[1]
+SELECTORS = resolve_pack(SELECTOR_PACK)
+SELECTOR_SYNTAX = 'xpath' if os.environ.get('SELECTOR_SYNTAX', 'css').strip().lower() == 'xpath' else 'css'
+# Paste messages through the clipboard; headless sessions have no clipboard, so
+# the default there is to type the message instead.
+USE_CLIPBOARD = os.environ.get('USE_CLIPBOARD', '0' if HEADLESS else '1') == '1'
+
+# Profiling: PROFILE=sample|cprofile (or --profile / --profile=cprofile on the CLI).
+# Results (.prof, .folded, .svg flame graph) are written to LOGS_DIR.
+PROFILE_MODE = os.environ.get('PROFILE', '')
+for _arg in sys.argv[1:]:
+    if _arg == '--profile':
+        PROFILE_MODE = PROFILE_MODE or 'sample'
+    elif _arg.startswith('--profile='):
+        PROFILE_MODE = _arg.split('=', 1)[1]
+PROFILE_MODE = profiling.resolve_mode(PROFILE_MODE)
+
+# Optional local HTTP status endpoint (JSON + Prometheus); 0 disables it.
+# STATUS_PORT=8787 or --status-port=8787 on the CLI.
+STATUS_HOST = os.environ.get('STATUS_HOST', '127.0.0.1')
+try:
+    STATUS_PORT = int(os.environ.get('STATUS_PORT', '0'))
+    for _arg in sys.argv[1:]:
+        if _arg.startswith('--status-port='):
+            STATUS_PORT = int(_arg.split('=', 1)[1])
+except ValueError:
+    STATUS_PORT = 0
+    logging.warning("Invalid STATUS_PORT, status endpoint disabled")
 
 # Debug: Show actual values
 logging.info("Configuration loaded:")
@@ -116,26 +244,59 @@ logging.info("  DELAY_BETWEEN_CONTACTS: %s", DELAY_BETWEEN_CONTACTS)
 logging.info("  NO_DELAY: %s", NO_DELAY)
 logging.info("  FAST_MODE: %s", FAST_MODE)
 logging.info("  SLEEP_SCALE: %s", SLEEP_SCALE)
+logging.info("  PROFILE_MODE: %s", PROFILE_MODE or 'off')
+logging.info("  SELECTOR_PACK: %s (%s)", SELECTORS.name, SELECTOR_SYNTAX)
 
 # ====== CONTROL EVENTS FOR PAUSE/RESUME/STOP ======
 PAUSE_EVENT = threading.Event()
 PAUSE_EVENT.set()  # Start unpaused
 STOP_EVENT = threading.Event()
 CURRENT_DRIVER = None
+CLOCK = RealClock()  # Replaced by the backend's clock in setup_driver
+PROGRESS = ProgressTracker()  # Live counters for the status endpoint and GUI
+TIMEOUTS = TimeoutController(WAIT_TIMEOUT_BOUNDS, enabled=ADAPTIVE_TIMEOUTS,
+                             pct=TIMEOUT_PERCENTILE, margin=TIMEOUT_MARGIN)
+# Wait latencies kept between runs to seed TIMEOUTS
+TIMEOUT_SAMPLES_FILE = os.path.join(LOGS_DIR, 'wait_latencies.json')
+WATCHDOG = None  # SessionWatchdog of the current driver, created in setup_driver
 
 def pause_sending():
     PAUSE_EVENT.clear()
+    PROGRESS.set_state('paused')
     logging.info("PAUSED: Message sending paused")
 
 def resume_sending():
     if not PAUSE_EVENT.is_set():
         PAUSE_EVENT.set()
+        PROGRESS.set_state('running')
         logging.info("RESUMED: Message sending resumed")
 
 def stop_sending():
     STOP_EVENT.set()
     PAUSE_EVENT.set()
+    PROGRESS.set_state('stopping')
     logging.info("STOP REQUESTED: Will stop after current contact")
+
+def phase_summary():
+    """Phase latency percentiles of the running campaign ({} when idle)"""
+    timer = active_timer()
+    return timer.summary() if timer else {}
+
+def start_status_server():
+    """Start the status endpoint if STATUS_PORT is set; returns the server or None"""
+    if not STATUS_PORT:
+        return None
+    try:
+        return StatusServer(
+            PROGRESS,
+            phase_summary,
+            {'pause': pause_sending, 'resume': resume_sending, 'stop': stop_sending},
+            host=STATUS_HOST,
+            port=STATUS_PORT,
+        ).start()
+    except OSError as e:
+        logging.warning(f"Could not start status endpoint on {STATUS_HOST}:{STATUS_PORT} - {str(e)}")
+        return None
 logging.info("  MAX_RETRIES: %s", MAX_RETRIES)
 
 def set_manual_data(numbers, message):
@@ -143,16 +304,18 @@ def set_manual_data(numbers, message):
     Called by GUI to override spreadsheet loading.
     """
     global MANUAL_DATA
-    rows = []
+    cleaned = []
     for raw in numbers:
         if not raw:
             continue
-        cleaned = str(raw).replace('+', '').replace(' ', '').strip()
-        if not cleaned or cleaned.lower() == 'nan':
+        # Keep the '+' and spacing: the pre-flight pass canonicalizes numbers
+        number = str(raw).strip()
+        if not number or number.lower() == 'nan':
             continue
-        rows.append({'Number': cleaned, 'IntroMessage': message})
-    if rows:
-        MANUAL_DATA = pd.DataFrame(rows)
+        cleaned.append(number)
+    if cleaned:
+        # One shared message for every contact
+        MANUAL_DATA = ContactStore.from_columns(cleaned, messages=message)
         logging.info(f"Manual numbers loaded: {len(MANUAL_DATA)} contacts (spreadsheet will be skipped)")
     else:
         MANUAL_DATA = None
@@ -160,6 +323,29 @@ def set_manual_data(numbers, message):
 
 # ====== ENHANCED SELENIUM SETUP ======
 def setup_driver():
+    """Create the browser backend selected by DRIVER_BACKEND"""
+    global CLOCK, TIMEOUTS, WATCHDOG
+    TIMEOUTS = TimeoutController(WAIT_TIMEOUT_BOUNDS, enabled=ADAPTIVE_TIMEOUTS,
+                                 pct=TIMEOUT_PERCENTILE, margin=TIMEOUT_MARGIN)
+    if ADAPTIVE_TIMEOUTS:
+        TIMEOUTS.load(TIMEOUT_SAMPLES_FILE)
+    if DRIVER_BACKEND == 'simulated':
+        backend = SimulatedBackend(SIMULATION_PROFILE)
+        logging.info("Using SIMULATED driver backend (no browser, virtual clock)")
+    else:
+        backend = SeleniumBackend(setup_chrome())
+    CLOCK = backend.clock
+    WATCHDOG = SessionWatchdog(probe_session_state, CLOCK, enabled=SESSION_WATCHDOG,
+                               interval=WATCHDOG_INTERVAL, stall_after=STALL_AFTER_FAILURES)
+    return backend
+
+def save_timeouts():
+    """Log the adaptive timeouts chosen this session and keep their samples for the next run"""
+    if ADAPTIVE_TIMEOUTS:
+        TIMEOUTS.log_summary()
+        TIMEOUTS.save(TIMEOUT_SAMPLES_FILE)
+
+def setup_chrome():
     """Setup Chrome driver with optimized settings for WhatsApp Web"""
     options = Options()
     options.add_argument(f"user-data-dir={os.path.abspath(PERSISTENT_PROFILE_DIR)}")
@@ -186,6 +372,8 @@ def setup_driver():
     options.add_argument("--no-first-run")
     options.add_argument("--no-service-autorun")
     options.add_argument("--disable-component-update")
+    if HEADLESS:
+        options.add_argument("--headless=new")
     if DISABLE_IMAGES:
         options.add_experimental_option(
             "prefs",
@@ -215,72 +403,86 @@ def controlled_sleep(seconds: float, reason: str = ""):
     if seconds > 0:
         if reason:
             logging.debug(f"Sleep {seconds:.2f}s (orig {original:.2f}s) - {reason}")
-        time.sleep(seconds)
+        CLOCK.sleep(seconds)
     else:
         if reason:
             logging.debug(f"Skipped sleep (orig {original:.2f}s) - {reason}")
 
-def wait_for_whatsapp_load(driver, timeout=WHATSAPP_LOAD_TIMEOUT):
-    """Wait for WhatsApp Web to fully load with better detection"""
+# Single-round-trip readiness probe. Classifies the session into one small
+# status code so the caller never has to pull page text over the wire.
+SESSION_STATE_PROBE_JS = """/* probe:session_state */
+if (document.readyState === 'loading') { return 'loading'; }
+var ready = document.querySelector(%s);
+if (ready) {
+    if (document.querySelector(%s)) {
+        return 'phone_disconnected';
+    }
+    return 'ready';
+}
+if (document.querySelector(%s)) {
+    return 'qr';
+}
+return 'loading';
+""" % tuple(json.dumps(SELECTORS.css(site)) for site in ('app_ready', 'phone_alert', 'qr'))
+READY_POLL_INTERVAL = 0.25  # Seconds between readiness probes
+QR_SCAN_TIMEOUT = int(os.environ.get('QR_SCAN_TIMEOUT', '120'))
+
+def probe_session_state(driver):
+    """Return one of 'loading', 'qr', 'ready' or 'phone_disconnected'"""
+    try:
+        state = driver.execute_script(SESSION_STATE_PROBE_JS)
+    except WebDriverException:
+        return 'loading'
+    return state if state in ('loading', 'qr', 'ready', 'phone_disconnected') else 'loading'
+
+def wait_for_whatsapp_load(driver, timeout=None):
+    """Poll the session state until WhatsApp Web is ready.
+
+    Returns as soon as the chat list is present. When a QR code is shown the
+    deadline is extended by QR_SCAN_TIMEOUT to give the user time to scan.
+    The default timeout is the adaptive 'app_ready' one; waits with an
+    explicit timeout (session recovery) do not feed it.
+    """
     logging.info("Waiting for WhatsApp Web to load...")
+    adaptive = timeout is None
+    if adaptive:
+        timeout = TIMEOUTS.timeout('app_ready')
+    started = CLOCK.now()
+    qr_shown = False
+    deadline = started + timeout
+    last_state = None
     try:
-        logging.info("Step 1: Waiting for basic page elements...")
-        WebDriverWait(driver, 20).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
-        logging.info("Step 2: Looking for WhatsApp interface...")
-        fast_selectors = ["//div[@id='app']", "//div[@id='main']", "//div[@data-testid='pane-side']"]
-        whatsapp_loaded = False
-        for selector in fast_selectors:
-            try:
-                WebDriverWait(driver, 8).until(EC.presence_of_element_located((By.XPATH, selector)))
-                whatsapp_loaded = True
-                break
-            except TimeoutException:
-                continue
-        if not whatsapp_loaded:
-            logging.warning("No WhatsApp elements found with standard selectors. Trying fallback...")
-            time.sleep(5)
-            page_text = driver.execute_script("return document.body.innerText.toLowerCase()")
-            if "whatsapp" in page_text or "qr code" in page_text:
-                logging.info("WhatsApp text detected, assuming page loaded")
-                whatsapp_loaded = True
-        if not whatsapp_loaded:
-            raise TimeoutException("Could not detect WhatsApp Web interface")
-        logging.info("Step 3: Checking login status...")
-        time.sleep(3)
-        qr_selectors = ["//canvas", "//div[contains(@class, 'qr-')]", "//img[contains(@alt, 'QR')]"]
-        qr_found = False
-        for qr_selector in qr_selectors:
-            if driver.find_elements(By.XPATH, qr_selector):
-                logging.info("QR code detected. Please scan to continue...")
-                qr_found = True
+        while True:
+            state = probe_session_state(driver)
+            if state != last_state:
+                logging.info(f"Session state: {state} (after {CLOCK.now() - started:.2f}s)")
+                if state == 'qr':
+                    qr_shown = True
+                    logging.info(f"QR code detected. Please scan to continue (up to {QR_SCAN_TIMEOUT} seconds)...")
+                    deadline = max(deadline, CLOCK.now() + QR_SCAN_TIMEOUT)
+                elif state == 'phone_disconnected':
+                    logging.warning("WhatsApp reports the phone is not connected. Waiting for it to reconnect...")
+                last_state = state
+            if state == 'ready':
+                elapsed = CLOCK.now() - started
+                if adaptive and not qr_shown:
+                    # Time spent scanning a QR code is not load latency
+                    TIMEOUTS.observe('app_ready', elapsed)
+                logging.info(f"STARTUP METRIC: time_to_ready={elapsed:.2f}s")
+                logging.info("SUCCESS: WhatsApp Web loaded successfully!")
+                return True
+            if CLOCK.now() >= deadline:
                 break
-        if qr_found:
-            logging.info("Waiting for QR code scan (up to 120 seconds)...")
-            main_selectors = ["//div[@id='main']", "//div[contains(@class, 'two')]", "//div[@id='pane-side']", "//div[contains(@class, '_2Ts6i')]"]
-            main_loaded = False
-            for main_selector in main_selectors:
-                try:
-                    WebDriverWait(driver, 120).until(EC.presence_of_element_located((By.XPATH, main_selector)))
-                    logging.info("QR scan successful, main interface loaded")
-                    main_loaded = True
-                    break
-                except TimeoutException:
-                    continue
-            if not main_loaded:
-                logging.error("QR scan timeout or failed")
-                return False
-        time.sleep(1)
-        logging.info("SUCCESS: WhatsApp Web loaded successfully!")
-        return True
-    except TimeoutException as e:
-        logging.error(f"TIMEOUT: WhatsApp Web failed to load - {str(e)}")
+            CLOCK.sleep(READY_POLL_INTERVAL)
+        if adaptive:
+            TIMEOUTS.timed_out('app_ready')
+        if last_state == 'qr':
+            logging.error("QR scan timeout or failed")
+        else:
+            logging.error(f"TIMEOUT: WhatsApp Web failed to load - last state '{last_state}'")
         try:
-            current_url = driver.current_url
-            page_title = driver.title
-            logging.error(f"Current URL: {current_url}")
-            logging.error(f"Page title: {page_title}")
+            logging.error(f"Current URL: {driver.current_url}")
+            logging.error(f"Page title: {driver.title}")
         except:
             pass
         return False
@@ -288,49 +490,153 @@ def wait_for_whatsapp_load(driver, timeout=WHATSAPP_LOAD_TIMEOUT):
         logging.error(f"ERROR: Unexpected error loading WhatsApp Web - {str(e)}")
         return False
 
+def recover_session(driver, state):
+    """Pause sending until the session is usable again; returns False if it could not be recovered.
+
+    A disconnected phone is first waited out without reloading (a reload
+    cannot fix it); anything else, and every later attempt, reloads the app
+    and reruns the readiness check.
+    """
+    PROGRESS.set_state('recovering')
+    logging.warning(f"SESSION WATCHDOG: pausing sends to recover from '{state}'")
+    started = CLOCK.now()
+    recovered = False
+    with span('session_recovery'):
+        for attempt in range(1, SESSION_RECOVERY_ATTEMPTS + 1):
+            if STOP_EVENT.is_set():
+                break
+            try:
+                if attempt > 1 or state != 'phone_disconnected':
+                    logging.info(f"Reloading WhatsApp Web (recovery attempt {attempt}/{SESSION_RECOVERY_ATTEMPTS})")
+                    driver.get(WHATSAPP_WEB_URL)
+                recovered = wait_for_whatsapp_load(driver, timeout=SESSION_RECOVERY_TIMEOUT)
+            except WebDriverException as e:
+                logging.warning(f"Recovery attempt {attempt} failed - {str(e)}")
+            if recovered:
+                break
+    if not recovered:
+        logging.error(f"SESSION WATCHDOG: could not recover the session after {CLOCK.now() - started:.0f}s")
+        return False
+    WATCHDOG.recovered()
+    PROGRESS.set_state('running' if PAUSE_EVENT.is_set() else 'paused')
+    logging.info(f"SESSION WATCHDOG: session recovered after {CLOCK.now() - started:.1f}s, resuming sends")
+    return True
+
+# Looks only at modal popups (where WhatsApp reports bad numbers) instead of
+# reading document.body.innerText, which lays out and ships the whole chat list.
+CHAT_STATUS_PROBE_JS = """/* probe:chat_status */
+var popups = document.querySelectorAll(%s);
+for (var i = 0; i < popups.length; i++) {
+    var text = (popups[i].textContent || '').toLowerCase();
+    if (text.indexOf('invalid') !== -1 || text.indexOf('phone number shared') !== -1) {
+        return 'invalid';
+    }
+}
+return 'ok';
+""" % json.dumps(SELECTORS.css('chat_popup'))
+
+def probe_chat_status(driver):
+    """Return 'invalid' if WhatsApp rejected the opened number, otherwise 'ok'"""
+    try:
+        return driver.execute_script(CHAT_STATUS_PROBE_JS) or 'ok'
+    except WebDriverException:
+        return 'ok'
+
+# Reads the status icon of the last outgoing bubble in the open chat. While it is
+# still the clock, a MutationObserver resolves on the first icon change, so the
+# check returns as soon as WhatsApp acknowledges instead of polling.
+SEND_ACK_PROBE_JS = """/* probe:send_ack */
+var timeoutMs = arguments[0], done = arguments[arguments.length - 1];
+var PANE = %s, OUT = %s, STATUS = %s;
+function status() {
+    var main = document.querySelector(PANE);
+    var out = main ? main.querySelectorAll(OUT) : [];
+    if (!out.length) { return 'none'; }
+    var icon = out[out.length - 1].querySelector(STATUS);
+    if (!icon) { return 'unknown'; }
+    var name = icon.getAttribute('data-icon');
+    if (name.indexOf('error') !== -1 || name.indexOf('alert') !== -1) { return 'failed'; }
+    if (/-time$/.test(name)) { return 'pending'; }
+    if (/dblcheck-ack$/.test(name)) { return 'read'; }
+    if (/dblcheck$/.test(name)) { return 'delivered'; }
+    if (/-check$/.test(name)) { return 'sent'; }
+    return 'unknown';
+}
+var first = status();
+if (first !== 'pending' || timeoutMs <= 0) { done(first); return; }
+var timer, observer = new MutationObserver(function () {
+    var now = status();
+    if (now !== 'pending') { observer.disconnect(); clearTimeout(timer); done(now); }
+});
+observer.observe(document.querySelector(PANE), {subtree: true, childList: true, attributes: true, attributeFilter: ['data-icon']});
+timer = setTimeout(function () { observer.disconnect(); done(status()); }, timeoutMs);
+""" % tuple(json.dumps(SELECTORS.css(site)) for site in ('chat_pane', 'message_out', 'message_status'))
+
+def probe_send_ack(driver, timeout=ACK_TIMEOUT):
+    """Status of the last outgoing message in the open chat: 'pending', 'sent', 'delivered',
+    'read', 'failed', 'none' (no outgoing bubble) or 'unknown' (unreadable)"""
+    try:
+        status = driver.execute_async_script(SEND_ACK_PROBE_JS, int(timeout * 1000))
+    except WebDriverException:
+        return 'unknown'
+    return status or 'unknown'
+
+def recheck_send_ack(driver, timeout=ACK_TIMEOUT, poll=0.5):
+    """probe_send_ack in a reopened chat, whose earlier bubbles may not have rendered yet:
+    'none' is polled until the history shows up or the timeout passes"""
+    deadline = CLOCK.now() + timeout
+    status = probe_send_ack(driver, timeout)
+    while status == 'none' and CLOCK.now() < deadline:
+        CLOCK.sleep(poll)
+        status = probe_send_ack(driver, max(0.0, deadline - CLOCK.now()))
+    return status
+
+# Each wait site waits once on the union of its selectors, so a missing element
+# costs one (adaptive) timeout instead of one per selector. Selectors that also
+# match the search box (data-tab=3, bare selectable-text/textbox) are scoped out.
+COMPOSE_BOX = SELECTORS.locator('compose_box', syntax=SELECTOR_SYNTAX)
+CHAT_READY = SELECTORS.locator('compose_box', 'invalid_popup', syntax=SELECTOR_SYNTAX)
+SEARCH_BOX = SELECTORS.locator('search_box', syntax=SELECTOR_SYNTAX)
+SEARCH_RESULT = SELECTORS.locator('search_result', syntax=SELECTOR_SYNTAX)
+
+def wait_for(driver, site, locator, clickable=False):
+    """driver.wait_for with the site's adaptive timeout; the outcome feeds back into it"""
+    timeout = TIMEOUTS.timeout(site)
+    started = CLOCK.now()
+    element = driver.wait_for(site, locator, timeout, clickable=clickable)
+    if element is None:
+        TIMEOUTS.timed_out(site)
+    else:
+        TIMEOUTS.observe(site, CLOCK.now() - started)
+    return element
+
 def search_and_open_chat(driver, number, name=None):
     """Search for contact and open chat - more reliable method"""
     try:
         logging.info(f"Opening chat for {number}")
-        direct_url = f"https://web.whatsapp.com/send?phone={number}"
+        direct_url = f"{WHATSAPP_WEB_URL}/send?phone={number}"
         logging.info(f"Trying direct URL: {direct_url}")
         driver.get(direct_url)
         controlled_sleep(2, "post driver.get direct chat load")
 
-        chat_indicators = [
-            "//div[@contenteditable='true'][@data-tab='10']",
-            "//div[@contenteditable='true'][@data-tab='6']",
-            "//div[@contenteditable='true'][@data-tab='3']",
-            "//div[@contenteditable='true'][contains(@class, 'selectable-text')]",
-            "//div[@role='textbox'][@contenteditable='true']",
-            "//div[contains(@class, '_13NKt')][@contenteditable='true']",
-            "//*[@data-testid='conversation-compose-box-input']",
-            "//*[@data-testid='compose-box-input']"
-        ]
-
-        chat_loaded = False
-        for i, indicator in enumerate(chat_indicators, 1):
-            try:
-                logging.info(f"Checking chat indicator {i}/{len(chat_indicators)}: {indicator}")
-                WebDriverWait(driver, CHAT_LOAD_TIMEOUT).until(EC.presence_of_element_located((By.XPATH, indicator)))
-                logging.info(f"SUCCESS: Chat loaded using indicator {i}")
-                chat_loaded = True
-                break
-            except TimeoutException:
-                logging.info(f"Indicator {i} not found, trying next...")
-                continue
-
-        if chat_loaded:
+        # One wait for whichever comes first: the compose box or WhatsApp's invalid-number popup
+        if wait_for(driver, 'chat_ready', CHAT_READY):
             controlled_sleep(1, "after chat indicators detected")
-            page_text = driver.execute_script("return document.body.innerText.toLowerCase()")
-            if "invalid number" in page_text or "phone number shared" in page_text:
+            if probe_chat_status(driver) == 'invalid':
                 logging.error(f"Invalid number detected for {number}")
                 return False
-            logging.info(f"SUCCESS: Chat opened for {number}")
-            return True
+            if driver.find_elements('chat_ready', COMPOSE_BOX):
+                logging.info(f"SUCCESS: Chat opened for {number}")
+                return True
+        else:
+            # A dropped session fails every search too; hand it to the watchdog instead
+            WATCHDOG.check(driver, force=True)
 
         logging.info(f"Direct URL failed for {number}, trying search method...")
-        return search_contact_via_search_box(driver, number, name)
+        with span('search_fallback'):
+            return search_contact_via_search_box(driver, number, name)
+    except SessionInterrupted:
+        raise
     except Exception as e:
         logging.error(f"ERROR: Failed to open chat for {number} - {str(e)}")
         return False
@@ -339,32 +645,14 @@ def search_contact_via_search_box(driver, number, name=None):
     """Alternative method: Search via WhatsApp search box"""
     try:
         logging.info(f"Searching via search box for {number}")
-        driver.get("https://web.whatsapp.com")
+        driver.get(WHATSAPP_WEB_URL)
         controlled_sleep(3, "post driver.get main page for search")
 
-        search_selectors = [
-            "//div[@contenteditable='true'][@data-tab='3']",
-            "//div[contains(@class, 'selectable-text')][@contenteditable='true'][@data-tab='3']",
-            "//input[@type='text'][@placeholder='Search or start new chat']",
-            "//div[@title='Search or start new chat']",
-            "//div[@contenteditable='true'][@data-tab='6']",
-            "//div[@contenteditable='true'][@data-tab='1']",
-            "//*[@data-testid='chat-list-search']",
-            "//div[contains(@class, 'search')]//div[@contenteditable='true']"
-        ]
-
-        search_box = None
-        for search_selector in search_selectors:
-            try:
-                search_box = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, search_selector)))
-                logging.info(f"Found search box with selector: {search_selector}")
-                break
-            except TimeoutException:
-                continue
-
+        search_box = wait_for(driver, 'search_box', SEARCH_BOX, clickable=True)
         if not search_box:
             logging.error("Could not find search box")
             return False
+        logging.info("Found search box")
 
         search_terms = []
         if name and name.strip() and name.lower() != 'nan':
@@ -380,39 +668,16 @@ def search_contact_via_search_box(driver, number, name=None):
                 search_box.send_keys(str(search_term))
                 controlled_sleep(3, "wait for search results populate")
 
-                result_selectors = [
-                    "//div[@id='pane-side']//div[contains(@class, 'zoWT4')]//span",
-                    "//div[contains(@class, 'chat-list')]//div[contains(@class, 'chat')]",
-                    "//div[@role='listitem']//div[contains(@class, 'contact')]",
-                    "//div[contains(@class, 'chat')]//div[contains(@class, 'contact')]",
-                    "//div[@role='listitem']//div[contains(@class, 'chat')]",
-                    "//div[contains(@class, '_199zF')]",
-                    "//div[contains(@class, 'zoWT4')]"
-                ]
-
-                for result_selector in result_selectors:
-                    try:
-                        contact_result = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, result_selector)))
-                        contact_result.click()
-                        controlled_sleep(3, "after clicking search result to load chat")
-
-                        chat_indicators = [
-                            "//div[@contenteditable='true'][@data-tab='10']",
-                            "//div[@contenteditable='true'][@data-tab='6']",
-                            "//div[@contenteditable='true'][@data-tab='3']",
-                            "//div[@contenteditable='true'][contains(@class, 'selectable-text')]",
-                            "//*[@data-testid='conversation-compose-box-input']",
-                            "//*[@data-testid='compose-box-input']"
-                        ]
-
-                        for chat_indicator in chat_indicators:
-                            if driver.find_elements(By.XPATH, chat_indicator):
-                                logging.info(f"SUCCESS: Chat opened via search for {search_term}")
-                                return True
-
-                        logging.info(f"Chat indicator not found after clicking result for {search_term}")
-                    except TimeoutException:
-                        continue
+                contact_result = wait_for(driver, 'search_result', SEARCH_RESULT, clickable=True)
+                if not contact_result:
+                    logging.info(f"No search result for {search_term}")
+                    continue
+                contact_result.click()
+                controlled_sleep(3, "after clicking search result to load chat")
+                if driver.find_elements('chat_ready', COMPOSE_BOX):
+                    logging.info(f"SUCCESS: Chat opened via search for {search_term}")
+                    return True
+                logging.info(f"Chat indicator not found after clicking result for {search_term}")
             except Exception as e:
                 logging.warning(f"Error during search for {search_term}: {str(e)}")
                 continue
@@ -425,51 +690,41 @@ def search_contact_via_search_box(driver, number, name=None):
 
 def send_message(driver, message, retry_count=0):
     """Send text message with retry logic"""
+    count_attempt()
     try:
         logging.info("Sending message...")
-        message_selectors = [
-            "//*[@data-testid='conversation-compose-box-input']" if USE_BETA_UI else None,
-            "//*[@data-testid='compose-box-input']" if USE_BETA_UI else None,
-            "//div[@contenteditable='true'][@data-tab='10']",
-            "//div[@contenteditable='true'][contains(@class, 'selectable-text')]",
-            "//div[@role='textbox'][@contenteditable='true']",
-            "//div[contains(@class, '_13NKt')][@contenteditable='true']"
-        ]
-        message_selectors = [ms for ms in message_selectors if ms]
-        primary_selector = message_selectors[0]
-        message_box = None
-        try:
-            message_box = WebDriverWait(driver, 2).until(EC.element_to_be_clickable((By.XPATH, primary_selector)))
-        except TimeoutException:
-            for selector in message_selectors[1:]:
-                try:
-                    message_box = WebDriverWait(driver, 2).until(EC.element_to_be_clickable((By.XPATH, selector)))
-                    break
-                except TimeoutException:
-                    continue
+        with span('send_find'):
+            message_box = wait_for(driver, 'compose_box', COMPOSE_BOX, clickable=True)
         if not message_box:
+            WATCHDOG.check(driver, force=True)
             raise Exception("Could not find message input box")
-        message_box.click()
-        controlled_sleep(0.3, "after focusing message box")
-        message_box.send_keys(Keys.CONTROL, 'a')
-        message_box.send_keys(Keys.DELETE)
-        try:
-            pyperclip.copy(message)
-            message_box.send_keys(Keys.CONTROL, 'v')
-        except Exception:
-            chunks = [message[i:i+1000] for i in range(0, len(message), 1000)] if len(message) > 1000 else [message]
-            for idx, chunk in enumerate(chunks):
-                lines = chunk.split('\n')
-                for line_i, line in enumerate(lines):
-                    message_box.send_keys(line)
-                    if line_i < len(lines) - 1:
-                        message_box.send_keys(Keys.SHIFT, Keys.ENTER)
-                if idx < len(chunks) - 1:
-                    controlled_sleep(0.3, "between chunk pastes")
-        message_box.send_keys(Keys.ENTER)
-        controlled_sleep(0.3, "post ENTER send stabilization")
-        logging.info("SUCCESS: Message sent")
+        with span('send_insert'):
+            message_box.click()
+            controlled_sleep(0.3, "after focusing message box")
+            message_box.send_keys(Keys.CONTROL, 'a')
+            message_box.send_keys(Keys.DELETE)
+            try:
+                if not USE_CLIPBOARD:
+                    raise RuntimeError("clipboard disabled")
+                pyperclip.copy(message)
+                message_box.send_keys(Keys.CONTROL, 'v')
+            except Exception:
+                chunks = [message[i:i+1000] for i in range(0, len(message), 1000)] if len(message) > 1000 else [message]
+                for idx, chunk in enumerate(chunks):
+                    lines = chunk.split('\n')
+                    for line_i, line in enumerate(lines):
+                        message_box.send_keys(line)
+                        if line_i < len(lines) - 1:
+                            message_box.send_keys(Keys.SHIFT, Keys.ENTER)
+                    if idx < len(chunks) - 1:
+                        controlled_sleep(0.3, "between chunk pastes")
+        with span('send_submit'):
+            message_box.send_keys(Keys.ENTER)
+            controlled_sleep(0.3, "post ENTER send stabilization")
+        logging.info("SUCCESS: Message submitted")
         return True
+    except SessionInterrupted:
+        raise
     except Exception as e:
         if retry_count < MAX_RETRIES:
             logging.warning(f"Message send failed, retrying... ({retry_count + 1}/{MAX_RETRIES})")
@@ -499,7 +754,7 @@ def random_delay():
     delay = random.randint(low, high) if high >= low else low
     if delay > 0:
         logging.info(f"Waiting {delay} seconds before next contact...")
-        time.sleep(delay)
+        CLOCK.sleep(delay)
     else:
         logging.debug("Calculated delay is 0, continuing immediately")
 
@@ -509,7 +764,7 @@ def batch_delay():
     for remaining in range(BATCH_DELAY, 0, -1):
         if remaining % 10 == 0 or remaining <= 5:  # Show countdown every 10 seconds or last 5 seconds
             logging.info(f"⏳ Resuming in {remaining} seconds...")
-        time.sleep(1)
+        CLOCK.sleep(1)
     logging.info("▶️  Resuming with next batch...")
 
 def load_sent_messages():
@@ -524,7 +779,7 @@ def load_sent_messages():
                         # Format: timestamp|number|name|message_preview
                         parts = line.split('|')
                         if len(parts) >= 2:
-                            sent_contacts.add(parts[1])  # Add phone number
+                            sent_contacts.add(clean_number(parts[1]))  # Add phone number
             logging.info(f"Loaded {len(sent_contacts)} previously sent contacts from log")
         else:
             logging.info("No previous sent messages log found - starting fresh")
@@ -547,61 +802,189 @@ def save_sent_message(number, name, message_preview):
     except Exception as e:
         logging.error(f"Failed to save sent message log: {str(e)}")
 
+def clean_number(number):
+    """Canonical digits of a number so ledger and sheet numbers compare equal in any format"""
+    return canonical_number(number, DEFAULT_COUNTRY_CODE)[0]
+
+def open_results_writer():
+    """ResultsWriter for the configured RESULTS_FORMATS, or None when disabled"""
+    if not RESULTS_FORMATS:
+        return None
+    base = os.path.join(RESULTS_DIR, f"campaign_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    return ResultsWriter(
+        csv_path=base + '.csv' if 'csv' in RESULTS_FORMATS else None,
+        parquet_path=base + '.parquet' if 'parquet' in RESULTS_FORMATS else None,
+        phases=PHASES,
+        batch_size=RESULTS_BATCH_SIZE,
+    )
+
+def preflight_contacts(data, with_report=False):
+    """Canonicalize, validate and deduplicate the whole contact list before the browser opens.
+    Returns a ContactStore of the sendable contacts (and the pre-flight report when with_report)
+    and writes the full report to PREFLIGHT_REPORT."""
+    started = time.perf_counter()
+    sendable, report = run_preflight(data, DEFAULT_COUNTRY_CODE)
+    logging.info(f"Pre-flight pass: {report['rows']} rows canonicalized and deduplicated "
+                 f"in {time.perf_counter() - started:.2f}s")
+    try:
+        write_preflight_report(report, PREFLIGHT_REPORT)
+        log_preflight_report(report, PREFLIGHT_REPORT)
+    except OSError as e:
+        log_preflight_report(report)
+        logging.warning(f"Could not write pre-flight report: {str(e)}")
+    return (sendable, report) if with_report else sendable
+
 def is_message_already_sent(number, sent_contacts):
-    """Check if a message has already been sent to this contact"""
+    """Check if a message has already been sent to this contact.
+    sent_contacts holds cleaned numbers, so this is a single set lookup."""
     if not CHECK_DUPLICATES:
         return False
-    
-    # Clean the number for comparison
-    clean_number = str(number).replace("+", "").replace(" ", "").replace("-", "").strip()
-    
-    # Check if this number exists in sent contacts
-    for sent_number in sent_contacts:
-        sent_clean = str(sent_number).replace("+", "").replace(" ", "").replace("-", "").strip()
-        if clean_number == sent_clean:
-            return True
-    
-    return False
+    return clean_number(number) in sent_contacts
 
-def open_chats_check_only(numbers):
-    """Open each provided number's chat (no messages sent) and log whether an intro was previously sent.
-    numbers: iterable of raw number strings.
+def load_suppressed_contacts(numbers):
+    """Screen the campaign's canonical numbers against the opt-out index in one pass.
+    Returns the numbers to skip, so the per-contact check is a set lookup."""
+    if not SUPPRESSION_SOURCES or not any(os.path.exists(p) for p in SUPPRESSION_SOURCES):
+        return set()
+    index = load_suppression_index(SUPPRESSION_SOURCES, cache_dir=LOGS_DIR, default_country_code=DEFAULT_COUNTRY_CODE)
+    if index is None:
+        return set()
+    numbers = list(numbers)
+    suppressed = index.screen(numbers)
+    logging.info(f"🚫 Suppression: {len(suppressed)} of {len(numbers)} contacts have opted out and will be skipped")
+    return suppressed
+
+def open_history(rotate=False):
+    """Open the send-history index, rotating old logs if asked, and ingest new ledger lines.
+    Returns None if the index cannot be used."""
+    ledger_dir = os.path.dirname(os.path.abspath(SENT_MESSAGES_LOG))
+    try:
+        index = HistoryIndex(HISTORY_DB or os.path.join(ledger_dir, 'history.sqlite'), DEFAULT_COUNTRY_CODE)
+        if rotate and LOG_RETENTION_DAYS > 0:
+            rotate_logs(ledger_dir, LOG_RETENTION_DAYS, index)
+        started = time.perf_counter()
+        added = index.sync(ledger_dir)
+        logging.info(f"Send history index: {added} new sends ingested in {time.perf_counter() - started:.2f}s")
+        return index
+    except Exception as e:
+        logging.warning(f"Send history index unavailable: {str(e)}")
+        return None
+
+def classify_contacts(numbers):
+    """Offline check: classify every number against the suppression list and the full send
+    history in one pass, without a browser. Returns a DataFrame (number, status, reason,
+    last_sent, chat) with one row per input number, in input order, and writes it to CHECK_REPORT.
+    Rows rejected by pre-flight are INVALID or DUPLICATE, with the pre-flight reason."""
+    sendable, preflight = preflight_contacts(ContactStore.from_columns(numbers), with_report=True)
+    rejected = preflight['rejected_rows']
+    rejected_rows = {entry['row'] for entry in rejected}
+    report = pd.DataFrame({
+        'row': [r for r in range(1, preflight['rows'] + 1) if r not in rejected_rows],
+        'number': sendable.number_list(),
+    })
+    suppressed_contacts = load_suppressed_contacts(report['number'].tolist())
+    history = open_history()
+    if history:
+        last_sent = history.last_sent_many(report['number'].tolist())
+        history.close()
+    else:
+        last_sent = {}
+    report['last_sent'] = report['number'].map(last_sent).fillna('')
+    # Today's ledger is already in the index; it is the fallback when the index is unavailable
+    previously = (report['last_sent'] != '') | report['number'].isin(load_sent_messages())
+    report['status'] = 'NOT_SENT'
+    report.loc[previously, 'status'] = 'SENT_BEFORE'
+    report.loc[report['number'].isin(suppressed_contacts), 'status'] = 'SUPPRESSED'
+    report['reason'] = ''
+    if rejected:
+        invalid = pd.DataFrame({
+            'row': [entry['row'] for entry in rejected],
+            'number': [entry['number'] for entry in rejected],
+            'last_sent': '',
+            'status': ['DUPLICATE' if 'duplicate_of_row' in entry else 'INVALID' for entry in rejected],
+            'reason': [entry['reason'] for entry in rejected],
+        })
+        report = pd.concat([report, invalid]).sort_values('row', kind='stable')
+    report = report.drop(columns='row').reset_index(drop=True)[['number', 'status', 'reason', 'last_sent']]
+    report['chat'] = ''
+    write_check_report(report)
+
+    counts = report['status'].value_counts()
+    logging.info(f"CHECK SUMMARY: Total={len(report)} PreviouslySent={counts.get('SENT_BEFORE', 0)} "
+                 f"NotSent={counts.get('NOT_SENT', 0)} Suppressed={counts.get('SUPPRESSED', 0)} "
+                 f"Invalid={counts.get('INVALID', 0)} Duplicate={counts.get('DUPLICATE', 0)}")
+    if len(report) <= CHECK_LOG_LIMIT:
+        for row in report.itertuples(index=False):
+            detail = f" ({row.reason})" if row.reason else (f" (last {row.last_sent})" if row.last_sent else '')
+            logging.info(f"[CHECK] {row.number}: {row.status}{detail}")
+    return report
+
+def write_check_report(report):
+    try:
+        report.to_csv(CHECK_REPORT, index=False)
+        logging.info(f"Check report written to {CHECK_REPORT}")
+    except OSError as e:
+        logging.warning(f"Could not write check report: {str(e)}")
+
+def open_chats_check_only(numbers, verify=None):
+    """Classify numbers offline (see classify_contacts), then optionally open the chats of the
+    rows whose status is listed in verify ('NOT_SENT,SENT_BEFORE', 'all' or '' for offline only;
+    defaults to CHECK_VERIFY). Suppressed, invalid and duplicate rows are never opened. Returns
+    the report DataFrame.
     """
-    logging.info("CHECK-ONLY MODE: Opening chats to inspect prior send status (no messages will be sent)")
+    verify = CHECK_VERIFY if verify is None else verify
+    logging.info("CHECK-ONLY MODE: Classifying numbers against the send history (no messages will be sent)")
+    report = classify_contacts(numbers)
+    wanted = {v.strip().upper() for v in verify.split(',') if v.strip()}
+    if 'ALL' in wanted:
+        wanted = {'NOT_SENT', 'SENT_BEFORE'}
+    wanted -= {'SUPPRESSED', 'INVALID', 'DUPLICATE'}
+    subset = report[report['status'].isin(wanted)]
+    if subset.empty:
+        if wanted:
+            logging.info(f"No numbers with status {', '.join(sorted(wanted))} to verify in the browser")
+        return report
+
+    logging.info(f"Verifying {len(subset)} chats in the browser ({', '.join(sorted(wanted))})")
     driver = setup_driver()
     global CURRENT_DRIVER
     CURRENT_DRIVER = driver
     try:
         logging.info("Loading WhatsApp Web...")
-        driver.get("https://web.whatsapp.com")
+        driver.get(WHATSAPP_WEB_URL)
         if not wait_for_whatsapp_load(driver):
             logging.error("Failed to load WhatsApp Web.")
-            return
-        sent_contacts = load_sent_messages()
-        processed = 0
-        already = 0
-        fresh = 0
-        for raw in numbers:
+            return report
+        opened = 0
+        for idx, number, status in zip(subset.index, subset['number'], subset['status']):
             if STOP_EVENT.is_set():
                 break
-            number = str(raw).replace('+','').replace(' ','').replace('-','').strip()
-            if not number:
-                continue
-            status = 'UNKNOWN'
-            previously = is_message_already_sent(number, sent_contacts)
-            status = 'SENT_BEFORE' if previously else 'NOT_SENT'
-            if search_and_open_chat(driver, number):
+            chat_opened = None
+            for _ in range(MAX_REQUEUES + 1):
+                try:
+                    chat_opened = search_and_open_chat(driver, number)
+                    break
+                except SessionInterrupted as e:
+                    if not recover_session(driver, e.state):
+                        break
+            if chat_opened is None:
+                logging.error("Session lost - stopping verification")
+                break
+            if chat_opened:
+                report.at[idx, 'chat'] = 'OPENED'
+                opened += 1
                 logging.info(f"[CHECK] {number}: {status}")
             else:
+                report.at[idx, 'chat'] = 'CHAT_OPEN_FAILED'
                 logging.info(f"[CHECK] {number}: CHAT_OPEN_FAILED")
-            processed += 1
-            already += 1 if previously else 0
-            fresh += 0 if previously else 1
             if DELAY_BETWEEN_CONTACTS[0] or DELAY_BETWEEN_CONTACTS[1]:
                 controlled_sleep( (DELAY_BETWEEN_CONTACTS[0]+DELAY_BETWEEN_CONTACTS[1])/2.0 ,"between checks")
-        logging.info(f"CHECK SUMMARY: Total={processed} PreviouslySent={already} NotSent={fresh}")
+        logging.info(f"VERIFY SUMMARY: Opened={opened} Failed={(report['chat'] == 'CHAT_OPEN_FAILED').sum()}")
+        write_check_report(report)
     finally:
+        save_timeouts()
         logging.info("Check-only session complete. Browser left open for manual review.")
+    return report
 
 def show_duplicate_prevention_info(sent_contacts, total_contacts):
     """Show information about duplicate prevention"""
@@ -616,53 +999,22 @@ def show_duplicate_prevention_info(sent_contacts, total_contacts):
         logging.info(f"⚠️  Messages may be sent multiple times to same contact")
 
 def balance_spreadsheet_data(data):
-    """Automatically balance spreadsheet data by duplicating/removing intro messages"""
+    """Automatically balance spreadsheet data so every contact gets the first row's intro message"""
     logging.info("Balancing spreadsheet data...")
     
     # Get the intro message from the first row
     if len(data) > 0:
-        first_intro = data.iloc[0]['IntroMessage'] if 'IntroMessage' in data.columns else ""
+        first_intro = data[0].message
         logging.info(f"Using intro message: {first_intro[:50]}{'...' if len(first_intro) > 50 else ''}")
         
-        # Create a new dataframe with balanced data
-        balanced_data = []
+        # Same contacts sharing one interned message; invalid numbers are dropped by the pre-flight pass
+        balanced = data.with_message(first_intro)
         
-        for idx, row in data.iterrows():
-            # Convert number to string and clean it properly
-            raw_number = row['Number']
-            if pd.isna(raw_number):
-                logging.warning(f"Skipping row {idx + 1}: NaN number")
-                continue
-                
-            # Convert to string and remove .0 if it's a float
-            number = str(raw_number).replace(".0", "").replace("+", "").replace(" ", "").strip()
-            name = row.get('Name', '') if 'Name' in data.columns else ''
-            
-            # Skip invalid numbers
-            if not number or number.lower() == 'nan':
-                logging.warning(f"Skipping row {idx + 1}: Invalid number")
-                continue
-            
-            # Create balanced row with same intro message
-            balanced_row = {
-                'Number': number,  # Use cleaned number
-                'IntroMessage': first_intro
-            }
-            
-            # Add Name column if it exists
-            if 'Name' in data.columns:
-                balanced_row['Name'] = name
-            
-            balanced_data.append(balanced_row)
-        
-        # Convert back to DataFrame
-        balanced_df = pd.DataFrame(balanced_data)
-        
-        logging.info(f"Data balanced: {len(balanced_df)} contacts with same intro message")
+        logging.info(f"Data balanced: {len(balanced)} contacts with same intro message")
         logging.info(f"Original data: {len(data)} rows")
-        logging.info(f"Balanced data: {len(balanced_df)} rows")
+        logging.info(f"Balanced data: {len(balanced)} rows")
         
-        return balanced_df
+        return balanced
     
     return data
 
@@ -685,60 +1037,290 @@ def show_data_balance_info(original_data, balanced_data):
     # Show sample of balanced data
     if len(balanced_data) > 0:
         logging.info("  📝 Sample balanced data:")
-        for i, row in balanced_data.head(3).iterrows():
-            number = row.get('Number', 'N/A')
-            name = row.get('Name', 'N/A')
-            intro = row.get('IntroMessage', 'N/A')
+        for i in range(min(3, len(balanced_data))):
+            contact = balanced_data[i]
+            number, name, intro = contact.number, contact.name or 'N/A', contact.message
             logging.info(f"    Row {i+1}: Number='{number}', Name='{name}', Intro='{intro[:30]}{'...' if len(intro) > 30 else ''}'")
 
+def balance_contacts(data):
+    """Apply AUTO_BALANCE_DATA to a loaded contact list"""
+    original_data = data
+    if AUTO_BALANCE_DATA:
+        data = balance_spreadsheet_data(data)
+        show_data_balance_info(original_data, data)
+    else:
+        logging.info("Data balancing is disabled. Using original data.")
+    return data
+
+def load_campaign_data():
+    """Load contacts from MANUAL_DATA, CONTACTS_FILE or the Google Sheet. Returns a ContactStore or None on failure."""
+    if MANUAL_DATA is not None:
+        # The pre-flight pass builds a new store, so MANUAL_DATA is never modified
+        data = MANUAL_DATA
+        logging.info(f"Using MANUAL DATA: {len(data)} contacts provided via GUI")
+        return data
+    if CONTACTS_FILE:
+        try:
+            logging.info(f"Reading contacts file {CONTACTS_FILE}...")
+            started = time.perf_counter()
+            data = load_contacts(CONTACTS_FILE)
+        except (OSError, ValueError, ImportError) as e:
+            logging.error(f"Could not read contacts file {CONTACTS_FILE}: {str(e)}")
+            return None
+        logging.info(f"Loaded {len(data)} contacts from {os.path.basename(CONTACTS_FILE)} "
+                     f"in {time.perf_counter() - started:.2f}s")
+        return balance_contacts(data)
+    try:
+        logging.info("Fetching Google Sheet data...")
+        data = pd.read_csv(GOOGLE_SHEET_CSV_URL)
+        required_cols = ['Number', 'IntroMessage']
+        present_cols = [c for c in required_cols if c in data.columns]
+        data = data.dropna(subset=present_cols)
+        logging.info(f"Loaded {len(data)} contacts from spreadsheet")
+        
+        # Debug: Show data info
+        logging.info(f"Data shape: {data.shape}")
+        logging.info(f"Data columns: {list(data.columns)}")
+        logging.info(f"First few rows:")
+        for i, row in data.head(3).iterrows():
+            logging.info(f"  Row {i}: Number='{row.get('Number', 'N/A')}', Message='{row.get('IntroMessage', 'N/A')}'")
+        
+        # Only Number/Name/IntroMessage are kept, as compact columns
+        data = ContactStore.from_frame(data)
+        
+        # Balance the data (duplicate/remove intro messages as needed)
+        return balance_contacts(data)
+    except Exception as e:
+        logging.error(f"Failed to load data: {str(e)}")
+        return None
+
+# ====== CAMPAIGN PLANNER ======
+PLAN_HISTORY_FILES = 20  # Most recent contact trace files used for latency history
+PLAN_DEFAULT_CONTACT_SECONDS = 8.0  # Per-contact estimate when there is no history
+PLAN_DEFAULT_STARTUP_SECONDS = 15.0
+
+def load_contact_history(max_files=PLAN_HISTORY_FILES):
+    """Per-contact browser time (seconds, pacing excluded) of attempted contacts in past traces
+    (rotated .gz traces included)"""
+    trace_files = list_logs(LOGS_DIR, 'contact_trace_', '.jsonl')[-max_files:]
+    durations = []
+    for fname in trace_files:
+        try:
+            with open_log(os.path.join(LOGS_DIR, fname)) as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue
+                    if row.get('status') not in ('sent', 'failed'):
+                        continue
+                    work = row.get('total_s', 0.0) - row.get('phases', {}).get('pacing_wait', 0.0)
+                    durations.append(max(0.0, work))
+        except (OSError, EOFError):
+            continue
+    return durations
+
+def load_startup_history():
+    """Most recent time_to_ready startup metric from previous sender logs (rotated .gz included), if any"""
+    log_files = list_logs(LOGS_DIR, 'whatsapp_sender_', '.log')
+    for fname in reversed(log_files):
+        try:
+            with open_log(os.path.join(LOGS_DIR, fname)) as f:
+                for line in f:
+                    if 'STARTUP METRIC: time_to_ready=' in line:
+                        return float(line.rsplit('=', 1)[1].rstrip().rstrip('s'))
+        except (OSError, EOFError, ValueError):
+            continue
+    return None
+
+def plan_campaign():
+    """Dry run: count the exact sends and predict duration and finish time without opening a browser"""
+    logging.info("PLAN MODE: Estimating campaign duration (no browser will be opened)")
+    data = load_campaign_data()
+    if data is None:
+        return None
+    rows = len(data)
+    data = preflight_contacts(data)
+    sent_contacts = load_sent_messages()
+    # Same skips as run_campaign, in the same order: ledger first, then opt-outs
+    unsent = [number for number in data.number_list() if not is_message_already_sent(number, sent_contacts)]
+    ledger_duplicates = len(data) - len(unsent)
+    suppressed_contacts = load_suppressed_contacts(unsent)
+    suppressed = sum(1 for number in unsent if number in suppressed_contacts)
+    planned = len(unsent) - suppressed
+    sends = min(planned, CONTACT_LIMIT)
+
+    history = load_contact_history()
+    if history:
+        history.sort()
+        per_contact = sum(history) / len(history)
+        per_contact_p90 = percentile(history, 90)
+        source = f"{len(history)} past contacts"
+    else:
+        per_contact = per_contact_p90 = PLAN_DEFAULT_CONTACT_SECONDS
+        source = "no history, default estimate"
+    startup = load_startup_history()
+    startup = PLAN_DEFAULT_STARTUP_SECONDS if startup is None else startup
+
+    # Fixed settle sleeps around each send, as applied by controlled_sleep
+    fixed_sleeps = 0.0 if FAST_MODE else (2 + 1) * SLEEP_SCALE
+    if NO_DELAY or DELAY_BETWEEN_CONTACTS == (0, 0):
+        contact_delay = 0.0
+    else:
+        contact_delay = (DELAY_BETWEEN_CONTACTS[0] + max(DELAY_BETWEEN_CONTACTS)) / 2.0
+    batch_breaks = max(0, (sends - 1) // BATCH_SIZE) if BATCH_SIZE > 0 else 0
+    pacing = max(0, sends - 1) * contact_delay + batch_breaks * BATCH_DELAY
+
+    expected = startup + sends * (per_contact + fixed_sleeps) + pacing
+    pessimistic = startup + sends * (per_contact_p90 + fixed_sleeps) + pacing
+    finish = datetime.now() + timedelta(seconds=expected)
+
+    logging.info("CAMPAIGN PLAN:")
+    logging.info(f"  Rows loaded:               {rows}")
+    logging.info(f"  Rejected by pre-flight:    {rows - len(data)} (invalid or repeated in list)")
+    logging.info(f"  Already sent (ledger):     {ledger_duplicates}")
+    logging.info(f"  Suppressed (opted out):    {suppressed}")
+    logging.info(f"  Over CONTACT_LIMIT:        {planned - sends}")
+    logging.info(f"  Messages to send:          {sends}")
+    logging.info(f"  Per-contact browser time:  {per_contact:.1f}s mean, {per_contact_p90:.1f}s p90 ({source})")
+    logging.info(f"  Fixed sleeps per contact:  {fixed_sleeps:.1f}s")
+    logging.info(f"  Pacing:                    {contact_delay:.1f}s between contacts, {batch_breaks} batch breaks x {BATCH_DELAY}s")
+    logging.info(f"  Startup:                   {startup:.1f}s")
+    logging.info(f"  Predicted duration:        {timedelta(seconds=round(expected))} (p90 {timedelta(seconds=round(pessimistic))})")
+    logging.info(f"  Predicted finish:          {finish.strftime('%Y-%m-%d %H:%M:%S')}")
+    return {
+        'rows': rows,
+        'suppressed': suppressed,
+        'sends': sends,
+        'expected_seconds': expected,
+        'pessimistic_seconds': pessimistic,
+        'finish_time': finish,
+    }
+
 # ====== MAIN EXECUTION ======
+def record_sent(timer, number, name, message, sent_contacts):
+    """Write a send to the ledger and count the contact as sent"""
+    with span('ledger_write'):
+        # Save to sent messages log
+        save_sent_message(number, name, message)
+        # Add to sent contacts set for current session
+        sent_contacts.add(clean_number(number))
+    timer.mark('sent')
+
+def settle_pending_send(driver, timer, acks, sent_contacts):
+    """Check the last submitted message before leaving its chat; False if it was queued for verification"""
+    pending = acks.take()
+    if pending is None:
+        return True
+    with span('ack_verify'):
+        status = probe_send_ack(driver)
+    if acks.settle(pending, status):
+        record_sent(timer, pending.number, pending.name, pending.message, sent_contacts)
+        return True
+    logging.warning(f"⚠️  Message to {pending.number} not confirmed ({status}) - queued for verification")
+    timer.requeue(f"unconfirmed: {status}")
+    return False
+
+def verify_unconfirmed_sends(driver, timer, acks, sent_contacts):
+    """Re-check every queued send; messages that show an error are sent again. Returns the lost ones."""
+    queue = acks.drain()
+    if not queue:
+        return []
+    logging.info(f"Verifying {len(queue)} unconfirmed message(s)...")
+    lost = []
+    for pending in queue:
+        timer.begin_contact(pending.number)
+        if STOP_EVENT.is_set():
+            # Left unverified: not in the ledger, so the next run picks them up
+            status = 'stopped'
+        else:
+            status = 'unopened'
+            try:
+                with span('ack_verify'):
+                    if search_and_open_chat(driver, pending.number, pending.name):
+                        status = recheck_send_ack(driver)
+                # Only an explicit error is re-sent; a bubble that never rendered ('none') could
+                # still have gone out, so it is counted as unconfirmed rather than risk a duplicate
+                if status == 'failed':
+                    logging.info(f"🔁 Re-sending to {pending.number} (first attempt {pending.status}, now {status})")
+                    if send_message(driver, pending.message):
+                        with span('ack_verify'):
+                            status = probe_send_ack(driver)
+            except SessionInterrupted as e:
+                status = f"session {e.state}"
+        if status in ACK_CONFIRMED:
+            acks.recovered += 1
+            logging.info(f"✅ Confirmed message to {pending.number} ({status})")
+            record_sent(timer, pending.number, pending.name, pending.message, sent_contacts)
+        else:
+            acks.lost += 1
+            logging.error(f"❌ Message to {pending.number} could not be confirmed ({status})")
+            timer.mark('failed', f"Unconfirmed send ({status})")
+            lost.append({"number": pending.number, "reason": f"Unconfirmed send ({status})"})
+    return lost
+
+def settle_unopened(timer, unopened, failed_contacts, requeued=None, requeue_counts=None):
+    """Resolve the chat-open failures held while the session might be stalling: after a
+    recovery they are re-queued (up to MAX_REQUEUES times each), otherwise they fail"""
+    for contact in unopened:
+        if requeued is not None:
+            requeue_counts[contact.index] += 1
+            if requeue_counts[contact.index] <= MAX_REQUEUES:
+                logging.info(f"🔁 Re-queuing {contact.number} after the session recovered")
+                requeued.append(contact)
+                continue
+        timer.begin_contact(contact.number)
+        failed_contacts.append({"number": contact.number, "reason": "Could not open chat"})
+        timer.mark('failed', "Could not open chat")
+    unopened.clear()
+
+def requeueing(rows, requeued):
+    """Yield contacts, serving any re-queued ones before the next one"""
+    for item in rows:
+        while requeued:
+            yield requeued.popleft()
+        yield item
+    while requeued:
+        yield requeued.popleft()
+
 def run_campaign():
     logging.info("Starting WhatsApp Bulk Sender...")
+    if ('--plan' in sys.argv) or (os.environ.get('PLAN_ONLY', '0') == '1'):
+        plan_campaign()
+        return
+    if ('--check-only' in sys.argv) or (os.environ.get('CHECK_ONLY', '0') == '1'):
+        data = load_campaign_data()
+        if data is not None:
+            open_chats_check_only(data.number_list())
+        return
     sync_only = ('--sync-only' in sys.argv) or (os.environ.get('SYNC_ONLY', '0') == '1')
     if sync_only:
         logging.info("SYNC-ONLY MODE: Will open WhatsApp Web without sending messages.")
         logging.info("Set SYNC_DURATION env var to a number of seconds to auto-exit, or leave 0 for manual CTRL+C.")
     # Skip data loading entirely if in sync-only mode
     if not sync_only:
-        if MANUAL_DATA is not None:
-            data = MANUAL_DATA.copy()
-            logging.info(f"Using MANUAL DATA: {len(data)} contacts provided via GUI")
-        else:
-            try:
-                logging.info("Fetching Google Sheet data...")
-                data = pd.read_csv(GOOGLE_SHEET_CSV_URL)
-                required_cols = ['Number', 'IntroMessage']
-                present_cols = [c for c in required_cols if c in data.columns]
-                data = data.dropna(subset=present_cols)
-                logging.info(f"Loaded {len(data)} contacts from spreadsheet")
-                
-                # Debug: Show data info
-                logging.info(f"Data shape: {data.shape}")
-                logging.info(f"Data columns: {list(data.columns)}")
-                logging.info(f"First few rows:")
-                for i, row in data.head(3).iterrows():
-                    logging.info(f"  Row {i}: Number='{row.get('Number', 'N/A')}', Message='{row.get('IntroMessage', 'N/A')}'")
-                
-                # Balance the data (duplicate/remove intro messages as needed)
-                original_data = data.copy()
-                if AUTO_BALANCE_DATA:
-                    data = balance_spreadsheet_data(data)
-                    show_data_balance_info(original_data, data)
-                else:
-                    logging.info("Data balancing is disabled. Using original data.")
-                
-            except Exception as e:
-                logging.error(f"Failed to load data: {str(e)}")
-                return
+        data = load_campaign_data()
+        if data is None:
+            return
+        data = preflight_contacts(data)
+        if not len(data):
+            logging.error("No sendable contacts after pre-flight validation.")
+            return
     
     logging.info("Setting up Chrome driver...")
     driver = setup_driver()
     global CURRENT_DRIVER
     CURRENT_DRIVER = driver
+    status_server = None
+    acks = AckTracker()
+    if not sync_only:
+        PROGRESS.reset(len(data), clock=CLOCK.now)
+        PROGRESS.set_state('loading')
+        status_server = start_status_server()
     
     try:
         logging.info("Loading WhatsApp Web...")
-        driver.get("https://web.whatsapp.com")
+        driver.get(WHATSAPP_WEB_URL)
         if not wait_for_whatsapp_load(driver):
             logging.error("Failed to load WhatsApp Web. Please check your internet connection and try again.")
             return
@@ -767,6 +1349,7 @@ def run_campaign():
         failed_contacts = []
         processed_count = 0
         skipped_duplicates = 0
+        skipped_suppressed = 0
         
         logging.info(f"Starting to process {len(data)} contacts...")
         logging.info(f"Batch processing: {BATCH_SIZE} contacts per batch, {BATCH_DELAY} seconds between batches")
@@ -778,24 +1361,35 @@ def run_campaign():
         
         sent_contacts = load_sent_messages()
         show_duplicate_prevention_info(sent_contacts, len(data))
+        suppressed_contacts = load_suppressed_contacts(data.number_list())
+        timer = start_campaign(CONTACT_TRACE_LOG, clock=CLOCK.now, on_outcome=PROGRESS.record_outcome,
+                               results=open_results_writer())
+        PROGRESS.set_state('running')
+        # Contacts interrupted by a session drop are retried right after recovery
+        requeued = deque()
+        requeue_counts = Counter()
+        # Chats that failed to open are held until a chat opens again (then they fail) or
+        # the run of failures turns out to be a stalled session (then they are re-queued)
+        unopened = []
+        session_lost = False
         
-        for idx, row in data.iterrows():
+        for contact in requeueing(data, requeued):
+            idx = contact.index
             if STOP_EVENT.is_set():
                 logging.info("Stop flag detected. Exiting loop.")
                 break
             while not PAUSE_EVENT.is_set():
                 time.sleep(0.2)
-            # Convert number to string and clean it properly
-            raw_number = row['Number']
-            if pd.isna(raw_number):
-                logging.warning(f"Skipping contact {idx + 1}: NaN number")
-                failed_contacts.append({"number": "NaN", "reason": "NaN number"})
-                continue
-                
-            # Convert to string and remove .0 if it's a float
-            number = str(raw_number).replace(".0", "").replace("+", "").replace(" ", "").strip()
-            name = row.get('Name', '') if 'Name' in data.columns else ''
-            intro_msg = str(row['IntroMessage']).strip()
+            # The previous message is checked here, after its pacing delay and before the next navigation
+            settle_pending_send(driver, timer, acks, sent_contacts)
+            if unopened and not WATCHDOG.failed_opens:
+                settle_unopened(timer, unopened, failed_contacts)
+            timer.begin_contact(contact.number)
+            # Canonical digits from the pre-flight pass (which dropped empty and invalid
+            # numbers); message already stripped and interned
+            number = contact.number
+            name = contact.name
+            intro_msg = contact.message
             
             # Show batch progress at the start of each batch
             if processed_count % BATCH_SIZE == 0:
@@ -803,40 +1397,75 @@ def run_campaign():
             
             logging.info(f"=== Processing contact {idx + 1}/{len(data)}: {number} ===")
             
-            # Skip if number is empty or invalid
-            if not number or number.lower() == 'nan':
-                logging.warning(f"Skipping contact {idx + 1}: Invalid number")
-                failed_contacts.append({"number": number, "reason": "Invalid number"})
-                continue
-            
             # Check if message already sent
-            if is_message_already_sent(number, sent_contacts):
+            with span('dedupe'):
+                already_sent = is_message_already_sent(number, sent_contacts)
+            if already_sent:
                 logging.info(f"⏭️  SKIPPING {number} - already received intro message")
                 skipped_duplicates += 1
+                timer.mark('skipped_duplicate')
                 continue
             
-            if not search_and_open_chat(driver, number, name):
-                logging.error(f"Could not open chat for {number}")
-                failed_contacts.append({"number": number, "reason": "Could not open chat"})
+            # Honor opt-outs before touching the browser
+            if normalize_digits(number) in suppressed_contacts:
+                logging.info(f"🚫 SKIPPING {number} - on the suppression list")
+                skipped_suppressed += 1
+                timer.mark('suppressed')
                 continue
             
-            controlled_sleep(2, "post chat open before sending intro")
-            
-            intro_success = True
-            if intro_msg and intro_msg.lower() != 'nan':
-                if send_message(driver, intro_msg):
-                    logging.info(f"✅ Intro message sent to {number}")
-                    controlled_sleep(1, "post send assurance")
-                    # Save to sent messages log
-                    save_sent_message(number, name, intro_msg)
-                    # Add to sent contacts set for current session
-                    sent_contacts.add(number)
+            try:
+                WATCHDOG.check(driver)
+                with span('open_chat'):
+                    chat_opened = search_and_open_chat(driver, number, name)
+                if not chat_opened:
+                    logging.error(f"Could not open chat for {number}")
+                    timer.requeue("chat not opened")
+                    unopened.append(contact)
+                    if WATCHDOG.record_open(False):
+                        if not recover_session(driver, 'stalled'):
+                            session_lost = True
+                            break
+                        settle_unopened(timer, unopened, failed_contacts, requeued, requeue_counts)
+                    continue
+                WATCHDOG.record_open(True)
+                
+                with span('pacing_wait'):
+                    controlled_sleep(2, "post chat open before sending intro")
+                
+                intro_success = True
+                if intro_msg:
+                    if send_message(driver, intro_msg):
+                        logging.info(f"✅ Intro message sent to {number}")
+                        with span('pacing_wait'):
+                            controlled_sleep(1, "post send assurance")
+                        if VERIFY_SENDS:
+                            # Confirmed (and written to the ledger) before the next chat opens
+                            acks.submit(number, name, intro_msg)
+                        else:
+                            record_sent(timer, number, name, intro_msg, sent_contacts)
+                    else:
+                        logging.error(f"❌ Failed to send intro message to {number}")
+                        failed_contacts.append({"number": number, "reason": "Failed to send intro message"})
+                        timer.mark('failed', "Failed to send intro message")
+                        intro_success = False
                 else:
-                    logging.error(f"❌ Failed to send intro message to {number}")
-                    failed_contacts.append({"number": number, "reason": "Failed to send intro message"})
-                    intro_success = False
-            else:
-                logging.info(f"No intro message for {number}, skipping message send")
+                    logging.info(f"No intro message for {number}, skipping message send")
+                    timer.mark('no_message')
+            except SessionInterrupted as e:
+                requeue_counts[idx] += 1
+                if requeue_counts[idx] > MAX_REQUEUES:
+                    logging.error(f"Session kept dropping while processing {number}")
+                    failed_contacts.append({"number": number, "reason": "Session interrupted"})
+                    timer.mark('failed', "Session interrupted")
+                else:
+                    logging.info(f"🔁 Re-queuing {number} after session '{e.state}'")
+                    timer.requeue(e.state)
+                    requeued.append(contact)
+                if not recover_session(driver, e.state):
+                    session_lost = True
+                    break
+                settle_unopened(timer, unopened, failed_contacts, requeued, requeue_counts)
+                continue
             
             if intro_success:
                 success_count += 1
@@ -853,10 +1482,12 @@ def run_campaign():
                 logging.info(f"🎯 BATCH {current_batch} COMPLETED: {processed_count} contacts processed")
                 logging.info(f"✅ Successfully processed: {success_count} contacts")
                 logging.info(f"⏭️  Skipped duplicates: {skipped_duplicates} contacts")
+                logging.info(f"🚫 Suppressed: {skipped_suppressed} contacts")
                 logging.info(f"❌ Failed: {len(failed_contacts)} contacts")
                 
                 # Take batch break
-                batch_delay()
+                with span('pacing_wait'):
+                    batch_delay()
                 
                 # Prepare for next batch
                 current_batch += 1
@@ -869,13 +1500,25 @@ def run_campaign():
                 break
                 
             if idx < len(data) - 1 and not STOP_EVENT.is_set():
-                random_delay()
+                with span('pacing_wait'):
+                    random_delay()
             else:
                 logging.info("All contacts processed!")
         
+        settle_pending_send(driver, timer, acks, sent_contacts)
+        settle_unopened(timer, unopened, failed_contacts)
+        lost = verify_unconfirmed_sends(driver, timer, acks, sent_contacts)
+        failed_contacts.extend(lost)
+        success_count -= len(lost)
+        acks.log_summary()
+        finish_campaign()
+        if session_lost and not STOP_EVENT.is_set():
+            logging.error("Campaign stopped: the WhatsApp Web session could not be recovered. "
+                          "Contacts not yet sent are not in the ledger and will be picked up by the next run.")
         logging.info("Campaign completed!")
         logging.info(f"✅ Successfully sent to {success_count} contacts")
         logging.info(f"⏭️  Skipped duplicates: {skipped_duplicates} contacts")
+        logging.info(f"🚫 Suppressed (opted out): {skipped_suppressed} contacts")
         logging.info(f"❌ Failed to send to {len(failed_contacts)} contacts")
         
         if failed_contacts:
@@ -888,6 +1531,25 @@ def run_campaign():
     except Exception as e:
         logging.error(f"Unexpected error: {str(e)}")
     finally:
+        pending = acks.take()
+        if pending is not None:
+            # Interrupted before its check: keep the old behaviour of trusting ENTER
+            save_sent_message(pending.number, pending.name, pending.message)
+            timer = active_timer()
+            if timer is not None:
+                # Still the pending send's contact: the next one only begins after the check
+                timer.mark('sent')
+        finish_campaign()
+        save_timeouts()
+        if WATCHDOG:
+            WATCHDOG.log_summary()
+        if not sync_only:
+            PROGRESS.set_state('finished')
+            history = open_history(rotate=True)
+            if history:
+                history.close()
+        if status_server:
+            status_server.stop()
         logging.info("Campaign completed. Browser will remain open for manual review.")
         logging.info("You can manually close the browser when you're done.")
         # Keep browser open - don't call driver.quit()
@@ -896,8 +1558,14 @@ def run_campaign():
         # except:
         #     pass
 
+def run_profiled(func, *args, **kwargs):
+    """Run func under the profiler selected by PROFILE_MODE (plain call when off)"""
+    if not PROFILE_MODE:
+        return func(*args, **kwargs)
+    return profiling.run_profiled(func, *args, mode=PROFILE_MODE, output_dir=LOGS_DIR, label=func.__name__, **kwargs)
+
 def main():
-    run_campaign()
+    run_profiled(run_campaign)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file